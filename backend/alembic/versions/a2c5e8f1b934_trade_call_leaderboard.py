@@ -0,0 +1,61 @@
+"""trade call leaderboard
+
+Revision ID: a2c5e8f1b934
+Revises: f6d1a8e2c547
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a2c5e8f1b934"
+down_revision: Union[str, Sequence[str], None] = "f6d1a8e2c547"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SORT_COLUMNS = (
+    "calls",
+    "finished",
+    "wins",
+    "win_rate",
+    "avg_profit_pct",
+    "total_profit_pct",
+    "tp1_rate",
+    "tp3_rate",
+    "sl_rate",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "trade_call_leaderboard",
+        sa.Column("period", sa.String(length=10), nullable=False),
+        sa.Column("symbol", sa.String(length=50), nullable=False),
+        sa.Column("calls", sa.Integer(), nullable=False),
+        sa.Column("finished", sa.Integer(), nullable=False),
+        sa.Column("wins", sa.Integer(), nullable=False),
+        sa.Column("win_rate", sa.Float(), nullable=False),
+        sa.Column("avg_profit_pct", sa.Float(), nullable=False),
+        sa.Column("total_profit_pct", sa.Float(), nullable=False),
+        sa.Column("tp1_rate", sa.Float(), nullable=False),
+        sa.Column("tp3_rate", sa.Float(), nullable=False),
+        sa.Column("sl_rate", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("period", "symbol"),
+    )
+    for column in SORT_COLUMNS:
+        op.create_index(
+            f"ix_trade_call_leaderboard_period_{column}", "trade_call_leaderboard", ["period", column, "symbol"]
+        )
+    # The per-day rollups it is built from are filled by: python -m services.trade_call_stats rebuild
+    # (also done automatically on startup); the leaderboard itself refreshes on its first request
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("trade_call_leaderboard")
@@ -0,0 +1,35 @@
+"""trade call hit timing
+
+Revision ID: b7e4c1d2a9f0
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e4c1d2a9f0"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NEW_COLUMNS = ("tp0_hit_at", "tp1_hit_at", "tp2_hit_at", "tp3_hit_at", "sl_hit_at", "last_checked_at")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name in NEW_COLUMNS:
+        op.add_column("trade_calls", sa.Column(name, sa.DateTime(), nullable=True))
+    op.add_column("trade_calls", sa.Column("hit_order", sa.String(length=50), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("trade_calls") as batch_op:
+        batch_op.drop_column("hit_order")
+        for name in reversed(NEW_COLUMNS):
+            batch_op.drop_column(name)
@@ -0,0 +1,74 @@
+"""trade calls archive
+
+Revision ID: b8d3f6a0c152
+Revises: a2c5e8f1b934
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8d3f6a0c152"
+down_revision: Union[str, Sequence[str], None] = "a2c5e8f1b934"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "trade_calls_archive",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("symbol", sa.String(length=50), nullable=False),
+        sa.Column("side", sa.String(length=10), nullable=False),
+        sa.Column("entry_price", sa.Float(), nullable=False),
+        sa.Column("stop_loss", sa.Float(), nullable=False),
+        sa.Column("tp0", sa.Float(), nullable=True),
+        sa.Column("tp1", sa.Float(), nullable=False),
+        sa.Column("tp2", sa.Float(), nullable=False),
+        sa.Column("tp3", sa.Float(), nullable=False),
+        sa.Column("confidence", sa.Integer(), nullable=False),
+        sa.Column("reason", sa.Text(), nullable=True),
+        sa.Column("rsi4h", sa.Float(), nullable=True),
+        sa.Column("has_convergence", sa.Boolean(), nullable=True),
+        sa.Column("rr", sa.Float(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("tp0_hit", sa.Boolean(), nullable=True),
+        sa.Column("tp1_hit", sa.Boolean(), nullable=True),
+        sa.Column("tp2_hit", sa.Boolean(), nullable=True),
+        sa.Column("tp3_hit", sa.Boolean(), nullable=True),
+        sa.Column("sl_hit", sa.Boolean(), nullable=True),
+        sa.Column("best_tp_reached", sa.Integer(), nullable=True),
+        sa.Column("exit_price", sa.Float(), nullable=True),
+        sa.Column("profit_pct", sa.Float(), nullable=True),
+        sa.Column("tp0_hit_at", sa.DateTime(), nullable=True),
+        sa.Column("tp1_hit_at", sa.DateTime(), nullable=True),
+        sa.Column("tp2_hit_at", sa.DateTime(), nullable=True),
+        sa.Column("tp3_hit_at", sa.DateTime(), nullable=True),
+        sa.Column("sl_hit_at", sa.DateTime(), nullable=True),
+        sa.Column("hit_order", sa.String(length=50), nullable=True),
+        sa.Column("last_checked_at", sa.DateTime(), nullable=True),
+        sa.Column("mfe_pct", sa.Float(), nullable=True),
+        sa.Column("mae_pct", sa.Float(), nullable=True),
+        sa.Column("mfe_at", sa.DateTime(), nullable=True),
+        sa.Column("mae_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("resolved_at", sa.DateTime(), nullable=True),
+        sa.Column("expires_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_trade_calls_archive_created_at_id", "trade_calls_archive", ["created_at", "id"])
+    op.create_index("ix_trade_calls_archive_status_created_at", "trade_calls_archive", ["status", "created_at"])
+    # Filled by the trade-call-archive job (TRADE_CALL_ARCHIVE_RETENTION_DAYS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Archived calls go back to the hot table first so no history is lost
+    columns = ", ".join(column["name"] for column in sa.inspect(op.get_bind()).get_columns("trade_calls_archive"))
+    op.execute(f"INSERT INTO trade_calls ({columns}) SELECT {columns} FROM trade_calls_archive")
+    op.drop_table("trade_calls_archive")
@@ -0,0 +1,52 @@
+"""trade call stats table
+
+Revision ID: c3a8d5e61f27
+Revises: b7e4c1d2a9f0
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3a8d5e61f27"
+down_revision: Union[str, Sequence[str], None] = "b7e4c1d2a9f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INT_COUNTERS = (
+    "total",
+    "active",
+    "resolved",
+    "expired",
+    "finished",
+    "wins",
+    "tp0_hits",
+    "tp1_hits",
+    "tp2_hits",
+    "tp3_hits",
+    "sl_hits",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "trade_call_stats",
+        sa.Column("dimension", sa.String(length=20), nullable=False),
+        sa.Column("key", sa.String(length=60), nullable=False),
+        *(sa.Column(name, sa.Integer(), nullable=False) for name in INT_COUNTERS),
+        sa.Column("profit_sum", sa.Float(), nullable=False),
+        sa.Column("profit_count", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("dimension", "key"),
+    )
+    # Populate with: python -m services.trade_call_stats rebuild (also done automatically on startup)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("trade_call_stats")
@@ -0,0 +1,42 @@
+"""trade call hot query indexes
+
+Revision ID: d9f2b6a4c815
+Revises: c3a8d5e61f27
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d9f2b6a4c815"
+down_revision: Union[str, Sequence[str], None] = "c3a8d5e61f27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_trade_calls_status_created_at", "trade_calls", ["status", "created_at"])
+    op.create_index("ix_trade_calls_symbol_side_created_at", "trade_calls", ["symbol", "side", "created_at"])
+    # Partial index on the active set (Postgres and SQLite; other dialects ignore the WHERE clause)
+    op.create_index(
+        "ix_trade_calls_active_expires_at",
+        "trade_calls",
+        ["expires_at"],
+        postgresql_where=sa.text("status = 'active'"),
+        sqlite_where=sa.text("status = 'active'"),
+    )
+    # Covered by the (symbol, side, created_at) prefix
+    op.drop_index("ix_trade_calls_symbol", table_name="trade_calls")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_trade_calls_symbol", "trade_calls", ["symbol"])
+    op.drop_index("ix_trade_calls_active_expires_at", table_name="trade_calls")
+    op.drop_index("ix_trade_calls_symbol_side_created_at", table_name="trade_calls")
+    op.drop_index("ix_trade_calls_status_created_at", table_name="trade_calls")
@@ -0,0 +1,27 @@
+"""trade call keyset index
+
+Revision ID: e4b7c9d1a306
+Revises: d9f2b6a4c815
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b7c9d1a306"
+down_revision: Union[str, Sequence[str], None] = "d9f2b6a4c815"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_trade_calls_created_at_id", "trade_calls", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_trade_calls_created_at_id", table_name="trade_calls")
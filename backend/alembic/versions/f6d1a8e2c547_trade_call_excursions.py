@@ -0,0 +1,43 @@
+"""trade call excursions
+
+Revision ID: f6d1a8e2c547
+Revises: e4b7c9d1a306
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6d1a8e2c547"
+down_revision: Union[str, Sequence[str], None] = "e4b7c9d1a306"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("trade_calls", sa.Column("mfe_pct", sa.Float(), nullable=True))
+    op.add_column("trade_calls", sa.Column("mae_pct", sa.Float(), nullable=True))
+    op.add_column("trade_calls", sa.Column("mfe_at", sa.DateTime(), nullable=True))
+    op.add_column("trade_calls", sa.Column("mae_at", sa.DateTime(), nullable=True))
+    # Existing calls have no recorded excursions, so zero counters are already correct
+    op.add_column("trade_call_stats", sa.Column("mfe_sum", sa.Float(), nullable=False, server_default="0"))
+    op.add_column("trade_call_stats", sa.Column("mae_sum", sa.Float(), nullable=False, server_default="0"))
+    op.add_column("trade_call_stats", sa.Column("excursion_count", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("trade_call_stats") as batch_op:
+        batch_op.drop_column("excursion_count")
+        batch_op.drop_column("mae_sum")
+        batch_op.drop_column("mfe_sum")
+    with op.batch_alter_table("trade_calls") as batch_op:
+        batch_op.drop_column("mae_at")
+        batch_op.drop_column("mfe_at")
+        batch_op.drop_column("mae_pct")
+        batch_op.drop_column("mfe_pct")
@@ -0,0 +1,172 @@
+"""Benchmark: one resolver pass against the number of active calls.
+
+Seeds a SQLite database with N active calls (fixed RNG seed, 300 symbols) and builds the stats rollup, then times
+``resolve_active_calls`` in snapshot mode against fixed per-symbol prices, each pass on a fresh copy of the
+database (median of ``--repeat`` passes):
+
+* ``full load`` — the trigger index not built, so every active call is loaded and checked;
+* ``trigger index`` — the index built first, as at startup, so only the crossed calls are loaded.
+
+``--resolver PATH`` adds a column for another resolver module loaded from a file, e.g. the per-object ORM loop it
+replaced::
+
+    git show 28769f8^:backend/services/trade_call_resolver.py > /tmp/orm_resolver.py
+
+After each pass the rollup is checked against a full aggregate of the call history.
+
+Usage (from backend/)::
+
+    python -m benchmarks.trade_call_resolver 1000 10000 50000 --resolver /tmp/orm_resolver.py
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import logging
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import models  # noqa: F401  (registers every table on Base.metadata)
+from core.config import settings
+from core.database import Base
+from models.trade_call import TradeCall
+from services import trade_call_resolver
+from services.price_snapshot import PriceSource, price_snapshot_service
+from services.trade_call_recorder import new_call_values
+from services.trade_call_stats import compute_trade_stats, read_trade_stats, rebuild_trade_call_stats
+from services.trade_call_triggers import rebuild_trigger_index, trade_call_triggers
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+SEED = 12
+SYMBOLS = [f"S{i}USDT" for i in range(300)]
+INSERT_CHUNK = 20_000
+
+
+class FixedPrices(PriceSource):
+    """Each symbol moved a fixed step from the 100.0 entry (-3% .. +3%); S0USDT has no quote."""
+
+    async def fetch_prices(self, symbols):
+        return {symbol: 100.0 + (int(symbol[1:-4]) * 37 % 13 - 6) / 2 for symbol in symbols if symbol != "S0USDT"}
+
+
+def seed_rows(count: int, rnd: random.Random, now: datetime):
+    """Yield ``count`` active calls with stops 1-10%, targets 0.5-15% and running excursions 0-3% from entry."""
+    for i in range(count):
+        side = rnd.choice(("LONG", "SHORT"))
+        sign = 1 if side == "LONG" else -1
+        targets = sorted(rnd.uniform(0.5, 15) for _ in range(4))
+        created_at = now - timedelta(hours=rnd.uniform(0, 70))
+        item = {
+            "symbol": rnd.choice(SYMBOLS),
+            "side": side,
+            "entry_price": 100.0,
+            "stop_loss": 100.0 - sign * rnd.uniform(1, 10),
+            "tp0": None if i % 5 == 0 else 100.0 + sign * targets[0],
+            "tp1": 100.0 + sign * targets[1],
+            "tp2": 100.0 + sign * targets[2],
+            "tp3": 100.0 + sign * targets[3],
+            "confidence": rnd.randint(30, 95),
+            "has_convergence": False,
+        }
+        row = new_call_values(item, created_at)
+        row.update(mfe_pct=round(rnd.uniform(0, 3), 2), mae_pct=round(rnd.uniform(0, 3), 2))
+        yield row
+
+
+def _session_maker(path: Path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    return engine, async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _seed(path: Path, count: int) -> None:
+    engine, session_maker = _session_maker(path)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        rows = seed_rows(count, random.Random(SEED), datetime.utcnow())
+        async with session_maker() as session:
+            while chunk := [row for _, row in zip(range(INSERT_CHUNK), rows)]:
+                await session.execute(insert(TradeCall), chunk)
+            await session.commit()
+            await rebuild_trade_call_stats(session)
+    finally:
+        await engine.dispose()
+
+
+async def _pass(path: Path, resolver, triggers: bool) -> tuple[float, dict, bool]:
+    """Time one ``resolver.resolve_active_calls`` pass; returns (seconds, result, rollup matches history)."""
+    engine, session_maker = _session_maker(path)
+    try:
+        trade_call_triggers.clear()
+        if triggers:
+            async with session_maker() as session:
+                await rebuild_trigger_index(session)
+        async with session_maker() as session:
+            started = time.perf_counter()
+            result = await resolver.resolve_active_calls(session)
+            seconds = time.perf_counter() - started
+        async with session_maker() as session:
+            consistent = await read_trade_stats(session) == await compute_trade_stats(session)
+    finally:
+        trade_call_triggers.clear()
+        trade_call_triggers.ready = False
+        await engine.dispose()
+    return seconds, result, consistent
+
+
+def _load_resolver(path: str):
+    spec = importlib.util.spec_from_file_location("benchmark_resolver", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def run(count: int, variants: dict, repeat: int, workdir: Path) -> dict:
+    """Per variant: the median pass time over ``repeat`` copies of one seeded database, last result, consistency."""
+    template = workdir / f"resolver_{count}.db"
+    await _seed(template, count)
+    passes = {name: [] for name in variants}
+    for _ in range(repeat):
+        # Interleaved, so machine noise spreads over every variant alike
+        for name, (resolver, triggers) in variants.items():
+            copy = workdir / f"resolver_{count}_copy.db"
+            shutil.copyfile(template, copy)
+            passes[name].append(await _pass(copy, resolver, triggers))
+            copy.unlink()
+    template.unlink()
+    return {
+        name: (statistics.median(seconds for seconds, _, _ in runs), runs[-1][1], all(ok for _, _, ok in runs))
+        for name, runs in passes.items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("counts", nargs="*", type=int, default=[1_000, 10_000, 50_000])
+    parser.add_argument("--resolver", help="path of another resolver module to time alongside")
+    parser.add_argument("--repeat", type=int, default=5, help="passes per variant (median reported)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    settings.trade_call_resolution_mode = "snapshot"
+    price_snapshot_service.set_source(FixedPrices())
+    variants = {"full load": (trade_call_resolver, False), "trigger index": (trade_call_resolver, True)}
+    if args.resolver:
+        variants[Path(args.resolver).stem] = (_load_resolver(args.resolver), False)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in args.counts:
+            results = asyncio.run(run(count, variants, args.repeat, Path(workdir)))
+            print(f"{count:,} active calls")
+            for name, (seconds, result, consistent) in results.items():
+                print(f"  {name:<16} {seconds * 1000:>10.1f}ms  {result}  rollup consistent: {consistent}")
+
+
+if __name__ == "__main__":
+    main()
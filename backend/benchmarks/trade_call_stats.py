@@ -0,0 +1,134 @@
+"""Benchmark: /stats latency against the number of recorded calls.
+
+Seeds a throwaway SQLite database with N calls (fixed RNG seed, two years of history, ~5% active),
+builds the trade_call_stats rollup, then times:
+
+* ``read_trade_stats`` — what GET /stats serves (before the per-process cache), reads the rollup only;
+* ``compute_trade_stats`` — the grouped aggregate over the whole call history, used when the rollup is empty.
+
+Usage (from backend/)::
+
+    python -m benchmarks.trade_call_stats 10000 100000 1000000
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import models  # noqa: F401  (registers every table on Base.metadata)
+from core.database import Base
+from models.trade_call import TradeCall
+from services.trade_call_recorder import new_call_values
+from services.trade_call_stats import compute_trade_stats, read_trade_stats, rebuild_trade_call_stats
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+SEED = 4
+SYMBOLS = [f"S{i}USDT" for i in range(200)]
+HISTORY = timedelta(days=730)
+INSERT_CHUNK = 20_000
+
+
+def seed_rows(count: int, rnd: random.Random, now: datetime):
+    """Yield ``count`` call rows, oldest first; calls from the last 3 days stay active."""
+    for i in range(count):
+        side = rnd.choice(("LONG", "SHORT"))
+        sign = 1 if side == "LONG" else -1
+        targets = sorted(rnd.uniform(1, 10) for _ in range(4))
+        created_at = now - HISTORY * (1 - i / count)
+        item = {
+            "symbol": rnd.choice(SYMBOLS),
+            "side": side,
+            "entry_price": 100.0,
+            "stop_loss": 100.0 - sign * rnd.uniform(2, 8),
+            "tp0": 100.0 + sign * targets[0],
+            "tp1": 100.0 + sign * targets[1],
+            "tp2": 100.0 + sign * targets[2],
+            "tp3": 100.0 + sign * targets[3],
+            "confidence": rnd.randint(30, 95),
+            "has_convergence": False,
+        }
+        row = new_call_values(item, created_at)
+        if created_at < now - timedelta(days=3):
+            won = rnd.random() < 0.5
+            status = rnd.choice(("resolved", "expired"))
+            row.update(
+                status=status,
+                tp0_hit=won,
+                tp1_hit=won and rnd.random() < 0.6,
+                sl_hit=not won and status == "resolved",
+                profit_pct=rnd.uniform(-8, 10) if status == "resolved" else None,
+                resolved_at=created_at + timedelta(hours=rnd.uniform(1, 72)),
+                mfe_pct=rnd.uniform(0, 6),
+                mae_pct=rnd.uniform(0, 6),
+            )
+        yield row
+
+
+async def _seed(session_maker, count: int) -> float:
+    started = time.perf_counter()
+    rnd = random.Random(SEED)
+    rows = seed_rows(count, rnd, datetime.utcnow())
+    async with session_maker() as session:
+        while chunk := [row for _, row in zip(range(INSERT_CHUNK), rows)]:
+            await session.execute(insert(TradeCall), chunk)
+        await session.commit()
+        await rebuild_trade_call_stats(session)
+    return time.perf_counter() - started
+
+
+async def _time(session_maker, fn, repeat: int) -> tuple[float, dict]:
+    """Median wall time of ``fn(session)`` over ``repeat`` fresh sessions."""
+    timings = []
+    for _ in range(repeat):
+        async with session_maker() as session:
+            started = time.perf_counter()
+            result = await fn(session)
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+async def run(count: int, repeat: int, workdir: Path) -> dict:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{workdir / f'stats_{count}.db'}")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        seed_seconds = await _seed(session_maker, count)
+        read_seconds, served = await _time(session_maker, read_trade_stats, repeat)
+        scan_seconds, scanned = await _time(session_maker, compute_trade_stats, max(1, repeat // 5))
+    finally:
+        await engine.dispose()
+    return {
+        "calls": count,
+        "seed_s": seed_seconds,
+        "read_ms": read_seconds * 1000,
+        "scan_ms": scan_seconds * 1000,
+        "match": served == scanned,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("counts", nargs="*", type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=25, help="timed runs per measurement (median reported)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    print(f"{'calls':>10} {'seed+rollup':>12} {'/stats read':>12} {'full scan':>12}  payloads equal")
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in args.counts:
+            r = asyncio.run(run(count, args.repeat, Path(workdir)))
+            print(
+                f"{r['calls']:>10,} {r['seed_s']:>11.1f}s {r['read_ms']:>10.2f}ms {r['scan_ms']:>10.1f}ms  {r['match']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
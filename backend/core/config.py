@@ -40,6 +40,58 @@ class Settings(BaseSettings):
     nowpayments_api_key: str = ""
     nowpayments_ipn_secret: str = ""
 
+    # Exchange price feed (trade-call resolution)
+    price_source_base_url: str = "https://api.binance.com"
+    price_snapshot_ttl_seconds: float = 5.0
+    price_fetch_timeout_seconds: float = 10.0
+    price_fetch_batch_size: int = 100
+    price_fetch_concurrency: int = 8
+
+    # Exchange price stream (websocket last-price book)
+    price_stream_enabled: bool = True
+    price_stream_url: str = "wss://stream.binance.com:9443/ws/!miniTicker@arr"
+    price_stream_stale_seconds: float = 30.0
+    price_stream_reconnect_max_seconds: float = 60.0
+
+    # Trade call background jobs
+    trade_call_scheduler_enabled: bool = True
+    trade_call_resolve_interval_seconds: float = 60.0
+    trade_call_expiry_interval_seconds: float = 15.0
+    trade_call_resolution_mode: str = "snapshot"  # snapshot | candles
+    trade_call_trigger_index_enabled: bool = True
+    trade_call_excursion_step_pct: float = 0.25  # MFE/MAE move that wakes the resolver; 0 = only on other triggers
+    trade_call_candle_interval: str = "1m"
+    trade_call_indicator_enrichment_enabled: bool = True
+    trade_call_indicator_interval: str = "4h"
+    trade_call_indicator_timeout_seconds: float = 1.0  # longer indicator loads record the call without them
+    trade_call_stats_cache_ttl_seconds: float = 30.0
+    trade_call_leaderboard_interval_seconds: float = 60.0
+    trade_call_archive_retention_days: int = 90  # finished calls older than this move to trade_calls_archive; 0 = never
+    trade_call_archive_interval_seconds: float = 3600.0
+    trade_call_archive_batch_size: int = 5000
+    trade_call_events_queue_size: int = 100
+
+    # Local candle store
+    candle_store_dir: str = "data/candles"
+    candle_store_sync_enabled: bool = True
+    candle_store_sync_interval_seconds: float = 300.0
+
+    # Indicators
+    indicator_history_candles: int = 500
+
+    # Market scanner
+    scanner_enabled: bool = False
+    scanner_interval_seconds: float = 900.0
+    scanner_symbols: str = ""  # comma-separated; empty = every fresh streamed pair in scanner_quote_asset
+    scanner_quote_asset: str = "USDT"
+    scanner_max_symbols: int = 300
+    scanner_candle_interval: str = "1h"
+    scanner_min_change_pct: float = 4.0
+    scanner_min_confidence: int = 65
+
+    # Backtesting
+    backtest_max_workers: int = 0  # 0 = one per CPU
+
     # AWS Lambda Configuration
     is_lambda: bool = False
     lambda_function_name: str = "fastapi-backend"
@@ -16,6 +16,15 @@ from fastapi.routing import APIRouter
 from services.database import initialize_database, close_database
 from services.mock_data import initialize_mock_data
 from services.auth import initialize_admin_user
+from services.backtest import stop_backtest_pool
+from services.candle_store import start_candle_store_sync, stop_candle_store_sync
+from services.market_scanner import start_market_scanner, stop_market_scanner
+from services.price_stream import start_price_stream, stop_price_stream
+from services.trade_call_archive import start_trade_call_archive, stop_trade_call_archive
+from services.trade_call_leaderboard import start_trade_call_leaderboard, stop_trade_call_leaderboard
+from services.trade_call_resolver import start_trade_call_scheduler, stop_trade_call_scheduler
+from services.trade_call_stats import initialize_trade_call_stats
+from services.trade_call_triggers import initialize_trade_call_triggers
 # MODULE_IMPORTS_END
 
 
@@ -69,11 +78,26 @@ async def lifespan(app: FastAPI):
     await initialize_database()
     await initialize_mock_data()
     await initialize_admin_user()
+    await initialize_trade_call_stats()
+    await initialize_trade_call_triggers()
+    await start_price_stream()
+    await start_candle_store_sync()
+    await start_trade_call_scheduler()
+    await start_trade_call_leaderboard()
+    await start_trade_call_archive()
+    await start_market_scanner()
     # MODULE_STARTUP_END
 
     logger.info("=== Application startup completed successfully ===")
     yield
     # MODULE_SHUTDOWN_START
+    await stop_market_scanner()
+    await stop_trade_call_scheduler()
+    await stop_trade_call_leaderboard()
+    await stop_trade_call_archive()
+    await stop_price_stream()
+    await stop_candle_store_sync()
+    await stop_backtest_pool()
     await close_database()
     # MODULE_SHUTDOWN_END
 
@@ -93,7 +117,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["*"],
+    # Browsers ignore the "*" wildcard on credentialed requests, so custom headers are also listed by name
+    expose_headers=["*", "X-Next-Cursor"],
 )
 # MODULE_MIDDLEWARE_END
 
@@ -3,4 +3,7 @@
 # BEFORE create_tables() runs during application startup.
 from models.auth import OIDCState, User  # noqa: F401
 from models.pricing import PlanPricing  # noqa: F401
-from models.trade_call import TradeCall  # noqa: F401
\ No newline at end of file
+from models.trade_call import TradeCall  # noqa: F401
+from models.trade_call_archive import TradeCallArchive  # noqa: F401
+from models.trade_call_leaderboard import TradeCallLeaderboard  # noqa: F401
+from models.trade_call_stats import TradeCallStat  # noqa: F401
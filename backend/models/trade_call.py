@@ -3,14 +3,14 @@
 from datetime import datetime
 
 from core.database import Base
-from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, Float, Index, Integer, String, Text, text
 
 
-class TradeCall(Base):
-    __tablename__ = "trade_calls"
+class TradeCallColumns:
+    """Columns shared by the hot trade_calls table and the trade_calls_archive table."""
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    symbol = Column(String(50), nullable=False, index=True)
+    symbol = Column(String(50), nullable=False)
     side = Column(String(10), nullable=False)  # LONG or SHORT
     entry_price = Column(Float, nullable=False)
     stop_loss = Column(Float, nullable=False)
@@ -35,7 +35,43 @@ class TradeCall(Base):
     exit_price = Column(Float, nullable=True)
     profit_pct = Column(Float, nullable=True)
 
+    # Hit timing (exact candle time in candle resolution mode)
+    tp0_hit_at = Column(DateTime, nullable=True)
+    tp1_hit_at = Column(DateTime, nullable=True)
+    tp2_hit_at = Column(DateTime, nullable=True)
+    tp3_hit_at = Column(DateTime, nullable=True)
+    sl_hit_at = Column(DateTime, nullable=True)
+    hit_order = Column(String(50), nullable=True)  # e.g. "tp0,tp1,sl"
+    last_checked_at = Column(DateTime, nullable=True)
+
+    # Running extremes while active: furthest move for (MFE) and against (MAE) the call, in % of entry (>= 0)
+    mfe_pct = Column(Float, nullable=True)
+    mae_pct = Column(Float, nullable=True)
+    mfe_at = Column(DateTime, nullable=True)
+    mae_at = Column(DateTime, nullable=True)
+
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     resolved_at = Column(DateTime, nullable=True)
-    expires_at = Column(DateTime, nullable=True)
\ No newline at end of file
+    expires_at = Column(DateTime, nullable=True)
+
+
+class TradeCall(TradeCallColumns, Base):
+    """Hot table: active calls and finished calls still inside the archive retention window."""
+
+    __tablename__ = "trade_calls"
+    __table_args__ = (
+        # list_trade_calls: WHERE status = ? ORDER BY created_at DESC
+        Index("ix_trade_calls_status_created_at", "status", "created_at"),
+        # list_trade_calls keyset pages without a status filter: ORDER BY created_at DESC, id DESC
+        Index("ix_trade_calls_created_at_id", "created_at", "id"),
+        # create_trade_call dedup: WHERE symbol = ? AND side = ? AND created_at >= now - 4h
+        Index("ix_trade_calls_symbol_side_created_at", "symbol", "side", "created_at"),
+        # Resolver / expiry: only the (small) active set, ordered by expiry
+        Index(
+            "ix_trade_calls_active_expires_at",
+            "expires_at",
+            postgresql_where=text("status = 'active'"),
+            sqlite_where=text("status = 'active'"),
+        ),
+    )
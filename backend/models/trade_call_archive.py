@@ -0,0 +1,31 @@
+"""TradeCallArchive model — finished trade calls moved out of the hot trade_calls table."""
+
+from core.database import Base
+from models.trade_call import TradeCall, TradeCallColumns
+from sqlalchemy import Column, Index, Integer, select, union_all
+from sqlalchemy.orm import aliased
+
+
+class TradeCallArchive(TradeCallColumns, Base):
+    """Resolved and expired calls past the archive retention window, with their original ids.
+
+    Rows are only ever inserted by the archive job and never change afterwards.
+    """
+
+    __tablename__ = "trade_calls_archive"
+    __table_args__ = (
+        # History pages: ORDER BY created_at DESC, id DESC (optionally WHERE status = ?)
+        Index("ix_trade_calls_archive_created_at_id", "created_at", "id"),
+        Index("ix_trade_calls_archive_status_created_at", "status", "created_at"),
+    )
+
+    # Ids are copied from trade_calls, never generated here
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+
+# Every call, hot and archived: UNION ALL of both tables, mapped as TradeCall so queries read the same
+_history = union_all(
+    select(*TradeCall.__table__.columns),
+    select(*(TradeCallArchive.__table__.c[column.name] for column in TradeCall.__table__.columns)),
+).subquery("trade_call_history")
+TradeCallHistory = aliased(TradeCall, _history, name="trade_call_history")
@@ -0,0 +1,51 @@
+"""TradeCallLeaderboard model — per-symbol rollups ranked by the leaderboard endpoint."""
+
+from datetime import datetime
+
+from core.database import Base
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String
+
+# Columns the leaderboard can be sorted by; each has a (period, column, symbol) index
+LEADERBOARD_SORT_COLUMNS = (
+    "calls",
+    "finished",
+    "wins",
+    "win_rate",
+    "avg_profit_pct",
+    "total_profit_pct",
+    "tp1_rate",
+    "tp3_rate",
+    "sl_rate",
+)
+
+
+class TradeCallLeaderboard(Base):
+    """One symbol's outcome summary over one window ("7d", "30d" or "all").
+
+    Rows are computed from the trade_call_stats rollups, not from trade_calls;
+    rates are percentages of the finished (resolved/expired) calls, and
+    avg_profit_pct is over finished calls with a recorded profit. As in the
+    /stats payload, both are 0 for a symbol without finished calls.
+    """
+
+    __tablename__ = "trade_call_leaderboard"
+    __table_args__ = tuple(
+        # read_leaderboard: WHERE period = ? ORDER BY <column>, symbol LIMIT ?
+        Index(f"ix_trade_call_leaderboard_period_{column}", "period", column, "symbol")
+        for column in LEADERBOARD_SORT_COLUMNS
+    )
+
+    period = Column(String(10), primary_key=True)
+    symbol = Column(String(50), primary_key=True)
+
+    calls = Column(Integer, nullable=False, default=0)
+    finished = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    win_rate = Column(Float, nullable=False, default=0.0)
+    avg_profit_pct = Column(Float, nullable=False, default=0.0)
+    total_profit_pct = Column(Float, nullable=False, default=0.0)
+    tp1_rate = Column(Float, nullable=False, default=0.0)
+    tp3_rate = Column(Float, nullable=False, default=0.0)
+    sl_rate = Column(Float, nullable=False, default=0.0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,42 @@
+"""TradeCallStat model — incrementally maintained trade call aggregates."""
+
+from datetime import datetime
+
+from core.database import Base
+from sqlalchemy import Column, DateTime, Float, Integer, String
+
+
+class TradeCallStat(Base):
+    """Running counters for one slice of the trade call history.
+
+    One row per (dimension, key): ("global", ""), ("symbol", "BTCUSDT"),
+    ("side", "LONG"), ("confidence", "65-80%"), ("week", "2026-W41"),
+    ("mfe", "2-5%"), ("mae", "0-1%"), and ("symbol_day", "20261018|BTCUSDT") per
+    symbol and creation day for the leaderboard windows.
+    Hit, win, profit and excursion counters only include finished (resolved/expired)
+    calls; the mfe/mae rows only hold finished calls with recorded excursions.
+    """
+
+    __tablename__ = "trade_call_stats"
+
+    dimension = Column(String(20), primary_key=True)
+    key = Column(String(60), primary_key=True)
+
+    total = Column(Integer, nullable=False, default=0)
+    active = Column(Integer, nullable=False, default=0)
+    resolved = Column(Integer, nullable=False, default=0)
+    expired = Column(Integer, nullable=False, default=0)
+    finished = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    tp0_hits = Column(Integer, nullable=False, default=0)
+    tp1_hits = Column(Integer, nullable=False, default=0)
+    tp2_hits = Column(Integer, nullable=False, default=0)
+    tp3_hits = Column(Integer, nullable=False, default=0)
+    sl_hits = Column(Integer, nullable=False, default=0)
+    profit_sum = Column(Float, nullable=False, default=0.0)
+    profit_count = Column(Integer, nullable=False, default=0)
+    mfe_sum = Column(Float, nullable=False, default=0.0)
+    mae_sum = Column(Float, nullable=False, default=0.0)
+    excursion_count = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
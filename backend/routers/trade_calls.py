@@ -1,19 +1,40 @@
 """Trade Calls API — record, resolve, and get performance stats."""
 
+import base64
+import json
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from core.database import get_db
-from fastapi import APIRouter, Depends, Query
+from dependencies.auth import get_admin_user
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from models.trade_call import TradeCall
+from models.trade_call_archive import TradeCallArchive, TradeCallHistory
+from models.trade_call_leaderboard import LEADERBOARD_SORT_COLUMNS
 from pydantic import BaseModel
-from sqlalchemy import and_, func, select
+from schemas.auth import UserResponse
+from services.backtest import load_candidates, run_backtest
+from services.candles import INTERVAL_MS
+from services.market_scanner import scanner_job
+from services.trade_call_archive import archive_job
+from services.trade_call_events import trade_call_events
+from services.trade_call_export import EXPORT_FORMATS, stream_trade_calls
+from services.trade_call_leaderboard import PERIODS, read_leaderboard
+from services.trade_call_performance import compute_performance
+from services.trade_call_recorder import record_trade_calls
+from services.trade_call_resolver import expiry_job, resolver_job
+from services.trade_call_simulation import MAX_SIMULATION_CELLS, load_r_multiples, run_simulation
+from services.trade_call_stats import CALIBRATION_GROUPINGS, calibration_buckets, compute_calibration, stats_cache
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sse_starlette.sse import EventSourceResponse
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/trade-calls", tags=["trade-calls"])
+admin_router = APIRouter(prefix="/api/v1/admin/trade-calls", tags=["admin-trade-calls"])
 
 
 # ── Schemas ──────────────────────────────────────────────────────────────────
@@ -29,8 +50,8 @@ class TradeCallCreate(BaseModel):
     tp3: float
     confidence: int
     reason: Optional[str] = None
-    rsi4h: Optional[float] = None
-    has_convergence: bool = False
+    rsi4h: Optional[float] = None  # computed server-side when omitted
+    has_convergence: Optional[bool] = None  # computed server-side when omitted
     rr: Optional[float] = None
 
 
@@ -58,6 +79,16 @@ class TradeCallOut(BaseModel):
     best_tp_reached: int
     exit_price: Optional[float]
     profit_pct: Optional[float]
+    tp0_hit_at: Optional[datetime] = None
+    tp1_hit_at: Optional[datetime] = None
+    tp2_hit_at: Optional[datetime] = None
+    tp3_hit_at: Optional[datetime] = None
+    sl_hit_at: Optional[datetime] = None
+    hit_order: Optional[str] = None
+    mfe_pct: Optional[float] = None
+    mae_pct: Optional[float] = None
+    mfe_at: Optional[datetime] = None
+    mae_at: Optional[datetime] = None
     created_at: datetime
     resolved_at: Optional[datetime]
 
@@ -65,311 +96,439 @@ class TradeCallOut(BaseModel):
         from_attributes = True
 
 
+class BacktestRules(BaseModel):
+    min_confidence: Optional[int] = None
+    max_confidence: Optional[int] = None
+    min_rsi4h: Optional[float] = None
+    max_rsi4h: Optional[float] = None
+    require_convergence: bool = False
+    min_rr: Optional[float] = None
+    sides: Optional[list[str]] = None
+    symbols: Optional[list[str]] = None
+
+
+class BacktestCall(TradeCallCreate):
+    created_at: datetime
+    expires_at: Optional[datetime] = None  # default: created_at + 72h
+
+
+class BacktestRequest(BaseModel):
+    start: Optional[datetime] = None  # default: end - 365 days
+    end: Optional[datetime] = None  # default: now
+    rules: BacktestRules = BacktestRules()
+    calls: Optional[list[BacktestCall]] = None  # replay these instead of recorded calls
+    interval: str = "1h"
+    include_calls: bool = False
+
+
 # ── POST /api/v1/trade-calls — Record a new call (with dedup) ────────────────
 
 @router.post("", response_model=dict)
 async def create_trade_call(payload: TradeCallCreate, db: AsyncSession = Depends(get_db)):
     """Record a new trade call. Deduplicates: same symbol+side within 4h is skipped."""
-    cutoff = datetime.utcnow() - timedelta(hours=4)
-
-    # Check for duplicate
-    stmt = select(TradeCall).where(
-        and_(
-            TradeCall.symbol == payload.symbol,
-            TradeCall.side == payload.side,
-            TradeCall.created_at >= cutoff,
-        )
-    )
-    result = await db.execute(stmt)
-    existing = result.scalars().first()
-
-    if existing:
-        return {"created": False, "message": "Duplicate call (same symbol/side within 4h)", "id": existing.id}
-
-    # Create new call
-    expires = datetime.utcnow() + timedelta(hours=72)
-    call = TradeCall(
-        symbol=payload.symbol,
-        side=payload.side,
-        entry_price=payload.entry_price,
-        stop_loss=payload.stop_loss,
-        tp0=payload.tp0,
-        tp1=payload.tp1,
-        tp2=payload.tp2,
-        tp3=payload.tp3,
-        confidence=payload.confidence,
-        reason=payload.reason,
-        rsi4h=payload.rsi4h,
-        has_convergence=payload.has_convergence,
-        rr=payload.rr,
-        status="active",
-        expires_at=expires,
-    )
-    db.add(call)
-    await db.commit()
-    await db.refresh(call)
+    (result,) = await record_trade_calls(db, [payload.model_dump()])
+    result.pop("index")
+    if result["created"]:
+        logger.info(f"[TradeCall] Created call #{result['id']}: {payload.symbol} {payload.side} @ {payload.entry_price}")
+    return result
+
+
+# ── POST /api/v1/trade-calls/bulk — Record many calls at once ───────────────
+
+MAX_BULK_CALLS = 500
+
+
+@router.post("/bulk", response_model=dict)
+async def create_trade_calls_bulk(payload: list[TradeCallCreate], db: AsyncSession = Depends(get_db)):
+    """Record a batch of trade calls with the same 4h symbol+side dedup as the single endpoint.
+
+    The batch is checked against existing calls with one query, survivors are
+    written with one multi-row INSERT, and everything commits once. Later items
+    duplicating an earlier item of the same batch are skipped too.
+    """
+    if len(payload) > MAX_BULK_CALLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_CALLS} calls per request")
+    if not payload:
+        return {"created": 0, "duplicates": 0, "results": []}
 
-    logger.info(f"[TradeCall] Created call #{call.id}: {call.symbol} {call.side} @ {call.entry_price}")
-    return {"created": True, "id": call.id}
+    results = await record_trade_calls(db, [item.model_dump() for item in payload])
+
+    created = sum(result["created"] for result in results)
+    logger.info(f"[TradeCall] Bulk insert: {created} created, {len(payload) - created} duplicates")
+    return {"created": created, "duplicates": len(payload) - created, "results": results}
 
 
 # ── GET /api/v1/trade-calls — List calls ─────────────────────────────────────
 
 @router.get("", response_model=list[TradeCallOut])
 async def list_trade_calls(
+    response: Response,
     status: Optional[str] = Query(None, description="Filter by status: active, resolved, expired"),
     limit: int = Query(100, le=500),
     offset: int = Query(0),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor; replaces offset"),
     db: AsyncSession = Depends(get_db),
 ):
-    """List trade calls, optionally filtered by status."""
-    stmt = select(TradeCall).order_by(TradeCall.created_at.desc()).limit(limit).offset(offset)
-    if status:
-        stmt = stmt.where(TradeCall.status == status)
-    result = await db.execute(stmt)
-    return result.scalars().all()
+    """List trade calls, newest first, optionally filtered by status.
+
+    Full pages carry an ``X-Next-Cursor`` header. Passing it back as ``cursor``
+    continues right after the last row (keyset on created_at, id), so pages
+    stay stable and equally cheap however deep the client goes. Finished calls
+    moved to the archive are listed too: with a cursor each table serves its
+    own page from its (created_at, id) index and the two are merged; offset
+    pages are ordered, skipped and limited in SQL over both tables.
+    """
+    tables = (TradeCall,) if status == "active" else (TradeCall, TradeCallArchive)
+    if cursor:
+        created_at, call_id = _decode_cursor(cursor)
+        calls = []
+        for model in tables:
+            stmt = (
+                select(model)
+                .where(tuple_(model.created_at, model.id) < tuple_(created_at, call_id))
+                .order_by(model.created_at.desc(), model.id.desc())
+                .limit(limit)
+            )
+            if status:
+                stmt = stmt.where(model.status == status)
+            calls.extend((await db.execute(stmt)).scalars().all())
+        calls.sort(key=lambda call: (call.created_at, call.id), reverse=True)
+        calls = calls[:limit]
+    else:
+        model = TradeCall if status == "active" else TradeCallHistory
+        stmt = select(model).order_by(model.created_at.desc(), model.id.desc()).offset(offset).limit(limit)
+        if status:
+            stmt = stmt.where(model.status == status)
+        calls = (await db.execute(stmt)).scalars().all()
+
+    if len(calls) == limit:
+        response.headers["X-Next-Cursor"] = _encode_cursor(calls[-1])
+    return calls
+
+
+def _encode_cursor(call: TradeCall) -> str:
+    raw = json.dumps([call.created_at.isoformat(), call.id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, call_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(call_id)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+# ── GET /api/v1/trade-calls/export — Stream the full history ────────────────
+
+@router.get("/export")
+async def export_trade_calls(
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    status: Optional[str] = Query(None, description="Filter by status: active, resolved, expired"),
+):
+    """Stream every trade call (oldest first) as NDJSON or CSV, without paging."""
+    return StreamingResponse(
+        stream_trade_calls(fmt, status),
+        media_type=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="trade_calls.{fmt}"'},
+    )
+
+
+# ── GET /api/v1/trade-calls/events — Live lifecycle events (SSE) ───────────
+
+@router.get("/events")
+async def stream_trade_call_events(request: Request):
+    """Server-sent events for call lifecycle changes: created, tp-hit, sl-hit, expired.
+
+    Each connection gets a bounded queue; a client that falls behind loses
+    events (and receives a ``dropped`` event) instead of slowing the resolver.
+    """
+    subscription = trade_call_events.subscribe()
+
+    async def event_generator():
+        try:
+            async for event in subscription:
+                if await request.is_disconnected():
+                    break
+                yield event
+        finally:
+            trade_call_events.unsubscribe(subscription)
+
+    return EventSourceResponse(event_generator(), media_type="text/event-stream", ping=15)
 
 
 # ── GET /api/v1/trade-calls/stats — Performance statistics ───────────────────
 
 @router.get("/stats", response_model=dict)
-async def get_trade_stats(db: AsyncSession = Depends(get_db)):
-    """Get aggregated performance statistics for all resolved calls."""
-    # Total counts
-    total_q = await db.execute(select(func.count(TradeCall.id)))
-    total = total_q.scalar() or 0
+async def get_trade_stats(request: Request, db: AsyncSession = Depends(get_db)):
+    """Get aggregated performance statistics for all resolved calls.
+
+    The payload is cached per process until a call is created or resolved.
+    Clients sending the last ``ETag`` in ``If-None-Match`` get ``304 Not Modified``.
+    """
+    return await _cached_stats_response(request, db)
+
+
+async def _cached_stats_response(request: Request, db: AsyncSession, key=None, compute=None) -> Response:
+    """Serve a ``stats_cache`` entry, or ``304`` when the client already holds it."""
+    if_none_match = request.headers.get("if-none-match")
+    etag = stats_cache.fresh_etag(key)
+    if etag is None or not _etag_matches(if_none_match, etag):
+        body, etag = await stats_cache.get(db, key, compute)
+        if not _etag_matches(if_none_match, etag):
+            return Response(content=body, media_type="application/json", headers=_stats_cache_headers(etag))
+    return Response(status_code=304, headers=_stats_cache_headers(etag))
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
 
-    active_q = await db.execute(select(func.count(TradeCall.id)).where(TradeCall.status == "active"))
-    active = active_q.scalar() or 0
 
-    resolved_q = await db.execute(select(func.count(TradeCall.id)).where(TradeCall.status == "resolved"))
-    resolved = resolved_q.scalar() or 0
+def _stats_cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": "no-cache"}
 
-    expired_q = await db.execute(select(func.count(TradeCall.id)).where(TradeCall.status == "expired"))
-    expired = expired_q.scalar() or 0
 
-    # Win rates (resolved only — win = at least TP1 hit before SL)
-    resolved_calls_q = await db.execute(
-        select(TradeCall).where(TradeCall.status.in_(["resolved", "expired"]))
+# ── GET /api/v1/trade-calls/calibration — Confidence reliability curve ──────
+
+@router.get("/calibration", response_model=dict)
+async def get_trade_call_calibration(
+    request: Request,
+    bin_width: int = Query(10, ge=1, le=50, description="Width of the confidence bins, in points"),
+    edges: Optional[str] = Query(None, description="Increasing bin edges (1-99) instead of bin_width, e.g. 50,65,80"),
+    group_by: Optional[str] = Query(None, description="Also break the curve down by: symbol, side"),
+    symbol: Optional[str] = Query(None, description="Filter by symbol"),
+    side: Optional[str] = Query(None, description="Filter by side: LONG or SHORT"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stated confidence vs. realized win rate of finished calls, per confidence bin.
+
+    Computed in the database and cached per bin configuration like ``/stats``
+    (invalidated whenever calls change, ``ETag`` / ``If-None-Match`` honoured).
+    """
+    if group_by is not None and group_by not in CALIBRATION_GROUPINGS:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of: {', '.join(CALIBRATION_GROUPINGS)}")
+    if edges:
+        try:
+            cuts = [int(edge) for edge in edges.split(",") if edge.strip()]
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail="edges must be comma-separated integers") from e
+        if not all(1 <= edge <= 99 for edge in cuts) or any(low >= high for low, high in zip(cuts, cuts[1:])):
+            raise HTTPException(status_code=400, detail="edges must be strictly increasing integers between 1 and 99")
+    else:
+        cuts = list(range(bin_width, 100, bin_width))
+    buckets = calibration_buckets(cuts)
+    symbol = symbol.upper() if symbol else None
+    side = side.upper() if side else None
+
+    key = ("calibration", buckets, group_by, symbol, side)
+    return await _cached_stats_response(
+        request, db, key, lambda session: compute_calibration(session, buckets, group_by, symbol, side)
     )
-    resolved_calls = resolved_calls_q.scalars().all()
-
-    wins = 0
-    tp0_hits = 0
-    tp1_hits = 0
-    tp2_hits = 0
-    tp3_hits = 0
-    sl_hits = 0
-    long_wins = 0
-    long_total = 0
-    short_wins = 0
-    short_total = 0
-    total_profit = 0.0
-    profits = []
-
-    # By confidence bucket
-    conf_buckets = {"low": {"wins": 0, "total": 0}, "mid": {"wins": 0, "total": 0}, "high": {"wins": 0, "total": 0}, "very_high": {"wins": 0, "total": 0}}
-
-    # Win rate over time (by week)
-    weekly_data: dict[str, dict] = {}
-
-    for c in resolved_calls:
-        is_win = c.tp1_hit and not c.sl_hit
-        if is_win:
-            wins += 1
-        if c.tp0_hit:
-            tp0_hits += 1
-        if c.tp1_hit:
-            tp1_hits += 1
-        if c.tp2_hit:
-            tp2_hits += 1
-        if c.tp3_hit:
-            tp3_hits += 1
-        if c.sl_hit:
-            sl_hits += 1
-
-        if c.profit_pct is not None:
-            total_profit += c.profit_pct
-            profits.append(c.profit_pct)
-
-        # Side stats
-        if c.side == "LONG":
-            long_total += 1
-            if is_win:
-                long_wins += 1
-        else:
-            short_total += 1
-            if is_win:
-                short_wins += 1
-
-        # Confidence bucket
-        if c.confidence < 50:
-            bucket = "low"
-        elif c.confidence < 65:
-            bucket = "mid"
-        elif c.confidence < 80:
-            bucket = "high"
-        else:
-            bucket = "very_high"
-        conf_buckets[bucket]["total"] += 1
-        if is_win:
-            conf_buckets[bucket]["wins"] += 1
-
-        # Weekly tracking
-        if c.created_at:
-            week_key = c.created_at.strftime("%Y-W%W")
-            if week_key not in weekly_data:
-                weekly_data[week_key] = {"wins": 0, "total": 0}
-            weekly_data[week_key]["total"] += 1
-            if is_win:
-                weekly_data[week_key]["wins"] += 1
-
-    total_resolved = len(resolved_calls)
-    win_rate = round(wins / total_resolved * 100, 1) if total_resolved > 0 else 0
-    avg_profit = round(total_profit / len(profits), 2) if profits else 0
-
-    # Weekly win rate sorted
-    weekly_sorted = []
-    for wk in sorted(weekly_data.keys()):
-        d = weekly_data[wk]
-        wr = round(d["wins"] / d["total"] * 100, 1) if d["total"] > 0 else 0
-        weekly_sorted.append({"week": wk, "wins": d["wins"], "total": d["total"], "win_rate": wr})
 
+
+# ── GET /api/v1/trade-calls/performance — Equity curve and risk metrics ─────
+
+@router.get("/performance", response_model=dict)
+async def get_trade_call_performance(
+    request: Request,
+    points: int = Query(500, ge=10, le=5000, description="Maximum number of equity curve points returned"),
+    window: int = Query(20, ge=1, le=1000, description="Trades in the rolling win rate"),
+    symbol: Optional[str] = Query(None, description="Filter by symbol"),
+    side: Optional[str] = Query(None, description="Filter by side: LONG or SHORT"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Equity curve, max drawdown, Sharpe / Sortino, streaks and rolling win rate of resolved calls.
+
+    The curve is downsampled server-side to about ``points`` points. Cached
+    per parameter set like ``/stats`` (``ETag`` / ``If-None-Match`` honoured).
+    """
+    symbol = symbol.upper() if symbol else None
+    side = side.upper() if side else None
+    key = ("performance", points, window, symbol, side)
+    return await _cached_stats_response(
+        request, db, key, lambda session: compute_performance(session, points, window, symbol, side)
+    )
+
+
+# ── GET /api/v1/admin/trade-calls/simulation — Monte Carlo of fixed-risk sizing
+
+@admin_router.get("/simulation", response_model=dict)
+async def simulate_trade_calls(
+    request: Request,
+    risk_pct: float = Query(1.0, gt=0, le=10, description="Equity risked per call, in %"),
+    paths: int = Query(10_000, ge=100, le=100_000, description="Simulated paths"),
+    trades: int = Query(250, ge=1, le=2000, description="Calls followed per path"),
+    seed: int = Query(0, ge=0, description="Random seed; the same parameters give the same result"),
+    symbol: Optional[str] = Query(None, description="Only sample calls for this symbol"),
+    side: Optional[str] = Query(None, description="Only sample calls on this side: LONG or SHORT"),
+    include_expired: bool = Query(False, description="Count expired calls as scratch trades (0 R)"),
+    db: AsyncSession = Depends(get_db),
+    _current_user: UserResponse = Depends(get_admin_user),
+):
+    """What following every call at a fixed risk per trade could have made.
+
+    Bootstraps ``paths`` sequences of ``trades`` historical outcomes (as R
+    multiples of each call's stop distance) and returns percentile bands of
+    final equity and max drawdown, in % of the starting equity. Cached per
+    parameter set like ``/stats``. Admin only, and at most
+    ``MAX_SIMULATION_CELLS`` paths × trades per run, as each run occupies
+    the worker pool.
+    """
+    if paths * trades > MAX_SIMULATION_CELLS:
+        raise HTTPException(status_code=400, detail=f"paths × trades must be at most {MAX_SIMULATION_CELLS}")
+    symbol = symbol.upper() if symbol else None
+    side = side.upper() if side else None
+
+    async def compute(session: AsyncSession) -> dict:
+        r_multiples = await load_r_multiples(session, symbol, side, include_expired)
+        return await run_simulation(r_multiples, risk_pct, paths, trades, seed)
+
+    key = ("simulation", risk_pct, paths, trades, seed, symbol, side, include_expired)
+    return await _cached_stats_response(request, db, key, compute)
+
+
+# ── GET /api/v1/trade-calls/leaderboard — Symbols ranked by outcomes ────────
+
+@router.get("/leaderboard", response_model=dict)
+async def get_trade_call_leaderboard(
+    period: str = Query("30d", description="Window of call creation: 7d, 30d or all"),
+    sort: str = Query("win_rate", description=f"Ranking column: {', '.join(LEADERBOARD_SORT_COLUMNS)}"),
+    order: str = Query("desc", description="asc or desc"),
+    limit: int = Query(50, ge=1, le=500, description="Max symbols returned"),
+    offset: int = Query(0, ge=0, description="Symbols to skip"),
+    min_finished: int = Query(0, ge=0, description="Hide symbols with fewer finished calls"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Symbols ranked by call outcomes over a time window.
+
+    Served from the precomputed trade_call_leaderboard rollup (updated with
+    every call change, and rolled over to the new UTC day by a background
+    job) with one indexed query.
+    """
+    if period not in PERIODS:
+        raise HTTPException(status_code=400, detail=f"period must be one of: {', '.join(PERIODS)}")
+    if sort not in LEADERBOARD_SORT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(LEADERBOARD_SORT_COLUMNS)}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be asc or desc")
+    return await read_leaderboard(db, period, sort, order, limit, offset, min_finished)
+
+
+# ── POST /api/v1/trade-calls/resolve — Queue a resolution run ───────────────
+
+@router.post("/resolve", response_model=dict)
+async def resolve_active_calls(
+    wait: bool = Query(False, description="Wait for the in-flight (or a fresh) run and return its result"),
+):
+    """Queue a resolution run (plus an expiry sweep) and return the last run's result.
+
+    Resolution itself runs in the background resolver job; concurrent requests
+    collapse into a single run. When the job is not running (e.g. Lambda, where
+    the lifespan is off) or ``wait=true``, the caller joins the in-flight run.
+    """
+    if wait or not resolver_job.running:
+        await resolver_job.run_once()
+        await expiry_job.run_once()
+        queued = False
+    else:
+        resolver_job.trigger()
+        expiry_job.trigger()
+        queued = True
     return {
-        "total_calls": total,
-        "active_calls": active,
-        "resolved_calls": resolved,
-        "expired_calls": expired,
-        "win_rate": win_rate,
-        "tp0_rate": round(tp0_hits / total_resolved * 100, 1) if total_resolved > 0 else 0,
-        "tp1_rate": round(tp1_hits / total_resolved * 100, 1) if total_resolved > 0 else 0,
-        "tp2_rate": round(tp2_hits / total_resolved * 100, 1) if total_resolved > 0 else 0,
-        "tp3_rate": round(tp3_hits / total_resolved * 100, 1) if total_resolved > 0 else 0,
-        "sl_rate": round(sl_hits / total_resolved * 100, 1) if total_resolved > 0 else 0,
-        "avg_profit_pct": avg_profit,
-        "long_win_rate": round(long_wins / long_total * 100, 1) if long_total > 0 else 0,
-        "short_win_rate": round(short_wins / short_total * 100, 1) if short_total > 0 else 0,
-        "long_total": long_total,
-        "short_total": short_total,
-        "confidence_buckets": {
-            "<50%": {"win_rate": round(conf_buckets["low"]["wins"] / conf_buckets["low"]["total"] * 100, 1) if conf_buckets["low"]["total"] > 0 else 0, "total": conf_buckets["low"]["total"]},
-            "50-65%": {"win_rate": round(conf_buckets["mid"]["wins"] / conf_buckets["mid"]["total"] * 100, 1) if conf_buckets["mid"]["total"] > 0 else 0, "total": conf_buckets["mid"]["total"]},
-            "65-80%": {"win_rate": round(conf_buckets["high"]["wins"] / conf_buckets["high"]["total"] * 100, 1) if conf_buckets["high"]["total"] > 0 else 0, "total": conf_buckets["high"]["total"]},
-            ">80%": {"win_rate": round(conf_buckets["very_high"]["wins"] / conf_buckets["very_high"]["total"] * 100, 1) if conf_buckets["very_high"]["total"] > 0 else 0, "total": conf_buckets["very_high"]["total"]},
-        },
-        "weekly_win_rate": weekly_sorted,
+        **(resolver_job.last_result or {}),
+        **(expiry_job.last_result or {}),
+        **resolver_job.status(),
+        "queued": queued,
     }
 
 
-# ── POST /api/v1/trade-calls/resolve — Check active calls against Binance ───
+# ── POST /api/v1/admin/trade-calls/backtest — Replay a rule set ─────────────
 
-@router.post("/resolve", response_model=dict)
-async def resolve_active_calls(db: AsyncSession = Depends(get_db)):
-    """Check active calls against current Binance prices and resolve them."""
-    import httpx
-
-    stmt = select(TradeCall).where(TradeCall.status == "active")
-    result = await db.execute(stmt)
-    active_calls = result.scalars().all()
-
-    if not active_calls:
-        return {"resolved": 0, "expired": 0, "checked": 0}
-
-    # Gather unique symbols
-    symbols = list({c.symbol for c in active_calls})
-
-    # Fetch current prices from Binance
-    prices: dict[str, float] = {}
-    async with httpx.AsyncClient(timeout=10) as client:
-        for sym in symbols:
-            try:
-                resp = await client.get(
-                    f"https://api.binance.com/api/v3/ticker/price?symbol={sym}"
-                )
-                if resp.status_code == 200:
-                    data = resp.json()
-                    prices[sym] = float(data["price"])
-            except Exception as e:
-                logger.warning(f"[TradeCall] Failed to fetch price for {sym}: {e}")
-
-    now = datetime.utcnow()
-    resolved_count = 0
-    expired_count = 0
-
-    for call in active_calls:
-        # Check expiry (72h)
-        if call.expires_at and now >= call.expires_at:
-            call.status = "expired"
-            call.resolved_at = now
-            expired_count += 1
-            logger.info(f"[TradeCall] Call #{call.id} {call.symbol} expired")
-            continue
-
-        current_price = prices.get(call.symbol)
-        if current_price is None:
-            continue
-
-        # Check TP/SL hits based on side
-        if call.side == "LONG":
-            if current_price <= call.stop_loss:
-                call.sl_hit = True
-                call.status = "resolved"
-                call.exit_price = current_price
-                call.profit_pct = round((current_price - call.entry_price) / call.entry_price * 100, 2)
-                call.resolved_at = now
-                resolved_count += 1
-                logger.info(f"[TradeCall] Call #{call.id} {call.symbol} LONG SL hit @ {current_price}")
-                continue
-
-            if call.tp0 and current_price >= call.tp0:
-                call.tp0_hit = True
-            if current_price >= call.tp1:
-                call.tp0_hit = True
-                call.tp1_hit = True
-                call.best_tp_reached = max(call.best_tp_reached, 1)
-            if current_price >= call.tp2:
-                call.tp2_hit = True
-                call.best_tp_reached = max(call.best_tp_reached, 2)
-            if current_price >= call.tp3:
-                call.tp3_hit = True
-                call.best_tp_reached = max(call.best_tp_reached, 3)
-                call.status = "resolved"
-                call.exit_price = current_price
-                call.profit_pct = round((current_price - call.entry_price) / call.entry_price * 100, 2)
-                call.resolved_at = now
-                resolved_count += 1
-                logger.info(f"[TradeCall] Call #{call.id} {call.symbol} LONG TP3 hit @ {current_price}")
-
-        else:  # SHORT
-            if current_price >= call.stop_loss:
-                call.sl_hit = True
-                call.status = "resolved"
-                call.exit_price = current_price
-                call.profit_pct = round((call.entry_price - current_price) / call.entry_price * 100, 2)
-                call.resolved_at = now
-                resolved_count += 1
-                logger.info(f"[TradeCall] Call #{call.id} {call.symbol} SHORT SL hit @ {current_price}")
-                continue
-
-            if call.tp0 and current_price <= call.tp0:
-                call.tp0_hit = True
-            if current_price <= call.tp1:
-                call.tp0_hit = True
-                call.tp1_hit = True
-                call.best_tp_reached = max(call.best_tp_reached, 1)
-            if current_price <= call.tp2:
-                call.tp2_hit = True
-                call.best_tp_reached = max(call.best_tp_reached, 2)
-            if current_price <= call.tp3:
-                call.tp3_hit = True
-                call.best_tp_reached = max(call.best_tp_reached, 3)
-                call.status = "resolved"
-                call.exit_price = current_price
-                call.profit_pct = round((call.entry_price - current_price) / call.entry_price * 100, 2)
-                call.resolved_at = now
-                resolved_count += 1
-                logger.info(f"[TradeCall] Call #{call.id} {call.symbol} SHORT TP3 hit @ {current_price}")
-
-    await db.commit()
-
-    return {"resolved": resolved_count, "expired": expired_count, "checked": len(active_calls)}
\ No newline at end of file
+MAX_BACKTEST_CALLS = 200_000
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@admin_router.post("/backtest", response_model=dict)
+async def backtest_trade_calls(
+    body: BacktestRequest,
+    db: AsyncSession = Depends(get_db),
+    _current_user: UserResponse = Depends(get_admin_user),
+):
+    """Replay calls against historical candles and report the /stats figures for them.
+
+    By default the recorded calls created in ``[start, end)`` that pass
+    ``rules`` are replayed; pass ``calls`` to replay candidate calls instead.
+    """
+    if body.interval not in INTERVAL_MS:
+        raise HTTPException(status_code=400, detail=f"interval must be one of: {', '.join(INTERVAL_MS)}")
+
+    if body.calls is not None:
+        candidates = []
+        for call in body.calls:
+            values = call.model_dump()
+            values["created_at"] = _naive_utc(call.created_at)
+            values["expires_at"] = _naive_utc(call.expires_at)
+            candidates.append(values)
+    else:
+        end = _naive_utc(body.end) or datetime.utcnow()
+        start = _naive_utc(body.start) or end - timedelta(days=365)
+        # One past the cap is enough to reject the run
+        candidates = await load_candidates(db, start, end, **body.rules.model_dump(), limit=MAX_BACKTEST_CALLS + 1)
+
+    if len(candidates) > MAX_BACKTEST_CALLS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BACKTEST_CALLS} calls per backtest")
+    return await run_backtest(candidates, body.interval, body.include_calls)
+
+
+# ── POST /api/v1/admin/trade-calls/scan — Run the market scanner ────────────
+
+@admin_router.post("/scan", response_model=dict)
+async def scan_market(
+    wait: bool = Query(False, description="Wait for the in-flight (or a fresh) scan and return its result"),
+    _current_user: UserResponse = Depends(get_admin_user),
+):
+    """Queue a market scan and return the last scan's result, including per-stage timings.
+
+    Same single-flight behaviour as ``/resolve``: when the scanner job is not
+    running or ``wait=true``, the caller joins the in-flight scan.
+    """
+    if wait or not scanner_job.running:
+        await scanner_job.run_once()
+        queued = False
+    else:
+        scanner_job.trigger()
+        queued = True
+    return {**(scanner_job.last_result or {}), **scanner_job.status(), "queued": queued}
+
+
+# ── POST /api/v1/admin/trade-calls/archive — Move old finished calls out ────
+
+@admin_router.post("/archive", response_model=dict)
+async def archive_trade_calls(
+    wait: bool = Query(False, description="Wait for the in-flight (or a fresh) pass and return its result"),
+    _current_user: UserResponse = Depends(get_admin_user),
+):
+    """Queue an archive pass and return the last pass's result.
+
+    Moves resolved and expired calls older than
+    ``TRADE_CALL_ARCHIVE_RETENTION_DAYS`` to the archive table; they stay
+    visible in the list, export and analytics endpoints. With a retention of
+    0 archival is disabled: nothing moves and the result says ``disabled``.
+    Same single-flight behaviour as ``/resolve``.
+    """
+    if wait or not archive_job.running:
+        await archive_job.run_once()
+        queued = False
+    else:
+        archive_job.trigger()
+        queued = True
+    return {**(archive_job.last_result or {}), **archive_job.status(), "queued": queued}
@@ -0,0 +1,372 @@
+"""
+Trade call backtesting.
+Replays candidate trade calls against historical candles with NumPy and reports the same figures as /stats.
+"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import numpy as np
+from core.config import settings
+from models.trade_call_archive import TradeCallHistory
+from services.candle_store import CandleStore, candle_store
+from services.candles import INTERVAL_MS
+from services.trade_call_stats import stats_from_states
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+TP_LEVELS = ("tp0", "tp1", "tp2", "tp3")
+LEVELS = TP_LEVELS + ("sl",)
+STATUSES = ("active", "resolved", "expired")
+
+# Upper bound on the (calls × candles) cells compared at once, to cap memory
+MAX_CELLS = 4_000_000
+
+CANDIDATE_COLUMNS = (
+    "id",
+    "symbol",
+    "side",
+    "entry_price",
+    "stop_loss",
+    "tp0",
+    "tp1",
+    "tp2",
+    "tp3",
+    "confidence",
+    "created_at",
+    "expires_at",
+)
+
+
+def _from_ms(ms: int) -> datetime:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).replace(tzinfo=None)
+
+
+def _first_true(mask: np.ndarray) -> np.ndarray:
+    """Column index of the first True in each row, or -1."""
+    return np.where(mask.any(axis=1), mask.argmax(axis=1), -1)
+
+
+def simulate(
+    open_time: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    calls: dict[str, np.ndarray],
+    data_end_ms: int,
+) -> dict[str, np.ndarray]:
+    """Replay many calls on one symbol's candles at once.
+
+    ``calls`` holds per-call arrays: ``is_long``, ``entry_price``,
+    ``stop_loss``, ``targets`` (n × 4, NaN = no target), ``start_ms`` and
+    ``end_ms``. A call sees the candles opening in ``[start_ms, end_ms]``,
+    and is judged with the candle resolver's rules: the stop wins a candle
+    that touches both, TP1 implies TP0, TP3 closes at TP3 and the stop at
+    the stop price. Calls still open when the data ends (``data_end_ms``)
+    stay active; the rest expire.
+
+    Returns ``hit_ms`` (n × 5, open time of the hitting candle per
+    TP0..TP3/SL, -1 if not hit), ``status`` (index into STATUSES),
+    ``exit_price`` and ``profit_pct`` (NaN when not closed), and ``mfe_pct``
+    / ``mae_pct`` up to the closing candle (NaN when no candle was seen).
+    """
+    n = len(calls["is_long"])
+    is_long = calls["is_long"]
+    lo = np.searchsorted(open_time, calls["start_ms"], side="left")
+    hi = np.searchsorted(open_time, calls["end_ms"], side="right")
+    span = np.maximum(hi - lo, 0)
+    hits = np.full((n, len(LEVELS)), -1, dtype=np.int64)
+    best_high = np.full(n, -np.inf)
+    best_low = np.full(n, np.inf)
+
+    width = int(span.max()) if n else 0
+    if width:
+        steps = np.arange(width)
+        chunk = max(1, MAX_CELLS // width)
+        for first in range(0, n, chunk):
+            rows = slice(first, first + chunk)
+            idx = np.minimum(lo[rows, None] + steps[None, :], len(open_time) - 1)
+            valid = steps[None, :] < span[rows, None]
+            highs, lows = high[idx], low[idx]
+            long_side = is_long[rows, None]
+            stop = calls["stop_loss"][rows, None]
+            hits[rows, 4] = _first_true(valid & np.where(long_side, lows <= stop, highs >= stop))
+            for k in range(len(TP_LEVELS)):
+                target = calls["targets"][rows, k, None]
+                hits[rows, k] = _first_true(valid & np.where(long_side, highs >= target, lows <= target))
+            # Excursions run up to (and including) the candle that closes the call
+            closing = np.where(hits[rows, 4] >= 0, hits[rows, 4], width)
+            closing = np.where(hits[rows, 3] >= 0, np.minimum(closing, hits[rows, 3]), closing)
+            seen = valid & (steps[None, :] <= closing[:, None])
+            best_high[rows] = np.where(seen, highs, -np.inf).max(axis=1)
+            best_low[rows] = np.where(seen, lows, np.inf).min(axis=1)
+
+    # Targets only count before the stop; TP1 implies TP0
+    stop_idx = hits[:, 4]
+    cutoff = np.where(stop_idx >= 0, stop_idx, width)
+    tp = np.where(hits[:, :4] < cutoff[:, None], hits[:, :4], -1)
+    tp1_hit = tp[:, 1] >= 0
+    fill_tp0 = tp1_hit & ~((tp[:, 0] >= 0) & (tp[:, 0] <= tp[:, 1]))
+    tp[fill_tp0, 0] = tp[fill_tp0, 1]
+
+    tp3_hit = tp[:, 3] >= 0
+    stopped = ~tp3_hit & (stop_idx >= 0)
+    hits = np.column_stack([tp, np.where(stopped, stop_idx, -1)])
+
+    status = np.zeros(n, dtype=np.int8)
+    status[tp3_hit | stopped] = STATUSES.index("resolved")
+    status[(status == 0) & (calls["end_ms"] < data_end_ms)] = STATUSES.index("expired")
+
+    exit_price = np.where(tp3_hit, calls["targets"][:, 3], np.where(stopped, calls["stop_loss"], np.nan))
+    sign = np.where(is_long, 1.0, -1.0)
+    profit_pct = np.round(sign * (exit_price - calls["entry_price"]) / calls["entry_price"] * 100, 2)
+
+    entry = calls["entry_price"]
+    with np.errstate(invalid="ignore"):
+        favorable = np.where(is_long, best_high - entry, entry - best_low)
+        adverse = np.where(is_long, entry - best_low, best_high - entry)
+    unseen = span == 0
+    mfe_pct = np.where(unseen, np.nan, np.round(np.maximum(favorable, 0.0) / entry * 100, 2))
+    mae_pct = np.where(unseen, np.nan, np.round(np.maximum(adverse, 0.0) / entry * 100, 2))
+
+    hit_ms = np.full(hits.shape, -1, dtype=np.int64)
+    found = hits >= 0
+    hit_ms[found] = open_time[(lo[:, None] + hits)[found]]
+    return {
+        "hit_ms": hit_ms,
+        "status": status,
+        "exit_price": exit_price,
+        "profit_pct": profit_pct,
+        "mfe_pct": mfe_pct,
+        "mae_pct": mae_pct,
+    }
+
+
+def _simulate_symbol(root: str, symbol: str, interval: str, calls: dict[str, np.ndarray], data_end_ms: int) -> dict:
+    """Process-pool entry point: memory-map the symbol's candles and replay its calls."""
+    step = INTERVAL_MS[interval]
+    candles = CandleStore(root).read(symbol, interval, int(calls["start_ms"].min()), int(calls["end_ms"].max()) + step)
+    return simulate(candles.open_time, candles.high, candles.low, calls, data_end_ms)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_worker_pool() -> ProcessPoolExecutor:
+    """The process pool shared by backtests and Monte Carlo simulations."""
+    global _pool
+    if _pool is None:
+        # spawn, not fork: the parent runs threads (e.g. aiosqlite) that must not be forked mid-lock
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.backtest_max_workers or None, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+async def stop_backtest_pool():
+    """Stop the backtest / simulation worker processes (called from the app lifespan)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+# ── Candidates ───────────────────────────────────────────────────────────────
+
+
+async def load_candidates(
+    db: AsyncSession,
+    start: datetime,
+    end: datetime,
+    *,
+    min_confidence: Optional[int] = None,
+    max_confidence: Optional[int] = None,
+    min_rsi4h: Optional[float] = None,
+    max_rsi4h: Optional[float] = None,
+    require_convergence: bool = False,
+    min_rr: Optional[float] = None,
+    sides: Optional[list[str]] = None,
+    symbols: Optional[list[str]] = None,
+    limit: Optional[int] = None,
+) -> list[dict]:
+    """Recorded calls (archived ones included) created in ``[start, end)`` that pass the rule set.
+
+    At most ``limit`` calls are loaded, so callers can reject oversized runs
+    without reading them all.
+    """
+    conditions = [TradeCallHistory.created_at >= start, TradeCallHistory.created_at < end]
+    if min_confidence is not None:
+        conditions.append(TradeCallHistory.confidence >= min_confidence)
+    if max_confidence is not None:
+        conditions.append(TradeCallHistory.confidence <= max_confidence)
+    if min_rsi4h is not None:
+        conditions.append(TradeCallHistory.rsi4h >= min_rsi4h)
+    if max_rsi4h is not None:
+        conditions.append(TradeCallHistory.rsi4h <= max_rsi4h)
+    if require_convergence:
+        conditions.append(TradeCallHistory.has_convergence.is_(True))
+    if min_rr is not None:
+        conditions.append(TradeCallHistory.rr >= min_rr)
+    if sides:
+        conditions.append(TradeCallHistory.side.in_(sides))
+    if symbols:
+        conditions.append(TradeCallHistory.symbol.in_(symbols))
+
+    stmt = select(*(getattr(TradeCallHistory, col) for col in CANDIDATE_COLUMNS)).where(and_(*conditions))
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return [dict(row._mapping) for row in (await db.execute(stmt)).all()]
+
+
+def _datetime_ms(values: list[datetime]) -> np.ndarray:
+    """Naive-UTC datetimes → epoch milliseconds."""
+    return np.array(values, dtype="datetime64[ms]").astype(np.int64)
+
+
+def _call_arrays(calls: list[dict], step: int) -> dict[str, np.ndarray]:
+    created_ms = _datetime_ms([c["created_at"] for c in calls])
+    expires = [c.get("expires_at") or c["created_at"] + timedelta(hours=72) for c in calls]
+    return {
+        "is_long": np.array([c["side"] == "LONG" for c in calls], dtype=bool),
+        "entry_price": np.array([c["entry_price"] for c in calls], dtype=np.float64),
+        "stop_loss": np.array([c["stop_loss"] for c in calls], dtype=np.float64),
+        "targets": np.array(
+            [[c.get(level) or np.nan for level in TP_LEVELS] for c in calls], dtype=np.float64
+        ).reshape(len(calls), len(TP_LEVELS)),
+        "start_ms": created_ms // step * step,
+        "end_ms": _datetime_ms(expires),
+    }
+
+
+def _outcomes(calls: list[dict], result: dict, detailed: bool) -> list[dict]:
+    """Replayed outcomes shaped like trade call fields.
+
+    Without ``detailed``, only the fields the /stats aggregates read.
+    """
+    hit_ms = result["hit_ms"].tolist()
+    statuses = [STATUSES[code] for code in result["status"].tolist()]
+    exit_prices = result["exit_price"].tolist()
+    profits = result["profit_pct"].tolist()
+    mfes = [None if math.isnan(value) else value for value in result["mfe_pct"].tolist()]
+    maes = [None if math.isnan(value) else value for value in result["mae_pct"].tolist()]
+
+    outcomes = []
+    for call, hits, status, exit_price, profit, mfe, mae in zip(
+        calls, hit_ms, statuses, exit_prices, profits, mfes, maes
+    ):
+        closed = status == "resolved"
+        outcome = {
+            "symbol": call["symbol"],
+            "side": call["side"],
+            "confidence": call["confidence"],
+            "created_at": call["created_at"],
+            "status": status,
+            "profit_pct": profit if closed else None,
+            "mfe_pct": mfe,
+            "mae_pct": mae,
+        }
+        for level, ms in zip(LEVELS, hits):
+            outcome[f"{level}_hit"] = ms >= 0
+        if detailed:
+            order = sorted((ms, idx, level) for idx, (level, ms) in enumerate(zip(LEVELS, hits)) if ms >= 0)
+            reached = [int(level[-1]) for _, _, level in order if level in ("tp1", "tp2", "tp3")]
+            outcome.update(
+                id=call.get("id"),
+                exit_price=exit_price if closed else None,
+                hit_order=",".join(level for _, _, level in order) or None,
+                best_tp_reached=max(reached, default=0),
+                **{f"{level}_hit_at": _from_ms(ms) if ms >= 0 else None for level, ms in zip(LEVELS, hits)},
+            )
+        outcomes.append(outcome)
+    return outcomes
+
+
+# ── Runs ─────────────────────────────────────────────────────────────────────
+
+
+async def run_backtest(calls: list[dict], interval: str = "1h", include_calls: bool = False) -> dict:
+    """Replay ``calls`` (dicts of trade call fields) and return the /stats figures for the outcomes.
+
+    Candles come from the local candle store, synced first for each
+    symbol's window. Symbols are replayed in a process pool when there is
+    more than one, otherwise in a thread; the array building and scoring run
+    in a thread too, so the event loop only waits on the candle syncs.
+    """
+    if interval not in INTERVAL_MS:
+        raise ValueError(f"Unknown candle interval: {interval}")
+    start_time = time.time()
+    step = INTERVAL_MS[interval]
+
+    by_symbol: dict[str, list[dict]] = {}
+    for call in calls:
+        by_symbol.setdefault(call["symbol"], []).append(call)
+    arrays = await asyncio.to_thread(
+        lambda: {symbol: _call_arrays(symbol_calls, step) for symbol, symbol_calls in by_symbol.items()}
+    )
+
+    semaphore = asyncio.Semaphore(settings.price_fetch_concurrency)
+
+    async def sync(symbol: str) -> Optional[int]:
+        window = arrays[symbol]
+        async with semaphore:
+            try:
+                start_ms, end_ms = int(window["start_ms"].min()), int(window["end_ms"].max()) + step
+                await candle_store.sync(symbol, interval, start_ms, end_ms)
+                covered = await asyncio.to_thread(candle_store.coverage, symbol, interval)
+                return covered[1] if covered else None
+            except Exception as e:
+                logger.warning(f"[Backtest] No {interval} candles for {symbol}: {e}")
+                return None
+
+    symbols = list(by_symbol)
+    data_end = dict(zip(symbols, await asyncio.gather(*(sync(symbol) for symbol in symbols))))
+    runnable = [symbol for symbol in symbols if data_end[symbol] is not None]
+    fetched_at = time.time()
+
+    root = str(candle_store.root)
+    if len(runnable) > 1 and settings.backtest_max_workers != 1:
+        loop = asyncio.get_running_loop()
+        pool = get_worker_pool()
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(pool, _simulate_symbol, root, sym, interval, arrays[sym], data_end[sym])
+                for sym in runnable
+            )
+        )
+    else:
+        results = await asyncio.to_thread(
+            lambda: [_simulate_symbol(root, sym, interval, arrays[sym], data_end[sym]) for sym in runnable]
+        )
+
+    def score() -> tuple[list[dict], dict]:
+        outcomes = []
+        for symbol, result in zip(runnable, results):
+            outcomes.extend(_outcomes(by_symbol[symbol], result, include_calls))
+        return outcomes, stats_from_states(outcomes)
+
+    outcomes, stats = await asyncio.to_thread(score)
+
+    elapsed = time.time() - start_time
+    logger.info(
+        f"[Backtest] {len(outcomes)} calls over {len(runnable)} symbols ({interval}) in {elapsed:.2f}s "
+        f"(candles {fetched_at - start_time:.2f}s)"
+    )
+    report = {
+        "interval": interval,
+        "candidates": len(calls),
+        "replayed": len(outcomes),
+        "symbols": len(runnable),
+        "skipped_symbols": [symbol for symbol in symbols if data_end[symbol] is None],
+        "elapsed_seconds": round(elapsed, 3),
+        "stats": stats,
+    }
+    if include_calls:
+        report["calls"] = outcomes
+    return report
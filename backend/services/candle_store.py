@@ -0,0 +1,290 @@
+"""
+Local candle store.
+Keeps closed OHLCV candles on disk as fixed-width binary column files and reads them back as memory-mapped NumPy slices.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from core.config import settings
+from services.candles import INTERVAL_MS, CandleSeries, CandleSource, get_candle_source
+from services.scheduler import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+# One little-endian file per column; row i of every file is the same candle
+COLUMN_DTYPES = {
+    "open_time": np.dtype("<i8"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<f8"),
+}
+
+_SYMBOL_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class CandleStore:
+    """Per-symbol, per-interval candle files under ``root/<interval>/<symbol>/``.
+
+    Only closed candles are stored, sorted by open time and without
+    duplicates. Each series also records the ``[synced_from, synced_to)``
+    range already fetched from the exchange, so a window inside it is served
+    from disk even where the exchange had no candles (e.g. maintenance).
+    The synced range is kept contiguous: a request outside it fetches the
+    whole gap in between.
+
+    The methods themselves are synchronous file I/O; the async ones run them
+    in a worker thread. Writes to a series are serialized by its lock in
+    :meth:`sync`, and a series should have a single writer process.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or settings.candle_store_dir)
+        self._maps: dict[tuple[str, str], dict[str, np.ndarray]] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+    def _dir(self, symbol: str, interval: str) -> Path:
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Unknown candle interval: {interval}")
+        if not _SYMBOL_RE.match(symbol):
+            raise ValueError(f"Invalid symbol: {symbol}")
+        return self.root / interval / symbol
+
+    # ── Metadata ─────────────────────────────────────────────────────────────
+
+    def coverage(self, symbol: str, interval: str) -> Optional[tuple[int, int]]:
+        """The ``(synced_from, synced_to)`` range already fetched, or None."""
+        meta_path = self._dir(symbol, interval) / "meta.json"
+        if not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text())
+        return meta["synced_from"], meta["synced_to"]
+
+    def _set_coverage(self, symbol: str, interval: str, synced_from: int, synced_to: int) -> None:
+        meta_path = self._dir(symbol, interval) / "meta.json"
+        meta_path.parent.mkdir(parents=True, exist_ok=True)  # a range with no candles wrote no columns
+        tmp_path = meta_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"synced_from": synced_from, "synced_to": synced_to}))
+        os.replace(tmp_path, meta_path)
+
+    def series(self) -> list[tuple[str, str]]:
+        """Every stored ``(symbol, interval)``."""
+        if not self.root.exists():
+            return []
+        return sorted((meta.parent.name, meta.parent.parent.name) for meta in self.root.glob("*/*/meta.json"))
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def _columns(self, symbol: str, interval: str) -> dict[str, np.ndarray]:
+        """Read-only memmaps of a series' columns (cached until the next write)."""
+        key = (symbol, interval)
+        cols = self._maps.get(key)
+        if cols is not None:
+            return cols
+
+        directory = self._dir(symbol, interval)
+        sizes = {}
+        for name, dtype in COLUMN_DTYPES.items():
+            path = directory / f"{name}.bin"
+            sizes[name] = path.stat().st_size // dtype.itemsize if path.exists() else 0
+        # A write interrupted between column files leaves them uneven; trust the common prefix
+        length = min(sizes.values())
+        if length == 0:
+            cols = {name: np.empty(0, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
+        else:
+            cols = {
+                name: np.memmap(directory / f"{name}.bin", dtype=dtype, mode="r", shape=(length,))
+                for name, dtype in COLUMN_DTYPES.items()
+            }
+        self._maps[key] = cols
+        return cols
+
+    def read(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> CandleSeries:
+        """Stored candles opening in ``[start_ms, end_ms)``, as zero-copy views of the files."""
+        cols = self._columns(symbol, interval)
+        open_time = cols["open_time"]
+        lo = int(np.searchsorted(open_time, start_ms, side="left"))
+        hi = int(np.searchsorted(open_time, end_ms, side="left"))
+        return CandleSeries(*(cols[name][lo:hi] for name in COLUMN_DTYPES))
+
+    # ── Writes ───────────────────────────────────────────────────────────────
+
+    def append(self, symbol: str, interval: str, series: CandleSeries) -> int:
+        """Add candles, skipping ones already stored; returns the number added.
+
+        Candles newer than the last stored one are appended to the files;
+        anything landing before it is merged in with a rewrite.
+        """
+        if len(series) == 0:
+            return 0
+        directory = self._dir(symbol, interval)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        # Later duplicates win within the batch (e.g. overlapping pages)
+        _, last_idx = np.unique(series.open_time[::-1], return_index=True)
+        keep = len(series) - 1 - last_idx
+        incoming = {name: np.asarray(getattr(series, name))[keep] for name in COLUMN_DTYPES}
+
+        stored = self._columns(symbol, interval)
+        stored_times = stored["open_time"]
+        last = int(stored_times[-1]) if len(stored_times) else None
+        older = incoming["open_time"] <= last if last is not None else np.zeros(len(keep), dtype=bool)
+        if older.any() and not np.isin(incoming["open_time"][older], stored_times).all():
+            return self._merge(symbol, interval, stored, incoming)
+
+        newer = ~older
+        added = int(newer.sum())
+        if added:
+            for name, dtype in COLUMN_DTYPES.items():
+                with open(directory / f"{name}.bin", "r+b" if len(stored_times) else "wb") as f:
+                    # Truncate to the common length first, in case an earlier append was interrupted
+                    f.truncate(len(stored_times) * dtype.itemsize)
+                    f.seek(0, os.SEEK_END)
+                    f.write(incoming[name][newer].astype(dtype, copy=False).tobytes())
+            # Dropped once the files are complete: a read racing the write may have cached a partial map
+            self._maps.pop((symbol, interval), None)
+        return added
+
+    def _merge(self, symbol: str, interval: str, stored: dict, incoming: dict) -> int:
+        directory = self._dir(symbol, interval)
+        times = np.concatenate([incoming["open_time"], stored["open_time"]])
+        _, first_idx = np.unique(times, return_index=True)  # incoming wins on conflicts
+        added = len(first_idx) - len(stored["open_time"])
+        merged = {name: np.concatenate([incoming[name], stored[name]])[first_idx] for name in COLUMN_DTYPES}
+
+        for name, dtype in COLUMN_DTYPES.items():
+            tmp_path = directory / f"{name}.bin.tmp"
+            tmp_path.write_bytes(merged[name].astype(dtype, copy=False).tobytes())
+            os.replace(tmp_path, directory / f"{name}.bin")
+        self._maps.pop((symbol, interval), None)
+        return added
+
+    # ── Sync ─────────────────────────────────────────────────────────────────
+
+    def _lock(self, symbol: str, interval: str) -> asyncio.Lock:
+        return self._locks.setdefault((symbol, interval), asyncio.Lock())
+
+    async def sync(
+        self, symbol: str, interval: str, start_ms: int, end_ms: int, source: Optional[CandleSource] = None
+    ) -> int:
+        """Fetch whatever part of ``[start_ms, end_ms)`` is not stored yet; returns candles added.
+
+        Only closed candles are fetched, so ``end_ms`` is capped at the open
+        time of the candle currently forming.
+        """
+        step = INTERVAL_MS[interval]
+        start_ms = start_ms // step * step
+        end_ms = min(end_ms, _now_ms() // step * step)
+        if end_ms <= start_ms:
+            return 0
+
+        async with self._lock(symbol, interval):
+            covered = await asyncio.to_thread(self.coverage, symbol, interval)
+            if covered is None:
+                gaps = [(start_ms, end_ms)]
+            else:
+                gaps = []
+                if start_ms < covered[0]:
+                    gaps.append((start_ms, covered[0]))
+                if end_ms > covered[1]:
+                    gaps.append((covered[1], end_ms))
+            if not gaps:
+                return 0
+
+            source = source or get_candle_source()
+            added = 0
+            for gap_start, gap_end in gaps:
+                fetched = await source.fetch_candles(symbol, interval, gap_start, gap_end)
+                added += await asyncio.to_thread(self.append, symbol, interval, fetched.slice(gap_start, gap_end))
+            synced_from = start_ms if covered is None else min(start_ms, covered[0])
+            synced_to = end_ms if covered is None else max(end_ms, covered[1])
+            await asyncio.to_thread(self._set_coverage, symbol, interval, synced_from, synced_to)
+
+        if added:
+            logger.debug(f"[CandleStore] {symbol} {interval}: stored {added} candles from {len(gaps)} gap(s)")
+        return added
+
+    async def get(
+        self, symbol: str, interval: str, start_ms: int, end_ms: int, source: Optional[CandleSource] = None
+    ) -> CandleSeries:
+        """Closed candles opening in ``[start_ms, end_ms)``, fetching only what is not on disk."""
+        await self.sync(symbol, interval, start_ms, end_ms, source)
+        return await asyncio.to_thread(self.read, symbol, interval, start_ms, end_ms)
+
+    async def get_many(
+        self, requests: dict[str, tuple[int, int]], interval: str, source: Optional[CandleSource] = None
+    ) -> tuple[dict[str, CandleSeries], set[str]]:
+        """:meth:`get` for several symbols concurrently; returns ``(series by symbol, symbols whose sync failed)``.
+
+        Failed symbols are left out of the series. Callers can tell them apart
+        from symbols that simply have no candles, which come back empty.
+        """
+        semaphore = asyncio.Semaphore(settings.price_fetch_concurrency)
+
+        async def get(symbol: str, start_ms: int, end_ms: int) -> Optional[CandleSeries]:
+            async with semaphore:
+                try:
+                    return await self.get(symbol, interval, start_ms, end_ms, source)
+                except Exception as e:
+                    logger.warning(f"[CandleStore] Failed to load {interval} candles for {symbol}: {e}")
+                    return None
+
+        symbols = list(requests)
+        results = await asyncio.gather(*(get(sym, *requests[sym]) for sym in symbols))
+        loaded = {sym: series for sym, series in zip(symbols, results) if series is not None}
+        return loaded, set(symbols) - loaded.keys()
+
+
+candle_store = CandleStore()
+
+
+async def sync_candle_store() -> dict:
+    """Bring every stored series up to the last closed candle."""
+    now_ms = _now_ms()
+    series = await asyncio.to_thread(candle_store.series)
+    semaphore = asyncio.Semaphore(settings.price_fetch_concurrency)
+
+    async def sync(symbol: str, interval: str) -> int:
+        async with semaphore:
+            try:
+                synced_from, _ = await asyncio.to_thread(candle_store.coverage, symbol, interval)
+                return await candle_store.sync(symbol, interval, synced_from, now_ms)
+            except Exception as e:
+                logger.warning(f"[CandleStore] Failed to sync {interval} candles for {symbol}: {e}")
+                return 0
+
+    added = await asyncio.gather(*(sync(symbol, interval) for symbol, interval in series))
+    return {"series": len(series), "added": sum(added)}
+
+
+candle_sync_job = PeriodicJob(
+    "candle-store-sync",
+    sync_candle_store,
+    interval_seconds=settings.candle_store_sync_interval_seconds,
+)
+
+
+async def start_candle_store_sync():
+    """Start the background gap-filling sync (called from the app lifespan)."""
+    if not settings.candle_store_sync_enabled:
+        logger.info("Candle store sync disabled")
+        return
+    candle_sync_job.start()
+
+
+async def stop_candle_store_sync():
+    """Stop the background candle store sync."""
+    await candle_sync_job.stop()
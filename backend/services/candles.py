@@ -0,0 +1,163 @@
+"""
+Candle (OHLCV) service.
+Fetches klines from the exchange as NumPy column arrays for vectorized analysis.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import httpx
+import numpy as np
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Binance kline interval → milliseconds
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "6h": 21_600_000,
+    "8h": 28_800_000,
+    "12h": 43_200_000,
+    "1d": 86_400_000,
+}
+
+KLINES_PAGE_LIMIT = 1000
+
+# Binance error code for an unknown (or delisted) symbol
+BINANCE_INVALID_SYMBOL = -1121
+
+
+class CandleSeries:
+    """Column-oriented OHLCV candles, sorted by open time.
+
+    ``open_time`` is an int64 array of epoch milliseconds; the price and volume
+    columns are float64 arrays of the same length.
+    """
+
+    __slots__ = ("open_time", "open", "high", "low", "close", "volume")
+
+    def __init__(self, open_time, open, high, low, close, volume):
+        self.open_time = np.asarray(open_time, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.float64)
+
+    @classmethod
+    def empty(cls) -> "CandleSeries":
+        return cls([], [], [], [], [], [])
+
+    def __len__(self) -> int:
+        return len(self.open_time)
+
+    def slice(self, start_ms: int, end_ms: int) -> "CandleSeries":
+        """Candles whose open time lies in ``[start_ms, end_ms)`` (views, no copy)."""
+        lo = int(np.searchsorted(self.open_time, start_ms, side="left"))
+        hi = int(np.searchsorted(self.open_time, end_ms, side="left"))
+        return CandleSeries(*(getattr(self, col)[lo:hi] for col in self.__slots__))
+
+
+class CandleSource(ABC):
+    """Pluggable source of historical candles."""
+
+    @abstractmethod
+    async def fetch_candles(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> CandleSeries:
+        """Fetch candles for ``symbol`` opening in ``[start_ms, end_ms)``."""
+
+
+class BinanceCandleSource(CandleSource):
+    """Binance-compatible ``/api/v3/klines`` source, paging through long ranges."""
+
+    def __init__(self, base_url: Optional[str] = None, timeout: Optional[float] = None):
+        self.base_url = (base_url or settings.price_source_base_url).rstrip("/")
+        self.timeout = timeout or settings.price_fetch_timeout_seconds
+
+    async def fetch_candles(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> CandleSeries:
+        step = INTERVAL_MS[interval]
+        rows: list[list] = []
+        cursor = start_ms
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            while cursor < end_ms:
+                resp = await client.get(
+                    f"{self.base_url}/api/v3/klines",
+                    params={
+                        "symbol": symbol,
+                        "interval": interval,
+                        "startTime": cursor,
+                        "endTime": end_ms - 1,
+                        "limit": KLINES_PAGE_LIMIT,
+                    },
+                )
+                if _is_invalid_symbol(resp):
+                    break  # the exchange has no candles for it: an empty series, not a failed fetch
+                resp.raise_for_status()
+                page = resp.json()
+                if not page:
+                    break
+                rows.extend(page)
+                cursor = int(page[-1][0]) + step
+                if len(page) < KLINES_PAGE_LIMIT:
+                    break
+
+        if not rows:
+            return CandleSeries.empty()
+        cols = list(zip(*((r[0], r[1], r[2], r[3], r[4], r[5]) for r in rows)))
+        return CandleSeries(*cols)
+
+
+def _is_invalid_symbol(resp: httpx.Response) -> bool:
+    if resp.status_code != 400:
+        return False
+    try:
+        return resp.json().get("code") == BINANCE_INVALID_SYMBOL
+    except ValueError:
+        return False
+
+
+async def fetch_candles_many(
+    source: CandleSource, requests: dict[str, tuple[int, int]], interval: str
+) -> dict[str, CandleSeries]:
+    """Fetch candles for several symbols concurrently, each with its own ``(start_ms, end_ms)`` range.
+
+    Symbols whose fetch fails are left out of the result.
+    """
+    semaphore = asyncio.Semaphore(settings.price_fetch_concurrency)
+
+    async def fetch(symbol: str, start_ms: int, end_ms: int) -> Optional[CandleSeries]:
+        async with semaphore:
+            try:
+                return await source.fetch_candles(symbol, interval, start_ms, end_ms)
+            except Exception as e:
+                logger.warning(f"[Candles] Failed to fetch {interval} candles for {symbol}: {e}")
+                return None
+
+    symbols = list(requests)
+    results = await asyncio.gather(*(fetch(sym, *requests[sym]) for sym in symbols))
+    return {sym: series for sym, series in zip(symbols, results) if series is not None}
+
+
+_candle_source: Optional[CandleSource] = None
+
+
+def get_candle_source() -> CandleSource:
+    """Return the process-wide candle source (Binance by default)."""
+    global _candle_source
+    if _candle_source is None:
+        _candle_source = BinanceCandleSource()
+    return _candle_source
+
+
+def set_candle_source(source: CandleSource) -> None:
+    """Swap the process-wide candle source, e.g. for a local stand-in exchange."""
+    global _candle_source
+    _candle_source = source
@@ -0,0 +1,419 @@
+"""
+Technical indicators.
+Vectorized batch RSI / EMA / ATR / MACD over candle columns, plus streaming versions that keep O(1) state
+per symbol and timeframe and advance one closed candle at a time.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Optional
+
+import numpy as np
+from core.config import settings
+from services.candle_store import candle_store
+from services.candles import INTERVAL_MS
+
+logger = logging.getLogger(__name__)
+
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+EMA_FAST, EMA_SLOW = 21, 50
+
+# The closed-form block recursion below loses at most ~log10(_MAX_GROWTH) digits
+_MAX_GROWTH = 1e8
+
+
+# ── Batch (vectorized) ───────────────────────────────────────────────────────
+
+def _recurse(values: np.ndarray, alpha: float, seed: float) -> np.ndarray:
+    """``y[t] = y[t-1] + alpha * (values[t] - y[t-1])`` with ``y[-1] = seed``.
+
+    Solved in closed form over blocks short enough that ``(1 - alpha) ** -len``
+    stays below ``_MAX_GROWTH``, so there is no per-element Python loop.
+    """
+    decay = 1.0 - alpha
+    out = np.empty(len(values), dtype=np.float64)
+    if decay <= 0.0:
+        out[:] = values
+        return out
+    block = max(1, int(math.log(_MAX_GROWTH) / -math.log(decay)))
+    powers = decay ** np.arange(block, dtype=np.float64)
+    previous = seed
+    for start in range(0, len(values), block):
+        chunk = values[start : start + block]
+        p = powers[: len(chunk)]
+        # y[j] = decay^(j+1) * previous + alpha * decay^j * sum_{i<=j} x[i] / decay^i
+        out[start : start + len(chunk)] = p * (decay * previous + alpha * np.cumsum(chunk / p))
+        previous = out[start + len(chunk) - 1]
+    return out
+
+
+def _smoothed(values, period: int, alpha: float) -> np.ndarray:
+    """Exponential smoothing seeded with the simple mean of the first ``period`` values (NaN before)."""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+    seed = float(values[:period].mean())
+    out[period - 1] = seed
+    out[period:] = _recurse(values[period:], alpha, seed)
+    return out
+
+
+def ema(values, period: int) -> np.ndarray:
+    """EMA with ``alpha = 2 / (period + 1)``, seeded with an SMA; NaN until ``period`` values are in."""
+    return _smoothed(values, period, 2.0 / (period + 1))
+
+
+def _rsi_from_averages(avg_gain, avg_loss):
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        return np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+
+
+def rsi(close, period: int = RSI_PERIOD) -> np.ndarray:
+    """Wilder's RSI; NaN for the first ``period`` closes."""
+    close = np.asarray(close, dtype=np.float64)
+    out = np.full(len(close), np.nan)
+    diff = np.diff(close)
+    if len(diff) < period:
+        return out
+    avg_gain = _smoothed(np.maximum(diff, 0.0), period, 1.0 / period)
+    avg_loss = _smoothed(np.maximum(-diff, 0.0), period, 1.0 / period)
+    out[1:] = _rsi_from_averages(avg_gain, avg_loss)
+    return out
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """True range per candle; the first candle, with no previous close, is NaN."""
+    high, low, close = (np.asarray(col, dtype=np.float64) for col in (high, low, close))
+    out = np.full(len(close), np.nan)
+    previous = close[:-1]
+    out[1:] = np.maximum(high[1:] - low[1:], np.maximum(np.abs(high[1:] - previous), np.abs(low[1:] - previous)))
+    return out
+
+
+def atr(high, low, close, period: int = ATR_PERIOD) -> np.ndarray:
+    """Wilder's ATR; NaN for the first ``period`` candles."""
+    tr = true_range(high, low, close)
+    out = np.full(len(tr), np.nan)
+    out[1:] = _smoothed(tr[1:], period, 1.0 / period)
+    return out
+
+
+def macd(
+    close, fast: int = MACD_FAST, slow: int = MACD_SLOW, signal: int = MACD_SIGNAL
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """``(macd_line, signal_line, histogram)``; the signal EMA starts once the line is defined."""
+    close = np.asarray(close, dtype=np.float64)
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = np.full(len(close), np.nan)
+    if len(close) >= slow:
+        signal_line[slow - 1 :] = ema(line[slow - 1 :], signal)
+    return line, signal_line, line - signal_line
+
+
+# ── Streaming (O(1) per update) ──────────────────────────────────────────────
+
+class Smoother:
+    """Streaming counterpart of :func:`_smoothed`: SMA warm-up, then exponential smoothing."""
+
+    __slots__ = ("period", "alpha", "value", "_count", "_sum")
+
+    def __init__(self, period: int, alpha: float):
+        self.period = period
+        self.alpha = alpha
+        self.value: Optional[float] = None
+        self._count = 0
+        self._sum = 0.0
+
+    def update(self, x: float) -> Optional[float]:
+        if self.value is not None:
+            self.value += self.alpha * (x - self.value)
+        else:
+            self._count += 1
+            self._sum += x
+            if self._count == self.period:
+                self.value = self._sum / self.period
+        return self.value
+
+    def warm(self, values) -> "Smoother":
+        """Load the state reached after ``values``, computed in one vectorized pass."""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) < self.period:
+            for x in values:
+                self.update(float(x))
+        else:
+            self._count = self.period
+            self.value = float(_smoothed(values, self.period, self.alpha)[-1])
+        return self
+
+
+class EMA(Smoother):
+    def __init__(self, period: int):
+        super().__init__(period, 2.0 / (period + 1))
+
+
+class RSI:
+    __slots__ = ("_gain", "_loss", "_previous")
+
+    def __init__(self, period: int = RSI_PERIOD):
+        self._gain = Smoother(period, 1.0 / period)
+        self._loss = Smoother(period, 1.0 / period)
+        self._previous: Optional[float] = None
+
+    @property
+    def value(self) -> Optional[float]:
+        if self._gain.value is None:
+            return None
+        if self._loss.value == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self._gain.value / self._loss.value)
+
+    def update(self, close: float) -> Optional[float]:
+        if self._previous is not None:
+            diff = close - self._previous
+            self._gain.update(max(diff, 0.0))
+            self._loss.update(max(-diff, 0.0))
+        self._previous = close
+        return self.value
+
+    def warm(self, close) -> "RSI":
+        close = np.asarray(close, dtype=np.float64)
+        if len(close):
+            diff = np.diff(close)
+            self._gain.warm(np.maximum(diff, 0.0))
+            self._loss.warm(np.maximum(-diff, 0.0))
+            self._previous = float(close[-1])
+        return self
+
+
+class ATR:
+    __slots__ = ("_range", "_previous")
+
+    def __init__(self, period: int = ATR_PERIOD):
+        self._range = Smoother(period, 1.0 / period)
+        self._previous: Optional[float] = None
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._range.value
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        if self._previous is not None:
+            previous = self._previous
+            self._range.update(max(high - low, abs(high - previous), abs(low - previous)))
+        self._previous = close
+        return self.value
+
+    def warm(self, high, low, close) -> "ATR":
+        if len(close):
+            self._range.warm(true_range(high, low, close)[1:])
+            self._previous = float(close[-1])
+        return self
+
+
+class MACD:
+    __slots__ = ("_fast", "_slow", "_signal", "line")
+
+    def __init__(self, fast: int = MACD_FAST, slow: int = MACD_SLOW, signal: int = MACD_SIGNAL):
+        self._fast = EMA(fast)
+        self._slow = EMA(slow)
+        self._signal = EMA(signal)
+        self.line: Optional[float] = None
+
+    @property
+    def signal(self) -> Optional[float]:
+        return self._signal.value
+
+    @property
+    def histogram(self) -> Optional[float]:
+        if self.line is None or self._signal.value is None:
+            return None
+        return self.line - self._signal.value
+
+    def update(self, close: float) -> Optional[float]:
+        fast = self._fast.update(close)
+        slow = self._slow.update(close)
+        if slow is not None:
+            self.line = fast - slow
+            self._signal.update(self.line)
+        return self.line
+
+    def warm(self, close) -> "MACD":
+        close = np.asarray(close, dtype=np.float64)
+        self._fast.warm(close)
+        self._slow.warm(close)
+        if len(close) >= self._slow.period:
+            line = ema(close, self._fast.period) - ema(close, self._slow.period)
+            line = line[self._slow.period - 1 :]
+            self._signal.warm(line)
+            self.line = float(line[-1])
+        return self
+
+
+class IndicatorState:
+    """All streaming indicators of one symbol and timeframe, fed closed candles in order."""
+
+    __slots__ = ("rsi", "atr", "macd", "ema_fast", "ema_slow", "last_open_time", "last_close")
+
+    def __init__(self):
+        self.rsi = RSI()
+        self.atr = ATR()
+        self.macd = MACD()
+        self.ema_fast = EMA(EMA_FAST)
+        self.ema_slow = EMA(EMA_SLOW)
+        self.last_open_time: Optional[int] = None
+        self.last_close: Optional[float] = None
+
+    @classmethod
+    def from_series(cls, series) -> "IndicatorState":
+        state = cls()
+        if len(series):
+            state.rsi.warm(series.close)
+            state.atr.warm(series.high, series.low, series.close)
+            state.macd.warm(series.close)
+            state.ema_fast.warm(series.close)
+            state.ema_slow.warm(series.close)
+            state.last_open_time = int(series.open_time[-1])
+            state.last_close = float(series.close[-1])
+        return state
+
+    def update(self, open_time: int, high: float, low: float, close: float) -> bool:
+        """Apply one closed candle; candles at or before the last one applied are ignored."""
+        if self.last_open_time is not None and open_time <= self.last_open_time:
+            return False
+        self.rsi.update(close)
+        self.atr.update(high, low, close)
+        self.macd.update(close)
+        self.ema_fast.update(close)
+        self.ema_slow.update(close)
+        self.last_open_time = open_time
+        self.last_close = close
+        return True
+
+    def snapshot(self) -> dict:
+        return {
+            "open_time": self.last_open_time,
+            "close": self.last_close,
+            "rsi": self.rsi.value,
+            "atr": self.atr.value,
+            "ema_fast": self.ema_fast.value,
+            "ema_slow": self.ema_slow.value,
+            "macd": self.macd.line,
+            "macd_signal": self.macd.signal,
+            "macd_histogram": self.macd.histogram,
+        }
+
+
+def has_convergence(side: str, snapshot: dict) -> bool:
+    """Whether trend (EMA fast vs slow) and momentum (MACD histogram) both point the call's way."""
+    ema_fast, ema_slow, histogram = snapshot["ema_fast"], snapshot["ema_slow"], snapshot["macd_histogram"]
+    if ema_fast is None or ema_slow is None or histogram is None:
+        return False
+    if side == "LONG":
+        return ema_fast > ema_slow and histogram > 0
+    return ema_fast < ema_slow and histogram < 0
+
+
+class IndicatorEngine:
+    """Streaming indicator state per ``(symbol, interval)``, backed by the local candle store.
+
+    A series is warmed once from ``indicator_history_candles`` stored candles;
+    after that each lookup only applies the candles that closed since the
+    last one, so the cost per new candle is constant.
+    """
+
+    def __init__(self):
+        self._states: dict[tuple[str, str], IndicatorState] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def clear(self) -> None:
+        self._states = {}
+
+    async def get(self, symbol: str, interval: str) -> IndicatorState:
+        """The state of ``symbol`` on ``interval``, advanced to the last closed candle."""
+        key = (symbol, interval)
+        step = INTERVAL_MS[interval]
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            state = self._states.get(key)
+            now_ms = int(time.time() * 1000)
+            if state is None or state.last_open_time is None:
+                start_ms = now_ms - settings.indicator_history_candles * step
+                state = IndicatorState.from_series(await candle_store.get(symbol, interval, start_ms, now_ms))
+                self._states[key] = state
+                return state
+
+            start_ms = state.last_open_time + step
+            fresh = await candle_store.get(symbol, interval, start_ms, now_ms)
+            for open_time, high, low, close in zip(
+                fresh.open_time.tolist(), fresh.high.tolist(), fresh.low.tolist(), fresh.close.tolist()
+            ):
+                state.update(open_time, high, low, close)
+            return state
+
+    async def snapshots(self, symbols, interval: str) -> dict[str, dict]:
+        """Snapshots for several symbols; symbols whose candles cannot be loaded are left out."""
+        semaphore = asyncio.Semaphore(settings.price_fetch_concurrency)
+
+        async def load(symbol: str) -> Optional[dict]:
+            async with semaphore:
+                try:
+                    return (await self.get(symbol, interval)).snapshot()
+                except Exception as e:
+                    logger.warning(f"[Indicators] Failed to load {interval} indicators for {symbol}: {e}")
+                    return None
+
+        symbols = list(dict.fromkeys(symbols))
+        results = await asyncio.gather(*(load(symbol) for symbol in symbols))
+        return {symbol: snapshot for symbol, snapshot in zip(symbols, results) if snapshot is not None}
+
+
+indicator_engine = IndicatorEngine()
+
+# Loads that outlived their caller's timeout; the event loop only holds weak references to tasks
+_background: set[asyncio.Task] = set()
+
+
+def _finish_background(task: asyncio.Task) -> None:
+    _background.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"[Indicators] Background indicator load failed: {task.exception()}")
+
+
+async def enrich_trade_calls(rows: list[dict]) -> None:
+    """Fill ``rsi4h`` / ``has_convergence`` on new call rows where the client left them out (None).
+
+    Symbols the engine has not seen need their candle history fetched first.
+    Past ``TRADE_CALL_INDICATOR_TIMEOUT_SECONDS`` the rows are left without
+    indicators so recording is not held up; the load carries on in the
+    background and warms the engine for the next call.
+    """
+    pending = [row for row in rows if row.get("rsi4h") is None or row.get("has_convergence") is None]
+    if pending and settings.trade_call_indicator_enrichment_enabled:
+        load = asyncio.ensure_future(
+            indicator_engine.snapshots((row["symbol"] for row in pending), settings.trade_call_indicator_interval)
+        )
+        try:
+            snapshots = await asyncio.wait_for(asyncio.shield(load), settings.trade_call_indicator_timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning(f"[Indicators] Recording {len(pending)} calls without indicators: load timed out")
+            _background.add(load)
+            load.add_done_callback(_finish_background)
+            snapshots = {}
+        for row in pending:
+            snapshot = snapshots.get(row["symbol"])
+            if snapshot is None:
+                continue
+            if row.get("rsi4h") is None and snapshot["rsi"] is not None:
+                row["rsi4h"] = round(snapshot["rsi"], 1)
+            if row.get("has_convergence") is None:
+                row["has_convergence"] = has_convergence(row["side"], snapshot)
+    for row in rows:
+        if row.get("has_convergence") is None:
+            row["has_convergence"] = False
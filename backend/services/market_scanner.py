@@ -0,0 +1,196 @@
+"""
+Market scanner.
+Evaluates the symbol universe against the signal criteria in one scheduled pass and records qualifying setups
+through the regular trade call write path.
+"""
+
+import logging
+import math
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from core.config import settings
+from core.database import db_manager
+from services.candle_store import candle_store
+from services.candles import INTERVAL_MS, CandleSeries
+from services.indicators import indicator_engine
+from services.price_stream import price_book
+from services.scheduler import PeriodicJob
+from services.trade_call_recorder import record_trade_calls
+
+logger = logging.getLogger(__name__)
+
+# ATR-based stop and targets (same ratios as the signal page)
+SL_ATR_MULTIPLE = 2.5
+SL_MIN_PCT, SL_MAX_PCT = 4.0, 8.0
+TP_RISK_MULTIPLES = (0.8, 1.5, 2.5)
+VOLUME_LOOKBACK = 20
+
+
+@contextmanager
+def _stage(timings: dict, name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round(time.perf_counter() - start, 4)
+
+
+def _round_price(value: float, reference: float) -> float:
+    if reference >= 1:
+        return round(value, 2)
+    if reference >= 0.01:
+        return round(value, 4)
+    return round(value, 6)
+
+
+def scan_universe() -> list[str]:
+    """``scanner_symbols`` if set, else every ``scanner_quote_asset`` pair with a fresh streamed price."""
+    if settings.scanner_symbols.strip():
+        symbols = [s.strip().upper() for s in settings.scanner_symbols.split(",") if s.strip()]
+    else:
+        quote = settings.scanner_quote_asset.upper()
+        symbols = sorted(s for s in price_book.fresh_prices(price_book.symbols()) if s.endswith(quote))
+    return list(dict.fromkeys(symbols))[: settings.scanner_max_symbols]
+
+
+def evaluate_setup(symbol: str, price: float, snapshot: dict, recent: CandleSeries, interval: str) -> Optional[dict]:
+    """A new-call payload if ``symbol`` qualifies, else None.
+
+    Requires price, EMA fast/slow and the MACD histogram to line up on one
+    side, a 24h move of at least ``scanner_min_change_pct`` that way, and an
+    RSI that is not already stretched (LONG ≤ 70, SHORT ≥ 30). The stop sits
+    2.5 ATR away (clamped to 4–8%) with targets at 0.8/1.5/2.5 times the risk.
+    """
+    rsi, atr = snapshot["rsi"], snapshot["atr"]
+    ema_fast, ema_slow, histogram = snapshot["ema_fast"], snapshot["ema_slow"], snapshot["macd_histogram"]
+    if None in (rsi, atr, ema_fast, ema_slow, histogram):
+        return None
+
+    if price > ema_fast > ema_slow and histogram > 0:
+        side, direction = "LONG", 1
+    elif price < ema_fast < ema_slow and histogram < 0:
+        side, direction = "SHORT", -1
+    else:
+        return None
+    if (side == "LONG" and rsi > 70) or (side == "SHORT" and rsi < 30):
+        return None
+
+    day = math.ceil(86_400_000 / INTERVAL_MS[interval])
+    if len(recent) <= day:
+        return None
+    change_pct = (price / float(recent.close[-day - 1]) - 1) * 100
+    if change_pct * direction < settings.scanner_min_change_pct:
+        return None
+
+    confidence = 60  # 45 base + 10 EMA alignment + 5 MACD momentum, as on the signal page
+    reason = f"Scanner {interval}: price, EMA {interval} and MACD aligned {side} | RSI {rsi:.1f} | 24h {change_pct:+.1f}%"
+    if (side == "LONG" and 40 <= rsi <= 55) or (side == "SHORT" and 45 <= rsi <= 60):
+        confidence += 8
+    if abs(change_pct) > 8:
+        confidence += 8
+    volumes = recent.volume[-VOLUME_LOOKBACK - 1 :]
+    average_volume = float(volumes[:-1].mean()) if len(volumes) > 1 else 0.0
+    volume_ratio = float(volumes[-1]) / average_volume if average_volume > 0 else 1.0
+    if volume_ratio > 1.5:
+        confidence += 8
+        reason += f" | Volume spike ({volume_ratio:.1f}x)"
+    elif volume_ratio < 0.7:
+        confidence -= 5
+    confidence = min(98, max(25, confidence))
+    if confidence < settings.scanner_min_confidence:
+        return None
+
+    risk = min(max(atr * SL_ATR_MULTIPLE, price * SL_MIN_PCT / 100), price * SL_MAX_PCT / 100)
+    tp1, tp2, tp3 = (price + direction * risk * multiple for multiple in TP_RISK_MULTIPLES)
+    return {
+        "symbol": symbol,
+        "side": side,
+        "entry_price": _round_price(price, price),
+        "stop_loss": _round_price(price - direction * risk, price),
+        "tp0": None,
+        "tp1": _round_price(tp1, price),
+        "tp2": _round_price(tp2, price),
+        "tp3": _round_price(tp3, price),
+        "confidence": confidence,
+        "reason": reason,
+        "rsi4h": None,  # filled in by indicator enrichment
+        "has_convergence": None,
+        "rr": round(TP_RISK_MULTIPLES[1], 1),
+    }
+
+
+async def run_market_scan() -> dict:
+    """One scan cycle over the whole universe, with the time spent in each stage."""
+    timings: dict[str, float] = {}
+    interval = settings.scanner_candle_interval
+    step = INTERVAL_MS[interval]
+    now_ms = int(time.time() * 1000)
+
+    with _stage(timings, "universe"):
+        symbols = scan_universe()
+
+    # One shared, gap-filling candle fetch for every symbol (bounded by price_fetch_concurrency)
+    with _stage(timings, "candles"):
+        window = (now_ms - settings.indicator_history_candles * step, now_ms)
+        loaded, _ = await candle_store.get_many({symbol: window for symbol in symbols}, interval)
+
+    with _stage(timings, "indicators"):
+        snapshots = await indicator_engine.snapshots(loaded, interval)
+
+    with _stage(timings, "evaluate"):
+        recent_start = now_ms - (math.ceil(86_400_000 / step) + VOLUME_LOOKBACK + 2) * step
+        prices = price_book.fresh_prices(snapshots)
+        setups = []
+        for symbol, snapshot in snapshots.items():
+            price = prices.get(symbol, snapshot["close"])
+            if not price:
+                continue
+            recent = candle_store.read(symbol, interval, recent_start, now_ms)
+            setup = evaluate_setup(symbol, float(price), snapshot, recent, interval)
+            if setup is not None:
+                setups.append(setup)
+
+    with _stage(timings, "record"):
+        results = []
+        if setups:
+            await db_manager.ensure_initialized()
+            async with db_manager.async_session_maker() as session:
+                results = await record_trade_calls(session, setups)
+
+    created = sum(result["created"] for result in results)
+    result = {
+        "symbols": len(symbols),
+        "with_candles": len(loaded),
+        "evaluated": len(snapshots),
+        "setups": len(setups),
+        "created": created,
+        "duplicates": len(results) - created,
+        "timings": timings,
+    }
+    logger.info(f"[Scanner] {result}")
+    return result
+
+
+scanner_job = PeriodicJob(
+    "market-scanner",
+    run_market_scan,
+    interval_seconds=settings.scanner_interval_seconds,
+)
+
+
+async def start_market_scanner():
+    """Start the scheduled market scan (called from the app lifespan)."""
+    if not settings.scanner_enabled:
+        logger.info("Market scanner disabled")
+        return
+    if not db_manager.engine:
+        logger.warning("Database engine is not ready; skipping market scanner")
+        return
+    scanner_job.start()
+
+
+async def stop_market_scanner():
+    """Stop the scheduled market scan."""
+    await scanner_job.stop()
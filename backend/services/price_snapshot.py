@@ -0,0 +1,179 @@
+"""
+Price snapshot service.
+Fetches last-trade prices for many symbols at once and shares the result with every caller in the process.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional
+
+import httpx
+from core.config import settings
+from services.price_stream import price_book
+
+logger = logging.getLogger(__name__)
+
+
+class PriceSource(ABC):
+    """Pluggable source of last-trade prices.
+
+    Implementations return a ``{symbol: price}`` mapping. Symbols the source
+    cannot price are simply left out of the result.
+    """
+
+    @abstractmethod
+    async def fetch_prices(self, symbols: list[str]) -> dict[str, float]:
+        """Fetch the latest price for each of ``symbols``."""
+
+
+class BinancePriceSource(PriceSource):
+    """Binance-compatible REST ticker source.
+
+    Tries a single bulk ``/api/v3/ticker/price`` request first. If that fails,
+    falls back to ``?symbols=[...]`` batches fetched concurrently, and finally
+    to per-symbol requests for any batch the exchange rejects (one unknown
+    symbol makes Binance reject the whole batch).
+
+    ``base_url`` can point at any server speaking the same API, e.g. a local
+    stand-in exchange in tests.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        self.base_url = (base_url or settings.price_source_base_url).rstrip("/")
+        self.timeout = timeout or settings.price_fetch_timeout_seconds
+        self.batch_size = batch_size or settings.price_fetch_batch_size
+        self.max_concurrency = max_concurrency or settings.price_fetch_concurrency
+
+    @property
+    def ticker_url(self) -> str:
+        return f"{self.base_url}/api/v3/ticker/price"
+
+    async def fetch_prices(self, symbols: list[str]) -> dict[str, float]:
+        if not symbols:
+            return {}
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            try:
+                return await self._fetch_bulk(client, symbols)
+            except Exception as e:
+                logger.warning(f"[PriceSnapshot] Bulk ticker request failed, falling back to batches: {e}")
+
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            batches = [symbols[i : i + self.batch_size] for i in range(0, len(symbols), self.batch_size)]
+            results = await asyncio.gather(*(self._fetch_batch(client, semaphore, batch) for batch in batches))
+
+        prices: dict[str, float] = {}
+        for batch_prices in results:
+            prices.update(batch_prices)
+        return prices
+
+    async def _fetch_bulk(self, client: httpx.AsyncClient, symbols: list[str]) -> dict[str, float]:
+        """Fetch every ticker in one request and keep the requested symbols."""
+        resp = await client.get(self.ticker_url)
+        resp.raise_for_status()
+        wanted = set(symbols)
+        return {item["symbol"]: float(item["price"]) for item in resp.json() if item.get("symbol") in wanted}
+
+    async def _fetch_batch(
+        self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, batch: list[str]
+    ) -> dict[str, float]:
+        """Fetch one ``symbols=[...]`` batch, degrading to per-symbol requests on rejection."""
+        async with semaphore:
+            try:
+                resp = await client.get(self.ticker_url, params={"symbols": json.dumps(batch, separators=(",", ":"))})
+                resp.raise_for_status()
+                return {item["symbol"]: float(item["price"]) for item in resp.json()}
+            except Exception as e:
+                logger.warning(f"[PriceSnapshot] Batch of {len(batch)} symbols failed, retrying one by one: {e}")
+
+        single = await asyncio.gather(*(self._fetch_one(client, semaphore, sym) for sym in batch))
+        return {sym: price for sym, price in zip(batch, single) if price is not None}
+
+    async def _fetch_one(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, symbol: str) -> Optional[float]:
+        async with semaphore:
+            try:
+                resp = await client.get(self.ticker_url, params={"symbol": symbol})
+                if resp.status_code == 200:
+                    return float(resp.json()["price"])
+            except Exception as e:
+                logger.warning(f"[PriceSnapshot] Failed to fetch price for {symbol}: {e}")
+        return None
+
+
+class PriceSnapshotService:
+    """Process-wide price snapshot shared by every caller.
+
+    Fresh prices from the streaming last-price book are used as-is; only the
+    symbols it cannot price (stream down, stale, or not streamed) go to the
+    REST source. Concurrent callers wait on the same in-flight fetch instead of
+    each hitting the exchange, and a snapshot younger than ``ttl_seconds`` is
+    reused.
+    """
+
+    def __init__(self, source: Optional[PriceSource] = None, ttl_seconds: Optional[float] = None):
+        self._source = source
+        self.ttl_seconds = settings.price_snapshot_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._prices: dict[str, float] = {}
+        self._covered: set[str] = set()  # symbols requested since the snapshot was taken, priced or not
+        self._fetched_at: float = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def source(self) -> PriceSource:
+        if self._source is None:
+            self._source = BinancePriceSource()
+        return self._source
+
+    def set_source(self, source: PriceSource) -> None:
+        """Swap the price source (e.g. for a local stand-in exchange) and drop the cached snapshot."""
+        self._source = source
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._prices = {}
+        self._covered = set()
+        self._fetched_at = 0.0
+
+    def _is_recent(self) -> bool:
+        return time.monotonic() - self._fetched_at < self.ttl_seconds
+
+    def _fresh_for(self, symbols: set[str]) -> bool:
+        return self._is_recent() and symbols.issubset(self._covered)
+
+    async def get_prices(self, symbols: Iterable[str]) -> dict[str, float]:
+        """Return the latest known price for each of ``symbols``."""
+        wanted = set(symbols)
+        streamed = price_book.fresh_prices(wanted)
+        wanted -= streamed.keys()
+        if not wanted:
+            return streamed
+
+        if not self._fresh_for(wanted):
+            async with self._lock:
+                # Another caller may have refreshed the snapshot while we waited
+                if not self._fresh_for(wanted):
+                    start_time = time.time()
+                    prices = await self.source.fetch_prices(sorted(wanted))
+                    if not self._is_recent():
+                        self.invalidate()
+                    self._prices.update(prices)
+                    self._covered |= wanted
+                    self._fetched_at = time.monotonic()
+                    logger.debug(
+                        f"[PriceSnapshot] Fetched {len(prices)}/{len(wanted)} prices in {time.time() - start_time:.4f}s"
+                    )
+
+        snapshot = {sym: self._prices[sym] for sym in wanted if sym in self._prices}
+        return {**snapshot, **streamed}
+
+
+price_snapshot_service = PriceSnapshotService()
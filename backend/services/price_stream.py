@@ -0,0 +1,204 @@
+"""
+Exchange price stream.
+Consumes a streaming ticker feed over a websocket and keeps an in-memory last-price book per symbol.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Callable, Iterable, Optional
+
+from core.config import settings
+from websockets.asyncio.client import connect
+
+logger = logging.getLogger(__name__)
+
+# listener(symbol, previous_price, price); previous_price is None for a symbol's first tick
+PriceListener = Callable[[str, Optional[float], float], None]
+
+
+class PriceBook:
+    """Last traded price per symbol, with the time each was received.
+
+    A symbol is stale once its price is older than ``stale_seconds``, e.g.
+    while the stream is reconnecting; stale prices are never handed out.
+    """
+
+    def __init__(self, stale_seconds: Optional[float] = None):
+        self.stale_seconds = settings.price_stream_stale_seconds if stale_seconds is None else stale_seconds
+        self._prices: dict[str, tuple[float, float]] = {}  # symbol → (price, received_at)
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def update(self, symbol: str, price: float, received_at: Optional[float] = None) -> Optional[float]:
+        """Record a tick; returns the previous price (stale or not), or None."""
+        previous = self._prices.get(symbol)
+        self._prices[symbol] = (price, time.time() if received_at is None else received_at)
+        return previous[0] if previous else None
+
+    def is_fresh(self, symbol: str, now: Optional[float] = None) -> bool:
+        entry = self._prices.get(symbol)
+        return entry is not None and (now or time.time()) - entry[1] <= self.stale_seconds
+
+    def fresh_prices(self, symbols: Iterable[str]) -> dict[str, float]:
+        """Prices for whichever of ``symbols`` have a fresh entry."""
+        now = time.time()
+        fresh = {}
+        for symbol in symbols:
+            entry = self._prices.get(symbol)
+            if entry is not None and now - entry[1] <= self.stale_seconds:
+                fresh[symbol] = entry[0]
+        return fresh
+
+    def symbols(self) -> list[str]:
+        return list(self._prices)
+
+    def stale_symbols(self) -> list[str]:
+        now = time.time()
+        return [symbol for symbol, (_, received_at) in self._prices.items() if now - received_at > self.stale_seconds]
+
+    def clear(self) -> None:
+        self._prices = {}
+
+
+def parse_ticks(message) -> list[tuple[str, float]]:
+    """``(symbol, price)`` pairs from a Binance-style ticker message.
+
+    Accepts an all-market array (``!miniTicker@arr``), a single ticker or
+    trade event, or either wrapped in a combined-stream ``{"stream", "data"}``
+    envelope. Ticker events carry the price as ``c``; trade events as ``p``.
+    """
+    payload = json.loads(message)
+    if isinstance(payload, dict) and "data" in payload:
+        payload = payload["data"]
+    items = payload if isinstance(payload, list) else [payload]
+    ticks = []
+    for item in items:
+        price = item.get("c", item.get("p"))
+        if item.get("s") and price is not None:
+            ticks.append((item["s"], float(price)))
+    return ticks
+
+
+class PriceStreamConsumer:
+    """Long-running websocket consumer feeding a :class:`PriceBook`.
+
+    Reconnects with exponential backoff (plus jitter) up to
+    ``reconnect_max_seconds``; the backoff resets once a connection delivers
+    a message. Listeners are called for every tick, in the event loop, and
+    must not block.
+    """
+
+    def __init__(self, book: PriceBook, url: Optional[str] = None, reconnect_max_seconds: Optional[float] = None):
+        self.book = book
+        self.url = url or settings.price_stream_url
+        self.reconnect_max_seconds = reconnect_max_seconds or settings.price_stream_reconnect_max_seconds
+        self.connected = False
+        self.reconnects = 0
+        self.last_message_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._listeners: list[PriceListener] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def add_listener(self, listener: PriceListener) -> None:
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: PriceListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(), name="price-stream")
+        logger.info(f"[PriceStream] Started ({self.url})")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.connected = False
+        logger.info("[PriceStream] Stopped")
+
+    def status(self) -> dict:
+        return {
+            "running": self.running,
+            "connected": self.connected,
+            "symbols": len(self.book),
+            "stale_symbols": len(self.book.stale_symbols()),
+            "reconnects": self.reconnects,
+            "last_message_at": self.last_message_at,
+            "last_error": self.last_error,
+        }
+
+    def handle_message(self, message) -> int:
+        """Apply one stream message to the book; returns the number of ticks."""
+        ticks = parse_ticks(message)
+        received_at = time.time()
+        self.last_message_at = received_at
+        for symbol, price in ticks:
+            previous = self.book.update(symbol, price, received_at)
+            for listener in self._listeners:
+                try:
+                    listener(symbol, previous, price)
+                except Exception as e:
+                    logger.error(f"[PriceStream] Listener failed for {symbol}: {e}")
+        return len(ticks)
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                async with connect(self.url) as ws:
+                    self.connected = True
+                    self.last_error = None
+                    logger.info("[PriceStream] Connected")
+                    async for message in ws:
+                        try:
+                            self.handle_message(message)
+                        except (ValueError, TypeError, AttributeError) as e:
+                            logger.warning(f"[PriceStream] Skipping malformed message: {e}")
+                        backoff = 1.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning(f"[PriceStream] Connection lost: {e}")
+            finally:
+                self.connected = False
+
+            delay = min(backoff, self.reconnect_max_seconds) * random.uniform(0.8, 1.2)
+            logger.info(f"[PriceStream] Reconnecting in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            backoff = min(backoff * 2, self.reconnect_max_seconds)
+            self.reconnects += 1
+
+
+price_book = PriceBook()
+price_stream = PriceStreamConsumer(price_book)
+
+
+async def start_price_stream():
+    """Start the ticker stream consumer (called from the app lifespan)."""
+    if not settings.price_stream_enabled:
+        logger.info("Price stream disabled")
+        return
+    price_stream.start()
+
+
+async def stop_price_stream():
+    """Stop the ticker stream consumer."""
+    await price_stream.stop()
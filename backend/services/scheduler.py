@@ -0,0 +1,104 @@
+"""
+In-process periodic jobs.
+Runs an async job on a fixed interval with single-flight semantics: concurrent triggers share one run.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """Run ``func`` every ``interval_seconds`` in a background asyncio task.
+
+    At most one run is in flight at a time. ``run_once()`` joins the in-flight
+    run if there is one, and ``trigger()`` asks the loop to run again as soon as
+    the current run (if any) finishes, so any number of concurrent triggers
+    collapse into a single extra run.
+    """
+
+    def __init__(self, name: str, func: Callable[[], Awaitable[dict]], interval_seconds: float):
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self.last_result: Optional[dict] = None
+        self.last_error: Optional[str] = None
+        self.last_run_at: Optional[datetime] = None
+        self.last_duration: Optional[float] = None
+        self._inflight: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background loop is active."""
+        return self._loop_task is not None and not self._loop_task.done()
+
+    @property
+    def busy(self) -> bool:
+        """Whether a run is currently in flight."""
+        return self._inflight is not None and not self._inflight.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._loop_task = asyncio.create_task(self._loop(), name=f"job:{self.name}")
+        logger.info(f"[Scheduler] Started job '{self.name}' (every {self.interval_seconds}s)")
+
+    async def stop(self) -> None:
+        tasks = [t for t in (self._loop_task, self._inflight) if t is not None and not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._inflight = None
+        if tasks:
+            logger.info(f"[Scheduler] Stopped job '{self.name}'")
+
+    def trigger(self) -> None:
+        """Queue a run; a no-op if one is already queued."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def run_once(self) -> Optional[dict]:
+        """Run the job now, or join the run already in flight."""
+        if not self.busy:
+            self._inflight = asyncio.create_task(self._execute())
+        # Shield so a cancelled caller (e.g. client disconnect) does not cancel the shared run
+        return await asyncio.shield(self._inflight)
+
+    def status(self) -> dict:
+        return {
+            "running": self.running,
+            "busy": self.busy,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_duration": self.last_duration,
+            "last_error": self.last_error,
+        }
+
+    async def _execute(self) -> Optional[dict]:
+        start_time = time.time()
+        try:
+            self.last_result = await self.func()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            logger.error(f"[Scheduler] Job '{self.name}' failed: {e}", exc_info=True)
+        finally:
+            self.last_run_at = datetime.utcnow()
+            self.last_duration = round(time.time() - start_time, 4)
+        return self.last_result
+
+    async def _loop(self) -> None:
+        while True:
+            self._wakeup.clear()
+            await self.run_once()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,99 @@
+"""
+Trade call archival.
+Moves resolved and expired calls past the retention window from the hot trade_calls table into trade_calls_archive,
+in id-ordered batches, so active-call queries and indexes only cover recent rows. Reads that need the full history
+go through TradeCallHistory (both tables).
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+
+from core.config import settings
+from core.database import db_manager
+from models.trade_call import TradeCall
+from models.trade_call_archive import TradeCallArchive
+from services.scheduler import PeriodicJob
+from services.trade_call_stats import FINISHED_STATUSES
+from sqlalchemy import and_, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+
+async def archive_finished_calls(db: AsyncSession, retention_days: int, batch_size: int) -> dict:
+    """Move finished calls created more than ``retention_days`` ago into trade_calls_archive.
+
+    Each batch of up to ``batch_size`` calls is copied with one INSERT ...
+    SELECT and removed with one DELETE in the same transaction, so a call is
+    always in exactly one of the two tables and locks stay short. Archived
+    calls keep their id and still count in trade_call_stats, so the stats and
+    leaderboard do not change. Commits once per batch. A ``retention_days``
+    of 0 or less means archival is disabled and moves nothing.
+    """
+    if retention_days <= 0:
+        return {"archived": 0, "batches": 0, "disabled": True}
+    start_time = time.time()
+    hot = TradeCall.__table__
+    archive = TradeCallArchive.__table__
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+    # The newest call always stays hot: without AUTOINCREMENT, SQLite would otherwise hand its id out again
+    newest_id = (await db.execute(select(func.max(hot.c.id)))).scalar()
+    if newest_id is None:
+        return {"archived": 0, "batches": 0}
+    eligible = and_(hot.c.status.in_(FINISHED_STATUSES), hot.c.created_at < cutoff, hot.c.id < newest_id)
+    columns = [column.name for column in hot.columns]
+
+    archived = batches = 0
+    while True:
+        # Highest id of the next batch; None when the rest fits in one
+        bound = (
+            await db.execute(select(hot.c.id).where(eligible).order_by(hot.c.id).offset(batch_size - 1).limit(1))
+        ).scalar()
+        batch = eligible if bound is None else and_(eligible, hot.c.id <= bound)
+        await db.execute(insert(archive).from_select(columns, select(*hot.columns).where(batch)))
+        moved = (await db.execute(delete(hot).where(batch))).rowcount
+        await db.commit()
+        if moved:
+            archived += moved
+            batches += 1
+        if bound is None:
+            break
+
+    elapsed = time.time() - start_time
+    if archived:
+        logger.info(f"[TradeCall] Archived {archived} calls older than {retention_days}d in {elapsed:.2f}s")
+    return {"archived": archived, "batches": batches, "elapsed_seconds": round(elapsed, 3)}
+
+
+async def run_archive() -> dict:
+    """Run one archive pass in its own session (used by the background job)."""
+    await db_manager.ensure_initialized()
+    async with db_manager.async_session_maker() as session:
+        return await archive_finished_calls(
+            session, settings.trade_call_archive_retention_days, settings.trade_call_archive_batch_size
+        )
+
+
+archive_job = PeriodicJob(
+    "trade-call-archive",
+    run_archive,
+    interval_seconds=settings.trade_call_archive_interval_seconds,
+)
+
+
+async def start_trade_call_archive():
+    """Start the scheduled archival (called from the app lifespan)."""
+    if not settings.trade_call_scheduler_enabled or settings.trade_call_archive_retention_days <= 0:
+        logger.info("Trade call archival disabled")
+        return
+    if not db_manager.engine:
+        logger.warning("Database engine is not ready; skipping trade call archival")
+        return
+    archive_job.start()
+
+
+async def stop_trade_call_archive():
+    """Stop the scheduled archival."""
+    await archive_job.stop()
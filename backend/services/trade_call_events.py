@@ -0,0 +1,132 @@
+"""
+Trade call lifecycle events.
+In-process fan-out of created / tp-hit / sl-hit / expired events to SSE subscribers.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+from datetime import datetime
+from typing import Optional
+
+from core.config import settings
+from models.trade_call import TradeCall
+
+logger = logging.getLogger(__name__)
+
+TP_LEVELS = ("tp0", "tp1", "tp2", "tp3")
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+class Subscription:
+    """One subscriber's bounded queue of pending events.
+
+    When the queue is full, new events are dropped for this subscriber only,
+    and a ``dropped`` event with the count is delivered once it catches up, so
+    the client knows to refetch.
+    """
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        if self.dropped and self.queue.empty():
+            count, self.dropped = self.dropped, 0
+            return {"event": "dropped", "data": json.dumps({"count": count})}
+        return await self.queue.get()
+
+
+class TradeCallEventBroadcaster:
+    """Fans events out to every subscriber without ever blocking the publisher."""
+
+    def __init__(self, queue_size: Optional[int] = None):
+        self.queue_size = queue_size or settings.trade_call_events_queue_size
+        self._subscribers: set[Subscription] = set()
+        self._ids = itertools.count(1)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(self.queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, event_type: str, data: dict) -> None:
+        if not self._subscribers:
+            return
+        event = {"id": str(next(self._ids)), "event": event_type, "data": json.dumps(data, separators=(",", ":"))}
+        for subscription in self._subscribers:
+            subscription.offer(event)
+
+    # ── Lifecycle helpers ────────────────────────────────────────────────────
+
+    def publish_created(self, call_id: int, values) -> None:
+        """``values`` is a TradeCall or a mapping of its column values."""
+        get = values.get if isinstance(values, dict) else lambda name: getattr(values, name)
+        self.publish(
+            "created",
+            {
+                "id": call_id,
+                "symbol": get("symbol"),
+                "side": get("side"),
+                "entry_price": get("entry_price"),
+                "stop_loss": get("stop_loss"),
+                "tp0": get("tp0"),
+                "tp1": get("tp1"),
+                "tp2": get("tp2"),
+                "tp3": get("tp3"),
+                "confidence": get("confidence"),
+                "created_at": _iso(get("created_at")),
+                "expires_at": _iso(get("expires_at")),
+            },
+        )
+
+    def publish_changes(self, call: TradeCall, before: dict) -> None:
+        """Publish tp-hit / sl-hit / expired events for what changed on ``call`` since ``before``."""
+        base = {"id": call.id, "symbol": call.symbol, "side": call.side}
+        for level in TP_LEVELS:
+            if getattr(call, f"{level}_hit") and not before.get(f"{level}_hit"):
+                self.publish(
+                    "tp-hit",
+                    {
+                        **base,
+                        "level": level,
+                        "at": _iso(getattr(call, f"{level}_hit_at")),
+                        "best_tp_reached": call.best_tp_reached,
+                        "status": call.status,
+                        "exit_price": call.exit_price,
+                        "profit_pct": call.profit_pct,
+                    },
+                )
+        if call.sl_hit and not before.get("sl_hit"):
+            self.publish(
+                "sl-hit",
+                {**base, "at": _iso(call.sl_hit_at), "exit_price": call.exit_price, "profit_pct": call.profit_pct},
+            )
+        if call.status == "expired" and before.get("status") != "expired":
+            self.publish_expired(call.id, call.symbol, call.side, call.resolved_at)
+
+    def publish_expired(self, call_id: int, symbol: str, side: str, at: Optional[datetime]) -> None:
+        self.publish("expired", {"id": call_id, "symbol": symbol, "side": side, "at": _iso(at)})
+
+
+trade_call_events = TradeCallEventBroadcaster()
@@ -0,0 +1,75 @@
+"""
+Trade call export.
+Streams every trade call (archived ones first, then the hot table) as NDJSON or CSV from server-side cursors, in
+constant memory.
+"""
+
+import csv
+import io
+import json
+import logging
+import time
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from core.database import db_manager
+from models.trade_call import TradeCall
+from models.trade_call_archive import TradeCallArchive
+from sqlalchemy import select
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FIELDS = [column.name for column in TradeCall.__table__.columns]
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Unserializable value: {value!r}")
+
+
+def _ndjson_chunk(rows) -> str:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, row)), default=_json_default, separators=(",", ":")) + "\n" for row in rows
+    )
+
+
+def _csv_chunk(rows, header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows([value.isoformat() if isinstance(value, datetime) else value for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+async def stream_trade_calls(fmt: str, status: Optional[str] = None) -> AsyncIterator[str]:
+    """Yield the export body chunk by chunk, ``EXPORT_BATCH_SIZE`` rows at a time.
+
+    Opens its own session: the stream outlives the request's ``get_db`` session.
+    """
+    start_time = time.time()
+    logger.debug(f"[DB_OP] Starting trade call export - format: {fmt}, status: {status}")
+    await db_manager.ensure_initialized()
+
+    exported = 0
+    if fmt == "csv":
+        yield _csv_chunk([], header=True)
+    async with db_manager.async_session_maker() as session:
+        # One id-ordered scan per table rather than a sorted UNION over both
+        for table in (TradeCallArchive.__table__, TradeCall.__table__):
+            stmt = select(*(table.c[name] for name in EXPORT_FIELDS)).order_by(table.c.id)
+            if status:
+                stmt = stmt.where(table.c.status == status)
+            result = await session.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for rows in result.partitions(EXPORT_BATCH_SIZE):
+                exported += len(rows)
+                yield _csv_chunk(rows) if fmt == "csv" else _ndjson_chunk(rows)
+
+    logger.debug(f"[DB_OP] Trade call export completed in {time.time() - start_time:.4f}s - rows: {exported}")
@@ -0,0 +1,246 @@
+"""
+Trade call leaderboard.
+Ranks symbols by call outcomes over 7d / 30d / all-time windows from the trade_call_leaderboard table, so a request is
+one indexed ORDER BY ... LIMIT. Rows are kept in step with the trade_call_stats rollups: every stats delta recomputes
+the rows of the symbols it touched, in the same transaction, and a periodic job rolls the 7d / 30d windows over at
+UTC midnight.
+"""
+
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+
+from core.config import settings
+from core.database import db_manager
+from models.trade_call_leaderboard import LEADERBOARD_SORT_COLUMNS, TradeCallLeaderboard
+from models.trade_call_stats import TradeCallStat
+from services.scheduler import PeriodicJob
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Window name -> days of call creation it covers, today (UTC) included; None = all time
+PERIODS = {"7d": 7, "30d": 30, "all": None}
+
+ROLLUP_COUNTERS = ("total", "finished", "wins", "tp1_hits", "tp3_hits", "sl_hits", "profit_sum", "profit_count")
+
+# Symbols recomputed per query batch (the 30d window looks up 30 day keys per symbol)
+SYMBOL_BATCH = 100
+
+
+def _rate(part: int, whole: int) -> float:
+    return round(part / whole * 100, 1) if whole > 0 else 0
+
+
+def leaderboard_row(period: str, symbol: str, counters: dict, now: datetime) -> dict:
+    """A trade_call_leaderboard row from one symbol's summed trade_call_stats counters."""
+    finished = counters["finished"]
+    return {
+        "period": period,
+        "symbol": symbol,
+        "calls": counters["total"],
+        "finished": finished,
+        "wins": counters["wins"],
+        "win_rate": _rate(counters["wins"], finished),
+        "avg_profit_pct": (
+            round(counters["profit_sum"] / counters["profit_count"], 2) if counters["profit_count"] else 0
+        ),
+        "total_profit_pct": round(counters["profit_sum"], 2),
+        "tp1_rate": _rate(counters["tp1_hits"], finished),
+        "tp3_rate": _rate(counters["tp3_hits"], finished),
+        "sl_rate": _rate(counters["sl_hits"], finished),
+        "updated_at": now,
+    }
+
+
+async def _period_counters(
+    db: AsyncSession, days: Optional[int], today: date, symbols: Optional[list[str]] = None
+) -> dict[str, dict]:
+    """Per-symbol counters over the window: the ("symbol", ...) rows, or a key range of ("symbol_day", ...) rows.
+
+    With ``symbols``, only those symbols' rows are read, by primary key.
+    """
+    columns = [getattr(TradeCallStat, name) for name in ROLLUP_COUNTERS]
+    if days is None:
+        stmt = select(TradeCallStat.key.label("symbol"), *columns).where(TradeCallStat.dimension == "symbol")
+        if symbols is not None:
+            stmt = stmt.where(TradeCallStat.key.in_(symbols))
+    else:
+        # Keys are "YYYYMMDD|SYMBOL", so the window is a key range and the symbol starts at character 10
+        symbol = func.substr(TradeCallStat.key, 10)
+        if symbols is None:
+            window = TradeCallStat.key >= (today - timedelta(days=days - 1)).strftime("%Y%m%d")
+        else:
+            window = TradeCallStat.key.in_(
+                [f"{today - timedelta(days=back):%Y%m%d}|{name}" for back in range(days) for name in symbols]
+            )
+        stmt = (
+            select(symbol.label("symbol"), *(func.sum(column).label(column.key) for column in columns))
+            .where(TradeCallStat.dimension == "symbol_day", window)
+            .group_by(symbol)
+        )
+    counters = {}
+    for row in (await db.execute(stmt)).all():
+        values = row._asdict()
+        counters[values.pop("symbol")] = {name: value or 0 for name, value in values.items()}
+    return counters
+
+
+async def refresh_leaderboard(db: AsyncSession) -> dict:
+    """Rebuild trade_call_leaderboard for every window from trade_call_stats; does not commit.
+
+    Reads only the rollup tables (one grouped query per window) and replaces
+    the leaderboard inside the caller's transaction, so readers never see a
+    partial ranking. Symbols without calls in a window have no row for it.
+    """
+    start_time = time.time()
+    now = datetime.utcnow()
+    rows = []
+    for period, days in PERIODS.items():
+        for symbol, counters in (await _period_counters(db, days, now.date())).items():
+            if counters["total"]:
+                rows.append(leaderboard_row(period, symbol, counters, now))
+
+    await db.execute(delete(TradeCallLeaderboard))
+    if rows:
+        await db.execute(insert(TradeCallLeaderboard), rows)
+
+    elapsed = time.time() - start_time
+    logger.debug(f"[DB_OP] refresh_leaderboard: {len(rows)} rows in {elapsed:.4f}s")
+    return {"rows": len(rows), "elapsed_seconds": round(elapsed, 3)}
+
+
+async def refresh_leaderboard_symbols(db: AsyncSession, symbols: Iterable[str]) -> int:
+    """Recompute every window's row for ``symbols`` only; returns the rows written. Does not commit.
+
+    Called with the symbols of each trade_call_stats delta, after it is
+    applied, so the leaderboard changes in the same transaction as the calls.
+    """
+    symbols = sorted(set(symbols))
+    now = datetime.utcnow()
+    written = 0
+    for first in range(0, len(symbols), SYMBOL_BATCH):
+        batch = symbols[first : first + SYMBOL_BATCH]
+        rows = []
+        for period, days in PERIODS.items():
+            for symbol, counters in (await _period_counters(db, days, now.date(), batch)).items():
+                if counters["total"]:
+                    rows.append(leaderboard_row(period, symbol, counters, now))
+        await db.execute(delete(TradeCallLeaderboard).where(TradeCallLeaderboard.symbol.in_(batch)))
+        if rows:
+            await db.execute(insert(TradeCallLeaderboard), rows)
+        written += len(rows)
+    return written
+
+
+async def read_leaderboard(
+    db: AsyncSession,
+    period: str = "30d",
+    sort: str = "win_rate",
+    order: str = "desc",
+    limit: int = 50,
+    offset: int = 0,
+    min_finished: int = 0,
+) -> dict:
+    """One page of the ranking, as an index scan on (period, ``sort``, symbol).
+
+    Ties are broken by symbol in the same direction as ``sort`` so the index
+    serves the whole ORDER BY. ``min_finished`` hides symbols with too few
+    finished calls for their rates to mean much.
+    """
+    column = getattr(TradeCallLeaderboard, sort)
+    direction = (lambda c: c.desc()) if order == "desc" else (lambda c: c.asc())
+    stmt = (
+        select(TradeCallLeaderboard)
+        .where(TradeCallLeaderboard.period == period)
+        .order_by(direction(column), direction(TradeCallLeaderboard.symbol))
+        .offset(offset)
+        .limit(limit)
+    )
+    if min_finished:
+        stmt = stmt.where(TradeCallLeaderboard.finished >= min_finished)
+    entries = (await db.execute(stmt)).scalars().all()
+
+    return {
+        "period": period,
+        "sort": sort,
+        "order": order,
+        "offset": offset,
+        "updated_at": entries[0].updated_at.isoformat() if entries else None,
+        "symbols": [
+            {
+                "rank": offset + index + 1,
+                "symbol": entry.symbol,
+                **{name: getattr(entry, name) for name in LEADERBOARD_SORT_COLUMNS},
+            }
+            for index, entry in enumerate(entries)
+        ],
+    }
+
+
+async def roll_leaderboard_windows(db: AsyncSession) -> dict:
+    """Bring the leaderboard up to date with the UTC day; commits.
+
+    The 7d / 30d rows of symbols without calls since midnight still cover the
+    previous day's window, so those symbols are recomputed. An empty
+    leaderboard next to existing stats (first start after the table was
+    added) is rebuilt in full.
+    """
+    now = datetime.utcnow()
+    has_rows = (await db.execute(select(TradeCallLeaderboard.symbol).limit(1))).first()
+    if has_rows is None:
+        has_stats = (
+            await db.execute(select(TradeCallStat.key).where(TradeCallStat.dimension == "symbol").limit(1))
+        ).first()
+        if has_stats is None:
+            return {"rows": 0, "symbols": 0}
+        result = await refresh_leaderboard(db)
+        await db.commit()
+        return {"rows": result["rows"], "symbols": None}
+
+    midnight = datetime.combine(now.date(), datetime.min.time())
+    stale = (
+        await db.execute(
+            select(TradeCallLeaderboard.symbol)
+            .where(TradeCallLeaderboard.period != "all", TradeCallLeaderboard.updated_at < midnight)
+            .distinct()
+        )
+    ).scalars().all()
+    if not stale:
+        return {"rows": 0, "symbols": 0}
+    rows = await refresh_leaderboard_symbols(db, stale)
+    await db.commit()
+    logger.info(f"[TradeCall] Rolled the leaderboard windows over for {len(stale)} symbols")
+    return {"rows": rows, "symbols": len(stale)}
+
+
+async def run_leaderboard_refresh() -> dict:
+    """Roll the leaderboard windows over in its own session (used by the background job)."""
+    await db_manager.ensure_initialized()
+    async with db_manager.async_session_maker() as session:
+        return await roll_leaderboard_windows(session)
+
+
+leaderboard_job = PeriodicJob(
+    "trade-call-leaderboard",
+    run_leaderboard_refresh,
+    interval_seconds=settings.trade_call_leaderboard_interval_seconds,
+)
+
+
+async def start_trade_call_leaderboard():
+    """Start the scheduled leaderboard window rollover (called from the app lifespan)."""
+    if not settings.trade_call_scheduler_enabled:
+        logger.info("Trade call leaderboard refresh disabled")
+        return
+    if not db_manager.engine:
+        logger.warning("Database engine is not ready; skipping trade call leaderboard refresh")
+        return
+    leaderboard_job.start()
+
+
+async def stop_trade_call_leaderboard():
+    """Stop the scheduled leaderboard refresh."""
+    await leaderboard_job.stop()
@@ -0,0 +1,169 @@
+"""
+Trade call performance analytics.
+Equity curve, drawdown, Sharpe / Sortino, streaks and rolling win rate over resolved calls, computed with NumPy
+over a single column fetch.
+"""
+
+import logging
+import math
+import time
+from typing import Optional
+
+import numpy as np
+from models.trade_call_archive import TradeCallHistory
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_YEAR = 365.25 * 24 * 3600
+
+
+def _round(value: float, digits: int = 2) -> Optional[float]:
+    return round(float(value), digits) if math.isfinite(value) else None
+
+
+def _streaks(won: np.ndarray) -> dict:
+    """Longest win / loss runs and the current run (positive = wins, negative = losses)."""
+    if len(won) == 0:
+        return {"longest_win": 0, "longest_loss": 0, "current": 0}
+    starts = np.flatnonzero(np.r_[True, won[1:] != won[:-1]])
+    lengths = np.diff(np.r_[starts, len(won)])
+    winning = won[starts]
+    return {
+        "longest_win": int(lengths[winning].max(initial=0)),
+        "longest_loss": int(lengths[~winning].max(initial=0)),
+        "current": int(lengths[-1] if winning[-1] else -lengths[-1]),
+    }
+
+
+def _rolling_rate(won: np.ndarray, window: int) -> np.ndarray:
+    """Win rate (%) over the last ``window`` trades at each trade (fewer at the start)."""
+    wins = np.cumsum(won, dtype=np.int64)
+    lagged = np.r_[np.zeros(min(window, len(won)), dtype=np.int64), wins[:-window]] if len(won) else wins
+    counts = np.minimum(np.arange(1, len(won) + 1), window)
+    return (wins - lagged) / counts * 100
+
+
+def downsample_indices(values: np.ndarray, points: int) -> np.ndarray:
+    """Indices of at most ~``points`` samples that keep the curve's shape.
+
+    The series is cut into ``points // 2`` equal spans and each span keeps its
+    lowest and highest value (min-max decimation), so drawdown troughs and
+    peaks survive; the first and last points are always kept.
+    """
+    n = len(values)
+    if n <= points:
+        return np.arange(n)
+    spans = max(1, points // 2)
+    span_of = np.arange(n) * spans // n
+    lowest = np.lexsort((values, span_of))
+    highest = np.lexsort((-values, span_of))
+    first_in_span = np.r_[True, span_of[lowest][1:] != span_of[lowest][:-1]]
+    keep = np.r_[0, lowest[first_in_span], highest[first_in_span], n - 1]
+    return np.unique(keep)
+
+
+def performance_report(
+    resolved_at: np.ndarray, profit_pct: np.ndarray, points: int = 500, window: int = 20
+) -> dict:
+    """Build the report from time-ordered ``resolved_at`` (datetime64) and ``profit_pct`` arrays.
+
+    Equity is the running sum of per-trade returns in percent (equal size per
+    call, no compounding); drawdown is measured in the same points from the
+    running peak. Sharpe and Sortino are per trade with a zero risk-free rate,
+    and annualized with the observed number of trades per year. A win is a
+    trade with a positive return.
+    """
+    n = len(profit_pct)
+    equity = np.cumsum(profit_pct)
+    peak = np.maximum.accumulate(np.r_[0.0, equity])[1:]
+    drawdown = equity - peak
+    won = profit_pct > 0
+    rolling = _rolling_rate(won, window)
+
+    mean = profit_pct.mean() if n else math.nan
+    std = profit_pct.std(ddof=1) if n > 1 else math.nan
+    downside = math.sqrt(np.mean(np.minimum(profit_pct, 0.0) ** 2)) if n else math.nan
+    sharpe = mean / std if std and math.isfinite(std) else math.nan
+    sortino = mean / downside if downside else math.nan
+    span_seconds = (resolved_at[-1] - resolved_at[0]) / np.timedelta64(1, "s") if n > 1 else 0.0
+    per_year = math.sqrt(n / (span_seconds / SECONDS_PER_YEAR)) if span_seconds > 0 else math.nan
+
+    trough = int(drawdown.argmin()) if n else -1
+    # The drawdown starts where equity first reached the peak it fell from (the first trade if that peak is 0)
+    at_peak = np.flatnonzero(equity[: trough + 1] == peak[trough]) if n else []
+    peak_at = int(at_peak[0]) if len(at_peak) else 0
+
+    sampled = downsample_indices(equity, points)
+    timestamps = np.datetime_as_string(resolved_at[sampled], unit="s").tolist()
+    curve = [
+        {
+            "t": stamp,
+            "trade": idx + 1,
+            "equity": round(value, 2),
+            "drawdown": round(dd, 2),
+            "rolling_win_rate": round(rate, 1),
+        }
+        for stamp, idx, value, dd, rate in zip(
+            timestamps,
+            sampled.tolist(),
+            equity[sampled].tolist(),
+            drawdown[sampled].tolist(),
+            rolling[sampled].tolist(),
+        )
+    ]
+
+    return {
+        "trades": n,
+        "total_return_pct": round(float(equity[-1]), 2) if n else 0,
+        "win_rate": round(float(won.mean() * 100), 1) if n else 0,
+        "avg_profit_pct": _round(mean),
+        "max_drawdown_pct": round(abs(float(drawdown[trough])), 2) if n else 0,
+        "max_drawdown_start": str(np.datetime_as_string(resolved_at[peak_at], unit="s")) if n else None,
+        "max_drawdown_end": str(np.datetime_as_string(resolved_at[trough], unit="s")) if n else None,
+        "sharpe": _round(sharpe, 3),
+        "sortino": _round(sortino, 3),
+        "sharpe_annualized": _round(sharpe * per_year, 2),
+        "sortino_annualized": _round(sortino * per_year, 2),
+        "streaks": _streaks(won),
+        "rolling_window": window,
+        "points": len(curve),
+        "curve": curve,
+    }
+
+
+async def compute_performance(
+    db: AsyncSession,
+    points: int = 500,
+    window: int = 20,
+    symbol: Optional[str] = None,
+    side: Optional[str] = None,
+) -> dict:
+    """Performance report over resolved calls, oldest first, from one two-column query."""
+    start_time = time.time()
+    stmt = (
+        select(TradeCallHistory.resolved_at, TradeCallHistory.profit_pct)
+        .where(
+            TradeCallHistory.status == "resolved",
+            TradeCallHistory.profit_pct.is_not(None),
+            TradeCallHistory.resolved_at.is_not(None),
+        )
+        .order_by(TradeCallHistory.resolved_at, TradeCallHistory.id)
+    )
+    if symbol:
+        stmt = stmt.where(TradeCallHistory.symbol == symbol)
+    if side:
+        stmt = stmt.where(TradeCallHistory.side == side)
+
+    rows = (await db.execute(stmt)).all()
+    resolved_at = np.array([row[0] for row in rows], dtype="datetime64[us]")
+    profit_pct = np.fromiter((row[1] for row in rows), np.float64, len(rows))
+    fetched_at = time.time()
+
+    report = performance_report(resolved_at, profit_pct, points, window)
+    logger.debug(
+        f"[DB_OP] compute_performance: {len(rows)} calls in {time.time() - start_time:.4f}s "
+        f"(fetch {fetched_at - start_time:.4f}s)"
+    )
+    return report
@@ -0,0 +1,129 @@
+"""
+Trade call recording.
+The one write path for new calls — 4h symbol+side dedup, enrichment, one multi-row INSERT — shared by the API and the
+market scanner.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from models.trade_call import TradeCall
+from services.indicators import enrich_trade_calls
+from services.trade_call_events import trade_call_events
+from services.trade_call_stats import STATS_STATE_FIELDS, TradeCallStatsDelta, stats_cache
+from services.trade_call_triggers import trade_call_triggers
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+DEDUP_WINDOW = timedelta(hours=4)
+CALL_LIFETIME = timedelta(hours=72)
+DUPLICATE_MESSAGE = "Duplicate call (same symbol/side within 4h)"
+
+# Fields a caller provides for a new call (the TradeCallCreate schema)
+CALL_INPUT_FIELDS = (
+    "symbol",
+    "side",
+    "entry_price",
+    "stop_loss",
+    "tp0",
+    "tp1",
+    "tp2",
+    "tp3",
+    "confidence",
+    "reason",
+    "rsi4h",
+    "has_convergence",
+    "rr",
+)
+
+
+def new_call_values(item: dict, now: datetime) -> dict:
+    """Column values for a freshly recorded call (72h expiry)."""
+    values = {field: item.get(field) for field in CALL_INPUT_FIELDS}
+    values.update(
+        status="active",
+        created_at=now,
+        expires_at=now + CALL_LIFETIME,
+        tp0_hit=False,
+        tp1_hit=False,
+        tp2_hit=False,
+        tp3_hit=False,
+        sl_hit=False,
+        best_tp_reached=0,
+        # Price is at entry when the call is recorded
+        mfe_pct=0.0,
+        mae_pct=0.0,
+        mfe_at=now,
+        mae_at=now,
+    )
+    return values
+
+
+async def record_trade_calls(db: AsyncSession, items: list[dict]) -> list[dict]:
+    """Record new calls, skipping any with the same symbol+side as a call from the last 4h.
+
+    The batch is checked against existing calls with one query, survivors are
+    written with one multi-row INSERT, and everything commits once. Later items
+    duplicating an earlier item of the same batch are skipped too. Returns one
+    ``{"index", "created", "id"[, "message"]}`` result per item, in order.
+    """
+    if not items:
+        return []
+
+    now = datetime.utcnow()
+    cutoff = now - DEDUP_WINDOW
+
+    # One lookup for the whole batch: oldest matching call per (symbol, side) in the window
+    stmt = (
+        select(TradeCall.symbol, TradeCall.side, func.min(TradeCall.id))
+        .where(TradeCall.symbol.in_({item["symbol"] for item in items}), TradeCall.created_at >= cutoff)
+        .group_by(TradeCall.symbol, TradeCall.side)
+    )
+    seen: dict[tuple[str, str], Optional[int]] = {
+        (symbol, side): call_id for symbol, side, call_id in (await db.execute(stmt)).all()
+    }
+
+    results: list[dict] = []
+    new_rows: list[dict] = []
+    new_result_indexes: list[int] = []
+    for index, item in enumerate(items):
+        key = (item["symbol"], item["side"])
+        if key in seen:
+            results.append({"index": index, "created": False, "message": DUPLICATE_MESSAGE, "id": seen[key]})
+            continue
+        seen[key] = None  # filled in once the batch insert returns ids
+        new_rows.append(new_call_values(item, now))
+        new_result_indexes.append(len(results))
+        results.append({"index": index, "created": True, "id": None})
+
+    if new_rows:
+        await enrich_trade_calls(new_rows)
+        inserted = await db.execute(
+            insert(TradeCall).returning(TradeCall.id, sort_by_parameter_order=True), new_rows
+        )
+        new_ids = inserted.scalars().all()
+
+        # Keep trade_call_stats in step, in the same transaction
+        delta = TradeCallStatsDelta()
+        for values in new_rows:
+            delta.change(None, {field: values.get(field) for field in STATS_STATE_FIELDS})
+        await delta.apply(db)
+
+        await db.commit()
+        stats_cache.bump()
+
+        for result_index, values, call_id in zip(new_result_indexes, new_rows, new_ids):
+            results[result_index]["id"] = call_id
+            seen[(values["symbol"], values["side"])] = call_id
+            trade_call_triggers.add(call_id, values)
+            trade_call_events.publish_created(call_id, values)
+        # In-batch duplicates point at the call created earlier in this batch
+        for result in results:
+            if result["id"] is None:
+                item = items[result["index"]]
+                result["id"] = seen[(item["symbol"], item["side"])]
+
+    return results
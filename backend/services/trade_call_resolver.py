@@ -0,0 +1,577 @@
+"""
+Trade call resolver.
+Checks active trade calls against current exchange prices and resolves or expires them.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict, namedtuple
+from datetime import datetime, timezone
+from operator import attrgetter
+from types import SimpleNamespace
+from typing import Optional
+
+import numpy as np
+from core.config import settings
+from core.database import db_manager
+from models.trade_call import TradeCall
+from services.candle_store import candle_store
+from services.candles import INTERVAL_MS, CandleSeries
+from services.price_snapshot import price_snapshot_service
+from services.price_stream import price_stream
+from services.scheduler import PeriodicJob
+from services.trade_call_events import trade_call_events
+from services.trade_call_stats import STATS_STATE_FIELDS, TradeCallStatsDelta, stats_cache, stats_state
+from services.trade_call_triggers import sync_trigger_index, trade_call_triggers
+from sqlalchemy import and_, bindparam, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+
+TP_LEVELS = ("tp0", "tp1", "tp2", "tp3")
+
+# Past this many triggered calls, loading every active call beats a long IN (...) list
+MAX_TRIGGERED_LOOKUP = 5000
+
+# Resolution and expiry passes both move calls out of "active"; one at a time keeps the stats deltas exact
+_status_lock = asyncio.Lock()
+
+
+def _to_ms(dt: datetime) -> int:
+    """Naive-UTC datetime → epoch milliseconds."""
+    return int(dt.replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _from_ms(ms: int) -> datetime:
+    """Epoch milliseconds → naive-UTC datetime."""
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).replace(tzinfo=None)
+
+
+def _profit_pct(side: str, entry_price: float, exit_price: float) -> float:
+    if side == "LONG":
+        return round((exit_price - entry_price) / entry_price * 100, 2)
+    return round((entry_price - exit_price) / entry_price * 100, 2)
+
+
+class CallState(SimpleNamespace):
+    """Mutable copy of one active call's row; the resolver edits these instead of ORM objects."""
+
+
+# Columns the resolver loads (as plain rows, no ORM identity map or dirty tracking)
+RESOLVER_COLUMNS = (
+    "id",
+    "symbol",
+    "side",
+    "entry_price",
+    "stop_loss",
+    "tp0",
+    "tp1",
+    "tp2",
+    "tp3",
+    "confidence",
+    "created_at",
+    "expires_at",
+    "status",
+    "tp0_hit",
+    "tp1_hit",
+    "tp2_hit",
+    "tp3_hit",
+    "sl_hit",
+    "tp0_hit_at",
+    "tp1_hit_at",
+    "tp2_hit_at",
+    "tp3_hit_at",
+    "sl_hit_at",
+    "hit_order",
+    "best_tp_reached",
+    "exit_price",
+    "profit_pct",
+    "resolved_at",
+    "last_checked_at",
+    "mfe_pct",
+    "mae_pct",
+    "mfe_at",
+    "mae_at",
+)
+
+# Columns a resolution pass may change, written back with executemany UPDATEs
+OUTCOME_FIELDS = (
+    "status",
+    "tp0_hit",
+    "tp1_hit",
+    "tp2_hit",
+    "tp3_hit",
+    "sl_hit",
+    "tp0_hit_at",
+    "tp1_hit_at",
+    "tp2_hit_at",
+    "tp3_hit_at",
+    "sl_hit_at",
+    "hit_order",
+    "best_tp_reached",
+    "exit_price",
+    "profit_pct",
+    "resolved_at",
+    "last_checked_at",
+    "mfe_pct",
+    "mae_pct",
+    "mfe_at",
+    "mae_at",
+)
+
+# One loaded active call. SQLAlchemy rows resolve each attribute by name on every access, which dominates a
+# pass over thousands of calls; a namedtuple reads fields at tuple speed.
+LoadedCall = namedtuple("LoadedCall", RESOLVER_COLUMNS)
+
+# The outcome fields of a loaded call or CallState as one tuple, for cheap change detection
+_outcome = attrgetter(*OUTCOME_FIELDS)
+
+
+class ActiveCallArrays:
+    """The active calls' levels as NumPy columns, so every call is checked in one pass.
+
+    ``targets`` and ``hit`` have one column per TP level (TP0–TP3); a missing
+    or zero target is NaN and never crosses. Symbols are stored as codes into
+    ``symbol_names`` so a price vector is built with one lookup per symbol.
+    """
+
+    def __init__(self, rows):
+        n = len(rows)
+        codes: dict[str, int] = {}
+        self.symbol_codes = np.fromiter((codes.setdefault(r.symbol, len(codes)) for r in rows), np.intp, n)
+        self.symbol_names = list(codes)
+        self.is_long = np.fromiter((r.side == "LONG" for r in rows), bool, n)
+        self.entry_price = np.fromiter((r.entry_price for r in rows), np.float64, n)
+        self.stop_loss = np.fromiter((r.stop_loss for r in rows), np.float64, n)
+        self.targets = np.array(
+            [[r.tp0 or np.nan, r.tp1 or np.nan, r.tp2 or np.nan, r.tp3 or np.nan] for r in rows], dtype=np.float64
+        ).reshape(n, len(TP_LEVELS))
+        self.hit = np.array(
+            [[bool(r.tp0_hit), bool(r.tp1_hit), bool(r.tp2_hit), bool(r.tp3_hit)] for r in rows], dtype=bool
+        ).reshape(n, len(TP_LEVELS))
+        self.expires_at = np.array([r.expires_at or np.datetime64("NaT") for r in rows], dtype="datetime64[us]")
+        self.mfe = np.array([np.nan if r.mfe_pct is None else r.mfe_pct for r in rows], dtype=np.float64)
+        self.mae = np.array([np.nan if r.mae_pct is None else r.mae_pct for r in rows], dtype=np.float64)
+
+    def expired(self, now: datetime) -> np.ndarray:
+        """Mask of calls whose window has closed (calls without an expiry never expire)."""
+        return self.expires_at <= np.datetime64(now, "us")
+
+    def price_vector(self, prices: dict[str, float]) -> np.ndarray:
+        """Per-call price (NaN where the symbol is unpriced)."""
+        by_symbol = np.array([prices.get(sym, np.nan) for sym in self.symbol_names], dtype=np.float64)
+        return by_symbol[self.symbol_codes]
+
+
+def snapshot_hits(calls: ActiveCallArrays, price: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Evaluate every call against ``price`` at once.
+
+    Returns ``(stopped, crossed)``: a per-call stop-loss mask and an
+    ``(n, 4)`` mask of the TP levels the price is at or beyond. A stopped call
+    crosses no target, and crossing TP1 implies TP0.
+    """
+    priced = ~np.isnan(price)
+    stopped = priced & np.where(calls.is_long, price <= calls.stop_loss, price >= calls.stop_loss)
+    column = price[:, None]
+    crossed = np.where(calls.is_long[:, None], column >= calls.targets, column <= calls.targets)
+    crossed &= (priced & ~stopped)[:, None]
+    crossed[:, 0] |= crossed[:, 1]
+    return stopped, crossed
+
+
+def excursions(calls: ActiveCallArrays, price: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Per-call move for and against the call at ``price``, in % of entry (both >= 0, NaN where unpriced)."""
+    move = np.where(calls.is_long, price - calls.entry_price, calls.entry_price - price) / calls.entry_price * 100
+    return np.round(np.maximum(move, 0.0), 2), np.round(np.maximum(-move, 0.0), 2)
+
+
+def _extend_excursions(call: CallState, mfe: float, mfe_at: datetime, mae: float, mae_at: datetime) -> None:
+    """Raise the call's running MFE / MAE to ``mfe`` / ``mae`` where those go further."""
+    if call.mfe_pct is None or mfe > call.mfe_pct:
+        call.mfe_pct, call.mfe_at = mfe, mfe_at
+    if call.mae_pct is None or mae > call.mae_pct:
+        call.mae_pct, call.mae_at = mae, mae_at
+
+
+def _mark_hit(call: CallState, level: str, at: datetime) -> bool:
+    """Flag ``level`` (tp0..tp3 or sl) as hit at ``at``; returns False if it was already hit."""
+    if getattr(call, f"{level}_hit"):
+        return False
+    setattr(call, f"{level}_hit", True)
+    setattr(call, f"{level}_hit_at", at)
+    call.hit_order = f"{call.hit_order},{level}" if call.hit_order else level
+    if level in ("tp1", "tp2", "tp3"):
+        call.best_tp_reached = max(call.best_tp_reached or 0, int(level[-1]))
+    return True
+
+
+def _close_call(call: CallState, exit_price: float, at: datetime) -> None:
+    call.status = "resolved"
+    call.exit_price = exit_price
+    call.profit_pct = _profit_pct(call.side, call.entry_price, exit_price)
+    call.resolved_at = at
+
+
+def first_crossings(call: CallState, highs: np.ndarray, lows: np.ndarray) -> dict[str, int]:
+    """Index of the first candle crossing each of the call's levels, or -1 if never crossed.
+
+    All five levels (SL, TP0–TP3) are compared against the whole high/low
+    window in one broadcast comparison.
+    """
+    targets = np.array([np.nan if call.tp0 is None else call.tp0, call.tp1, call.tp2, call.tp3], dtype=np.float64)
+    if call.side == "LONG":
+        sl_mask = lows <= call.stop_loss
+        tp_mask = highs[:, None] >= targets[None, :]
+    else:
+        sl_mask = highs >= call.stop_loss
+        tp_mask = lows[:, None] <= targets[None, :]
+
+    first = np.where(tp_mask.any(axis=0), tp_mask.argmax(axis=0), -1)
+    hits = dict(zip(TP_LEVELS, first.tolist()))
+    hits["sl"] = int(sl_mask.argmax()) if sl_mask.any() else -1
+    return hits
+
+
+def _resolve_from_snapshot(
+    rows, calls: ActiveCallArrays, prices: dict[str, float], now: datetime, live: np.ndarray
+) -> tuple[dict[int, CallState], int]:
+    """Resolve the ``live`` calls against one last-trade price per symbol.
+
+    Only the calls that hit something or moved past their MFE / MAE are
+    copied out of ``rows``; returns them by row index, with the resolved count.
+    """
+    price = np.where(live, calls.price_vector(prices), np.nan)
+    stopped, crossed = snapshot_hits(calls, price)
+    mfe, mae = excursions(calls, price)
+    # NaN-safe: a call without recorded excursions takes the first observation
+    extended = ~np.isnan(mfe) & ~((mfe <= calls.mfe) & (mae <= calls.mae))
+    touched_mask = stopped | (crossed & ~calls.hit).any(axis=1) | extended
+
+    touched: dict[int, CallState] = {}
+    resolved_count = 0
+    for idx in np.flatnonzero(touched_mask).tolist():
+        call = touched[idx] = CallState(**rows[idx]._asdict())
+        current_price = float(price[idx])
+        _extend_excursions(call, float(mfe[idx]), now, float(mae[idx]), now)
+        if stopped[idx]:
+            _mark_hit(call, "sl", now)
+            _close_call(call, current_price, now)
+            resolved_count += 1
+            logger.info(f"[TradeCall] Call #{call.id} {call.symbol} {call.side} SL hit @ {current_price}")
+            continue
+
+        for level_idx, level in enumerate(TP_LEVELS):
+            if crossed[idx, level_idx]:
+                _mark_hit(call, level, now)
+
+        if call.tp3_hit:
+            _close_call(call, current_price, now)
+            resolved_count += 1
+            logger.info(f"[TradeCall] Call #{call.id} {call.symbol} {call.side} TP3 hit @ {current_price}")
+
+    return touched, resolved_count
+
+
+def _candle_excursions(call: CallState, window: CandleSeries, end: int) -> None:
+    """Extend the call's MFE / MAE with the highs and lows of ``window[:end]``."""
+    highs, lows = window.high[:end], window.low[:end]
+    if call.side == "LONG":
+        best, worst = int(highs.argmax()), int(lows.argmin())
+        favorable, adverse = highs[best] - call.entry_price, call.entry_price - lows[worst]
+    else:
+        best, worst = int(lows.argmin()), int(highs.argmax())
+        favorable, adverse = call.entry_price - lows[best], highs[worst] - call.entry_price
+    _extend_excursions(
+        call,
+        round(max(float(favorable), 0.0) / call.entry_price * 100, 2),
+        _from_ms(int(window.open_time[best])),
+        round(max(float(adverse), 0.0) / call.entry_price * 100, 2),
+        _from_ms(int(window.open_time[worst])),
+    )
+
+
+def _resolve_from_candles(
+    active_calls: list[CallState], candles: dict[str, CandleSeries], failed: set[str], now: datetime
+) -> int:
+    """Resolve calls from the candles since each call's last check; returns the resolved count.
+
+    Hits are replayed in candle order, so TP/SL touches between resolver runs
+    are caught with their candle timestamp. When one candle touches both a
+    target and the stop, the stop is assumed to have come first. Calls on
+    ``failed`` symbols keep their last check, so the next pass replays the
+    same window; a symbol with no candles at all is simply checked up to now.
+    """
+    step = INTERVAL_MS[settings.trade_call_candle_interval]
+    resolved_count = 0
+    for call in active_calls:
+        checked_until = min(now, call.expires_at) if call.expires_at else now
+        if call.symbol in failed:
+            continue
+        series = candles.get(call.symbol, CandleSeries.empty())
+
+        # Re-read the candle the last check fell in: it may have traded further since
+        start_ms = _to_ms(call.last_checked_at or call.created_at) // step * step
+        window = series.slice(start_ms, _to_ms(checked_until) + 1)
+        call.last_checked_at = checked_until
+        if len(window) == 0:
+            continue
+
+        hits = first_crossings(call, window.high, window.low)
+        cutoff = hits["sl"] if hits["sl"] >= 0 else len(window)
+        # Excursions run up to (and including) the candle that closes the call
+        closing = [idx for idx in (hits["sl"], hits["tp3"]) if idx >= 0]
+        _candle_excursions(call, window, min(closing) + 1 if closing else len(window))
+
+        # tp1 implies tp0, as in snapshot mode
+        if 0 <= hits["tp1"] < cutoff and not (0 <= hits["tp0"] <= hits["tp1"]):
+            hits["tp0"] = hits["tp1"]
+
+        events = sorted(
+            (idx, TP_LEVELS.index(level), level) for level, idx in hits.items() if level != "sl" and 0 <= idx < cutoff
+        )
+        for idx, _, level in events:
+            _mark_hit(call, level, _from_ms(int(window.open_time[idx])))
+
+        if 0 <= hits["tp3"] < cutoff:
+            at = _from_ms(int(window.open_time[hits["tp3"]]))
+            _close_call(call, call.tp3, at)
+            resolved_count += 1
+            logger.info(f"[TradeCall] Call #{call.id} {call.symbol} {call.side} TP3 hit @ {call.tp3} ({at})")
+        elif hits["sl"] >= 0:
+            at = _from_ms(int(window.open_time[hits["sl"]]))
+            _mark_hit(call, "sl", at)
+            _close_call(call, call.stop_loss, at)
+            resolved_count += 1
+            logger.info(f"[TradeCall] Call #{call.id} {call.symbol} {call.side} SL hit @ {call.stop_loss} ({at})")
+
+    return resolved_count
+
+
+async def _write_outcomes(db: AsyncSession, changed: list[tuple]) -> list[tuple]:
+    """Write the resolver's changes back with executemany UPDATEs keyed by id; returns the ``changed`` pairs written.
+
+    ``changed`` holds ``(loaded row, edited call)`` pairs. The rows are first
+    claimed with one UPDATE ... RETURNING (or SELECT ... FOR UPDATE on
+    databases without it), which locks them until commit and reports their
+    current outcome columns. Calls another worker or the expiry sweep touched
+    since they were loaded are skipped, so stats, the trigger index and the
+    event stream only follow rows this pass actually wrote.
+    """
+    if not changed:
+        return []
+    table = TradeCall.__table__
+    columns = [table.c.id, *(table.c[field] for field in OUTCOME_FIELDS)]
+    ids = [call.id for _, call in changed]
+    current = {}
+    for start in range(0, len(ids), MAX_TRIGGERED_LOOKUP):
+        claim = and_(table.c.id.in_(ids[start : start + MAX_TRIGGERED_LOOKUP]), table.c.status == "active")
+        if db.bind.dialect.update_returning:
+            stmt = update(table).where(claim).values(status=table.c.status).returning(*columns)
+        else:
+            stmt = select(*columns).where(claim).with_for_update()
+        current.update((row[0], tuple(row)[1:]) for row in (await db.execute(stmt)).all())
+
+    written = []
+    # One executemany per set of changed columns: most passes only move MFE / MAE, four columns of twenty-two
+    batches: dict[tuple[str, ...], list[dict]] = defaultdict(list)
+    for row, call in changed:
+        loaded = _outcome(row)
+        if current.get(call.id) != loaded:
+            continue
+        written.append((row, call))
+        values = {f"_{field}": new for field, old, new in zip(OUTCOME_FIELDS, loaded, _outcome(call)) if new != old}
+        batches[tuple(values)].append({"_id": call.id, **values})
+    for names, params in batches.items():
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values({name[1:]: bindparam(name) for name in names})
+        )
+        await db.execute(stmt, params)
+    return written
+
+
+async def resolve_active_calls(db: AsyncSession) -> dict:
+    """Check active calls against the market and resolve them.
+
+    ``TRADE_CALL_RESOLUTION_MODE=snapshot`` (default) compares each call with
+    the current price; ``candles`` replays the OHLC candles since each call's
+    last check so intrabar touches are not missed. Candles come from the
+    local candle store, which holds closed candles only; the candle still
+    forming is replayed on the next pass.
+
+    Calls are loaded as column tuples and checked as NumPy arrays; only the
+    calls that changed are written back, with one executemany UPDATE per set
+    of changed columns, and only the ones still as loaded (see
+    ``_write_outcomes``) count as resolved. In snapshot mode the trigger index
+    narrows the load to the calls whose levels the current prices crossed.
+
+    Expiry is left to ``expire_overdue_calls``; in candle mode overdue calls
+    are still replayed here, up to their expiry, before the sweep closes them.
+    """
+    now = datetime.utcnow()
+    stmt = select(*(getattr(TradeCall, col) for col in RESOLVER_COLUMNS)).where(TradeCall.status == "active")
+    if settings.trade_call_resolution_mode != "candles":
+        # A spot price says nothing about the window before expiry; overdue calls are left to the expiry sweep
+        stmt = stmt.where(or_(TradeCall.expires_at.is_(None), TradeCall.expires_at > now))
+    prices = None
+    if settings.trade_call_resolution_mode != "candles" and trade_call_triggers.ready:
+        await sync_trigger_index(db)
+        # Fetch current prices from the shared snapshot (one bulk ticker request)
+        prices = await price_snapshot_service.get_prices(trade_call_triggers.symbols())
+        triggered = trade_call_triggers.triggered_many(prices)
+        if not triggered:
+            return {"resolved": 0, "checked": 0}
+        if len(triggered) <= MAX_TRIGGERED_LOOKUP:
+            stmt = stmt.where(TradeCall.id.in_(triggered))
+
+    result = await db.execute(stmt)
+    rows = [LoadedCall._make(row) for row in result]
+
+    if not rows:
+        return {"resolved": 0, "checked": 0}
+
+    if settings.trade_call_resolution_mode == "candles":
+        step = INTERVAL_MS[settings.trade_call_candle_interval]
+        ranges: dict[str, tuple[int, int]] = {}
+        for row in rows:
+            start_ms = _to_ms(row.last_checked_at or row.created_at) // step * step
+            prev = ranges.get(row.symbol)
+            ranges[row.symbol] = (min(start_ms, prev[0]) if prev else start_ms, _to_ms(now) + 1)
+        candles, failed = await candle_store.get_many(ranges, settings.trade_call_candle_interval)
+        touched = {idx: CallState(**row._asdict()) for idx, row in enumerate(rows)}
+        _resolve_from_candles(list(touched.values()), candles, failed, now)
+    else:
+        calls = ActiveCallArrays(rows)
+        live = ~calls.expired(now)
+        if prices is None:
+            symbols = {calls.symbol_names[code] for code in np.unique(calls.symbol_codes[live]).tolist()}
+            prices = await price_snapshot_service.get_prices(symbols)
+        touched, _ = _resolve_from_snapshot(rows, calls, prices, now, live)
+
+    changed = [(rows[idx], call) for idx, call in touched.items() if _outcome(call) != _outcome(rows[idx])]
+    changed = await _write_outcomes(db, changed)
+
+    # Keep trade_call_stats in step, in the same transaction
+    delta = TradeCallStatsDelta()
+    for row, call in changed:
+        delta.change(stats_state(row), stats_state(call))
+    stats_changed = bool(delta)
+    await delta.apply(db)
+
+    await db.commit()
+    if stats_changed:
+        stats_cache.bump()
+    for _, call in changed:
+        trade_call_triggers.add(call.id, call)
+    for row, call in changed:
+        trade_call_events.publish_changes(call, stats_state(row))
+
+    return {"resolved": sum(call.status != "active" for _, call in changed), "checked": len(rows)}
+
+
+async def expire_overdue_calls(db: AsyncSession) -> dict:
+    """Expire every active call past its window with one UPDATE.
+
+    The expired rows come back through RETURNING (or one SELECT first on
+    databases without it) to keep trade_call_stats, the trigger index and
+    the event stream in step. In candle mode only calls whose candles were
+    replayed up to their expiry are closed, so late hits are not lost.
+    """
+    now = datetime.utcnow()
+    table = TradeCall.__table__
+    overdue = and_(table.c.status == "active", table.c.expires_at <= now)
+    if settings.trade_call_resolution_mode == "candles":
+        overdue = and_(overdue, table.c.last_checked_at >= table.c.expires_at)
+    columns = [table.c.id, *(table.c[field] for field in STATS_STATE_FIELDS if field != "status")]
+
+    stmt = update(table).where(overdue).values(status="expired", resolved_at=now)
+    if db.bind.dialect.update_returning:
+        rows = (await db.execute(stmt.returning(*columns))).all()
+    else:
+        rows = (await db.execute(select(*columns).where(overdue).with_for_update())).all()
+        if rows:
+            await db.execute(stmt.where(table.c.id.in_([row.id for row in rows])))
+
+    if not rows:
+        return {"expired": 0}
+
+    delta = TradeCallStatsDelta()
+    for row in rows:
+        state = {field: getattr(row, field) for field in STATS_STATE_FIELDS if field != "status"}
+        delta.change({**state, "status": "active"}, {**state, "status": "expired"})
+    await delta.apply(db)
+
+    await db.commit()
+    stats_cache.bump()
+    for row in rows:
+        trade_call_triggers.discard(row.id)
+        trade_call_events.publish_expired(row.id, row.symbol, row.side, now)
+    logger.info(f"[TradeCall] Expired {len(rows)} calls")
+    return {"expired": len(rows)}
+
+
+async def run_resolution() -> dict:
+    """Run one resolution pass in its own session (used by the background job)."""
+    start_time = time.time()
+    logger.debug("[DB_OP] Starting trade call resolution")
+    await db_manager.ensure_initialized()
+    async with _status_lock, db_manager.async_session_maker() as session:
+        result = await resolve_active_calls(session)
+    logger.debug(f"[DB_OP] Trade call resolution completed in {time.time() - start_time:.4f}s - {result}")
+    return result
+
+
+async def run_expiry_sweep() -> dict:
+    """Run one expiry sweep in its own session (used by the background job)."""
+    await db_manager.ensure_initialized()
+    async with _status_lock, db_manager.async_session_maker() as session:
+        result = await expire_overdue_calls(session)
+    return result
+
+
+resolver_job = PeriodicJob(
+    "trade-call-resolver",
+    run_resolution,
+    interval_seconds=settings.trade_call_resolve_interval_seconds,
+)
+
+expiry_job = PeriodicJob(
+    "trade-call-expiry",
+    run_expiry_sweep,
+    interval_seconds=settings.trade_call_expiry_interval_seconds,
+)
+
+
+def _on_price_tick(symbol: str, previous: Optional[float], price: float) -> None:
+    """Wake the resolver as soon as a streamed tick crosses a pending level."""
+    if not trade_call_triggers.ready:
+        return
+    if previous is None:
+        crossed = trade_call_triggers.triggered(symbol, price)
+    else:
+        crossed = trade_call_triggers.crossed(symbol, previous, price)
+    if crossed:
+        resolver_job.trigger()
+
+
+async def start_trade_call_scheduler():
+    """Start the background trade call resolver and expiry sweep (called from the app lifespan)."""
+    if not settings.trade_call_scheduler_enabled:
+        logger.info("Trade call scheduler disabled")
+        return
+    if not db_manager.engine:
+        logger.warning("Database engine is not ready; skipping trade call scheduler")
+        return
+    resolver_job.start()
+    expiry_job.start()
+    price_stream.add_listener(_on_price_tick)
+
+
+async def stop_trade_call_scheduler():
+    """Stop the background trade call resolver and expiry sweep."""
+    price_stream.remove_listener(_on_price_tick)
+    await resolver_job.stop()
+    await expiry_job.stop()
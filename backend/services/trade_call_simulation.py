@@ -0,0 +1,158 @@
+"""
+Trade call Monte Carlo simulation.
+Bootstraps trade sequences from historical call outcomes and sizes every trade at a fixed fraction of equity,
+as NumPy matrices of paths × trades chunked across the shared worker pool.
+"""
+
+import asyncio
+import logging
+import time
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+from core.config import settings
+from models.trade_call_archive import TradeCallHistory
+from services.backtest import get_worker_pool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (5, 25, 50, 75, 95)
+DRAWDOWN_THRESHOLDS = (20, 50)
+
+# Upper bound on the (paths × trades) cells of one run
+MAX_SIMULATION_CELLS = 10_000_000
+# Upper bound on the (paths × trades) cells of one matrix (and worker task), to cap memory
+MAX_CHUNK_CELLS = 1_000_000
+# Below this many cells (paths × trades) the whole run is cheaper inline than in the pool
+INLINE_MAX_CELLS = 2_000_000
+
+
+def simulate_paths(
+    r_multiples: np.ndarray, risk_fraction: float, paths: int, trades: int, seed: np.random.SeedSequence
+) -> tuple[np.ndarray, np.ndarray]:
+    """Final equity and max drawdown (both as fractions) of ``paths`` bootstrapped sequences.
+
+    Each path draws ``trades`` outcomes with replacement; a trade returns
+    ``risk_fraction × R`` of current equity, and equity cannot go below 0.
+    """
+    rng = np.random.default_rng(seed)
+    growth = 1.0 + risk_fraction * r_multiples[rng.integers(0, len(r_multiples), size=(paths, trades))]
+    equity = np.cumprod(np.maximum(growth, 0.0), axis=1)
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+    drawdown = 1.0 - (equity / peak).min(axis=1)
+    return equity[:, -1], drawdown
+
+
+def _simulate_shared(
+    name: str, samples: int, risk_fraction: float, paths: int, trades: int, seed: np.random.SeedSequence
+) -> tuple[np.ndarray, np.ndarray]:
+    """:func:`simulate_paths` in a pool worker, reading the R multiples from shared memory block ``name``."""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        r_multiples = np.ndarray((samples,), dtype=np.float64, buffer=block.buf)
+        result = simulate_paths(r_multiples, risk_fraction, paths, trades, seed)
+        del r_multiples  # release the buffer before closing the block
+        return result
+    finally:
+        block.close()
+
+
+def _percentiles(values: np.ndarray) -> dict:
+    return {f"p{q}": round(float(v), 2) for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+async def load_r_multiples(
+    db: AsyncSession,
+    symbol: Optional[str] = None,
+    side: Optional[str] = None,
+    include_expired: bool = False,
+) -> np.ndarray:
+    """Historical outcomes as R multiples: profit over the call's entry-to-stop risk.
+
+    Expired calls have no exit, so they are left out unless ``include_expired``
+    counts them as scratch trades (0 R).
+    """
+    statuses = ("resolved", "expired") if include_expired else ("resolved",)
+    stmt = select(TradeCallHistory.entry_price, TradeCallHistory.stop_loss, TradeCallHistory.profit_pct).where(
+        TradeCallHistory.status.in_(statuses)
+    )
+    if symbol:
+        stmt = stmt.where(TradeCallHistory.symbol == symbol)
+    if side:
+        stmt = stmt.where(TradeCallHistory.side == side)
+    rows = (await db.execute(stmt)).all()
+
+    n = len(rows)
+    entry = np.fromiter((row[0] for row in rows), np.float64, n)
+    stop = np.fromiter((row[1] for row in rows), np.float64, n)
+    profit = np.fromiter((0.0 if row[2] is None else row[2] for row in rows), np.float64, n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        risk_pct = np.abs(entry - stop) / entry * 100
+        r_multiples = profit / risk_pct
+    return r_multiples[np.isfinite(r_multiples)]
+
+
+async def run_simulation(
+    r_multiples: np.ndarray,
+    risk_pct: float = 1.0,
+    paths: int = 10_000,
+    trades: int = 250,
+    seed: int = 0,
+) -> dict:
+    """Simulate ``paths`` sequences of ``trades`` calls at ``risk_pct`` % of equity per trade.
+
+    Paths are generated in fixed chunks with child seeds of ``seed``, so a
+    parameter set always gives the same result whether the chunks run in a
+    thread or across the worker pool. Pool workers read the R multiples from
+    one shared memory block instead of each task pickling its own copy.
+    Final equity and drawdown are reported in % of the starting equity.
+    """
+    start_time = time.time()
+    report = {"samples": len(r_multiples), "paths": paths, "trades": trades, "risk_pct": risk_pct, "seed": seed}
+    if len(r_multiples) == 0:
+        return {**report, "final_equity_pct": None, "max_drawdown_pct": None, "probabilities": None}
+
+    chunk = max(1, MAX_CHUNK_CELLS // trades)
+    sizes = [min(chunk, paths - first) for first in range(0, paths, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    risk_fraction = risk_pct / 100
+    if paths * trades <= INLINE_MAX_CELLS or len(sizes) == 1 or settings.backtest_max_workers == 1:
+        chunks = await asyncio.to_thread(
+            lambda: [simulate_paths(r_multiples, risk_fraction, size, trades, s) for size, s in zip(sizes, seeds)]
+        )
+    else:
+        samples = np.ascontiguousarray(r_multiples, dtype=np.float64)
+        block = shared_memory.SharedMemory(create=True, size=samples.nbytes)
+        try:
+            np.ndarray(samples.shape, dtype=np.float64, buffer=block.buf)[:] = samples
+            loop = asyncio.get_running_loop()
+            pool = get_worker_pool()
+            chunks = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        pool, _simulate_shared, block.name, len(samples), risk_fraction, size, trades, s
+                    )
+                    for size, s in zip(sizes, seeds)
+                )
+            )
+        finally:
+            block.close()
+            block.unlink()
+
+    final = np.concatenate([part[0] for part in chunks]) * 100
+    drawdown = np.concatenate([part[1] for part in chunks]) * 100
+    elapsed = time.time() - start_time
+    logger.info(f"[Simulation] {paths} paths × {trades} trades in {elapsed:.2f}s ({len(sizes)} chunks)")
+    return {
+        **report,
+        "final_equity_pct": {**_percentiles(final), "mean": round(float(final.mean()), 2)},
+        "max_drawdown_pct": {**_percentiles(drawdown), "mean": round(float(drawdown.mean()), 2)},
+        "probabilities": {
+            "loss": round(float((final < 100).mean()), 4),
+            **{f"drawdown_over_{pct}": round(float((drawdown > pct).mean()), 4) for pct in DRAWDOWN_THRESHOLDS},
+        },
+        "elapsed_seconds": round(elapsed, 3),
+    }
@@ -0,0 +1,891 @@
+"""
+Trade call statistics.
+Serves the /api/v1/trade-calls/stats payload from the incrementally maintained trade_call_stats table,
+with grouped SQL aggregates over the full call history (hot and archived) for rebuilds and as a fallback.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from operator import attrgetter
+from typing import Awaitable, Callable, Hashable, Optional
+
+import numpy as np
+from core.config import settings
+from core.database import db_manager
+from models.trade_call import TradeCall
+from models.trade_call_archive import TradeCallHistory
+from models.trade_call_stats import TradeCallStat
+from services.trade_call_leaderboard import ROLLUP_COUNTERS, refresh_leaderboard, refresh_leaderboard_symbols
+from sqlalchemy import Integer, String, and_, case, cast, delete, extract, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("resolved", "expired")
+
+# (payload label, lower bound inclusive, upper bound exclusive)
+CONFIDENCE_BUCKETS = (
+    ("<50%", None, 50),
+    ("50-65%", 50, 65),
+    ("65-80%", 65, 80),
+    (">80%", 80, None),
+)
+
+# MFE / MAE distribution buckets, in % of entry
+EXCURSION_BUCKETS = (
+    ("<1%", None, 1),
+    ("1-2%", 1, 2),
+    ("2-5%", 2, 5),
+    ("5-10%", 5, 10),
+    (">10%", 10, None),
+)
+
+COUNTERS = (
+    "total",
+    "active",
+    "resolved",
+    "expired",
+    "finished",
+    "wins",
+    "tp0_hits",
+    "tp1_hits",
+    "tp2_hits",
+    "tp3_hits",
+    "sl_hits",
+    "profit_sum",
+    "profit_count",
+    "mfe_sum",
+    "mae_sum",
+    "excursion_count",
+)
+
+FLOAT_COUNTERS = ("profit_sum", "mfe_sum", "mae_sum")
+
+
+def _rate(part: int, whole: int) -> float:
+    return round(part / whole * 100, 1) if whole > 0 else 0
+
+
+def _count_if(condition):
+    """Portable conditional count (works on SQLite and Postgres alike)."""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _is_win():
+    """Win = TP1 hit and SL not hit."""
+    return and_(TradeCallHistory.tp1_hit.is_(True), TradeCallHistory.sl_hit.is_not(True))
+
+
+def _has_excursions():
+    return and_(TradeCallHistory.mfe_pct.is_not(None), TradeCallHistory.mae_pct.is_not(None))
+
+
+def _range_condition(column, low, high):
+    conditions = []
+    if low is not None:
+        conditions.append(column >= low)
+    if high is not None:
+        conditions.append(column < high)
+    return and_(*conditions)
+
+
+def _confidence_condition(low, high):
+    return _range_condition(TradeCallHistory.confidence, low, high)
+
+
+def _bucket_case(column, buckets):
+    """SQL CASE mapping ``column`` to its bucket label (the last bucket catches the rest)."""
+    return case(
+        *((_range_condition(column, low, high), literal(label)) for label, low, high in buckets[:-1]),
+        else_=literal(buckets[-1][0]),
+    )
+
+
+def _bucket(value: float, buckets) -> str:
+    for label, low, high in buckets:
+        if (low is None or value >= low) and (high is None or value < high):
+            return label
+    return buckets[-1][0]
+
+
+def confidence_bucket(confidence: int) -> str:
+    return _bucket(confidence, CONFIDENCE_BUCKETS)
+
+
+def excursion_bucket(pct: float) -> str:
+    return _bucket(pct, EXCURSION_BUCKETS)
+
+
+def symbol_day_key(created_at: datetime, symbol: str) -> str:
+    """Key of a call's ("symbol_day", ...) row: creation day first, so a day range is a key range."""
+    return f"{created_at:%Y%m%d}|{symbol}"
+
+
+def _week_key(dialect_name: str):
+    """SQL expression matching Python's ``created_at.strftime("%Y-W%W")``, or None if unsupported."""
+    if dialect_name == "sqlite":
+        return func.strftime("%Y-W%W", TradeCallHistory.created_at)
+    if dialect_name == "postgresql":
+        # %W = weeks starting on Monday, days before the first Monday are week 00
+        week_no = cast(
+            func.floor((extract("doy", TradeCallHistory.created_at) + 7 - extract("isodow", TradeCallHistory.created_at)) / 7),
+            Integer,
+        )
+        return func.concat(
+            func.to_char(TradeCallHistory.created_at, "YYYY"), "-W", func.lpad(cast(week_no, String), 2, "0")
+        )
+    return None
+
+
+async def _weekly_win_rate(db: AsyncSession) -> list[dict]:
+    finished = TradeCallHistory.status.in_(FINISHED_STATUSES)
+    week_key = _week_key(db.bind.dialect.name)
+    weekly: dict[str, dict] = {}
+
+    if week_key is not None:
+        stmt = (
+            select(week_key.label("week"), func.count().label("total"), _count_if(_is_win()).label("wins"))
+            .where(finished, TradeCallHistory.created_at.is_not(None))
+            .group_by(week_key)
+        )
+        for row in (await db.execute(stmt)).all():
+            weekly[row.week] = {"wins": int(row.wins), "total": int(row.total)}
+    else:
+        # Other dialects: group per day in SQL, fold days into weeks here
+        day = func.date(TradeCallHistory.created_at)
+        stmt = (
+            select(day.label("day"), func.count().label("total"), _count_if(_is_win()).label("wins"))
+            .where(finished, TradeCallHistory.created_at.is_not(None))
+            .group_by(day)
+        )
+        for row in (await db.execute(stmt)).all():
+            d = row.day if isinstance(row.day, (date, datetime)) else date.fromisoformat(str(row.day))
+            bucket = weekly.setdefault(d.strftime("%Y-W%W"), {"wins": 0, "total": 0})
+            bucket["wins"] += int(row.wins)
+            bucket["total"] += int(row.total)
+
+    return [
+        {"week": wk, "wins": d["wins"], "total": d["total"], "win_rate": _rate(d["wins"], d["total"])}
+        for wk, d in sorted(weekly.items())
+    ]
+
+
+async def compute_trade_stats(db: AsyncSession) -> dict:
+    """Aggregate performance statistics straight from the call history in two grouped queries.
+
+    Used when the trade_call_stats table has not been built yet.
+    """
+    start_time = time.time()
+    logger.debug("[DB_OP] Starting compute_trade_stats")
+
+    finished = TradeCallHistory.status.in_(FINISHED_STATUSES)
+    win = _is_win()
+    is_long = TradeCallHistory.side == "LONG"
+    is_short = TradeCallHistory.side != "LONG"
+
+    columns = [
+        func.count(TradeCallHistory.id).label("total"),
+        _count_if(TradeCallHistory.status == "active").label("active"),
+        _count_if(TradeCallHistory.status == "resolved").label("resolved"),
+        _count_if(TradeCallHistory.status == "expired").label("expired"),
+        _count_if(finished).label("finished"),
+        _count_if(and_(finished, win)).label("wins"),
+        _count_if(and_(finished, TradeCallHistory.tp0_hit.is_(True))).label("tp0_hits"),
+        _count_if(and_(finished, TradeCallHistory.tp1_hit.is_(True))).label("tp1_hits"),
+        _count_if(and_(finished, TradeCallHistory.tp2_hit.is_(True))).label("tp2_hits"),
+        _count_if(and_(finished, TradeCallHistory.tp3_hit.is_(True))).label("tp3_hits"),
+        _count_if(and_(finished, TradeCallHistory.sl_hit.is_(True))).label("sl_hits"),
+        func.avg(case((finished, TradeCallHistory.profit_pct))).label("avg_profit"),
+        _count_if(and_(finished, is_long)).label("long_total"),
+        _count_if(and_(finished, is_long, win)).label("long_wins"),
+        _count_if(and_(finished, is_short)).label("short_total"),
+        _count_if(and_(finished, is_short, win)).label("short_wins"),
+    ]
+    for idx, (_, low, high) in enumerate(CONFIDENCE_BUCKETS):
+        in_bucket = _confidence_condition(low, high)
+        columns.append(_count_if(and_(finished, in_bucket)).label(f"conf{idx}_total"))
+        columns.append(_count_if(and_(finished, in_bucket, win)).label(f"conf{idx}_wins"))
+
+    tracked = and_(finished, _has_excursions())
+    columns.append(_count_if(tracked).label("excursion_count"))
+    columns.append(func.avg(case((tracked, TradeCallHistory.mfe_pct))).label("avg_mfe"))
+    columns.append(func.avg(case((tracked, TradeCallHistory.mae_pct))).label("avg_mae"))
+    for name, column in (("mfe", TradeCallHistory.mfe_pct), ("mae", TradeCallHistory.mae_pct)):
+        for idx, (_, low, high) in enumerate(EXCURSION_BUCKETS):
+            in_bucket = and_(tracked, _range_condition(column, low, high))
+            columns.append(_count_if(in_bucket).label(f"{name}{idx}_total"))
+            columns.append(_count_if(and_(in_bucket, win)).label(f"{name}{idx}_wins"))
+
+    averages = ("avg_profit", "avg_mfe", "avg_mae")
+    row = (await db.execute(select(*columns))).one()._mapping
+    counts = {key: int(value or 0) for key, value in row.items() if key not in averages}
+    total_resolved = counts["finished"]
+
+    stats = {
+        "total_calls": counts["total"],
+        "active_calls": counts["active"],
+        "resolved_calls": counts["resolved"],
+        "expired_calls": counts["expired"],
+        "win_rate": _rate(counts["wins"], total_resolved),
+        "tp0_rate": _rate(counts["tp0_hits"], total_resolved),
+        "tp1_rate": _rate(counts["tp1_hits"], total_resolved),
+        "tp2_rate": _rate(counts["tp2_hits"], total_resolved),
+        "tp3_rate": _rate(counts["tp3_hits"], total_resolved),
+        "sl_rate": _rate(counts["sl_hits"], total_resolved),
+        "avg_profit_pct": round(row["avg_profit"], 2) if row["avg_profit"] is not None else 0,
+        "long_win_rate": _rate(counts["long_wins"], counts["long_total"]),
+        "short_win_rate": _rate(counts["short_wins"], counts["short_total"]),
+        "long_total": counts["long_total"],
+        "short_total": counts["short_total"],
+        "confidence_buckets": {
+            label: {
+                "win_rate": _rate(counts[f"conf{idx}_wins"], counts[f"conf{idx}_total"]),
+                "total": counts[f"conf{idx}_total"],
+            }
+            for idx, (label, _, _) in enumerate(CONFIDENCE_BUCKETS)
+        },
+        "weekly_win_rate": await _weekly_win_rate(db),
+        "excursions": {
+            "tracked": counts["excursion_count"],
+            "avg_mfe_pct": round(row["avg_mfe"], 2) if row["avg_mfe"] is not None else 0,
+            "avg_mae_pct": round(row["avg_mae"], 2) if row["avg_mae"] is not None else 0,
+            **{
+                f"{name}_distribution": {
+                    label: {
+                        "win_rate": _rate(counts[f"{name}{idx}_wins"], counts[f"{name}{idx}_total"]),
+                        "total": counts[f"{name}{idx}_total"],
+                    }
+                    for idx, (label, _, _) in enumerate(EXCURSION_BUCKETS)
+                }
+                for name in ("mfe", "mae")
+            },
+        },
+    }
+
+    logger.debug(f"[DB_OP] compute_trade_stats completed in {time.time() - start_time:.4f}s")
+    return stats
+
+
+# ── Calibration ──────────────────────────────────────────────────────────────
+
+CALIBRATION_GROUPINGS = ("symbol", "side")
+
+
+def calibration_buckets(edges: list[int]) -> tuple:
+    """Confidence bins split at ``edges`` (0–100), as ``(label, low, high)`` like CONFIDENCE_BUCKETS.
+
+    The first bin also takes anything below 0 and the last anything up to and including 100.
+    """
+    bounds = [0, *sorted({edge for edge in edges if 0 < edge < 100}), 100]
+    return tuple(
+        (f"{low}-{high}%", low if idx else None, high if idx < len(bounds) - 2 else None)
+        for idx, (low, high) in enumerate(zip(bounds, bounds[1:]))
+    )
+
+
+def _calibration_summary(cells: list[dict]) -> dict:
+    """Reliability figures for one group: per-bin win rate vs. mean confidence, ECE and Brier score."""
+    total = sum(cell["total"] for cell in cells)
+    bins = []
+    ece = brier = 0.0
+    for cell in cells:
+        count, wins = cell["total"], cell["wins"]
+        mean_confidence = cell["confidence_sum"] / count if count else None
+        win_rate = wins / count * 100 if count else None
+        if count:
+            ece += count / total * abs(win_rate - mean_confidence)
+            # Σ (p - won)² with p = confidence / 100 and won ∈ {0, 1}
+            brier += cell["confidence_sq_sum"] / 10_000 - 2 * cell["win_confidence_sum"] / 100 + wins
+        bins.append(
+            {
+                "bin": cell["bin"],
+                "total": count,
+                "wins": wins,
+                "win_rate": round(win_rate, 1) if win_rate is not None else None,
+                "avg_confidence": round(mean_confidence, 1) if mean_confidence is not None else None,
+            }
+        )
+    return {
+        "total": total,
+        "ece": round(ece, 2) if total else None,
+        "brier_score": round(brier / total, 4) if total else None,
+        "bins": bins,
+    }
+
+
+async def compute_calibration(
+    db: AsyncSession,
+    buckets: tuple = CONFIDENCE_BUCKETS,
+    group_by: Optional[str] = None,
+    symbol: Optional[str] = None,
+    side: Optional[str] = None,
+) -> dict:
+    """Reliability curve of finished calls: stated confidence vs. realized win rate per confidence bin.
+
+    Binning happens in SQL with a CASE over the bin bounds, grouped by bin
+    (and by symbol or side when ``group_by`` is set), so only the per-bin
+    counts leave the database. ``ece`` is the expected calibration error in
+    percentage points; ``brier_score`` treats confidence / 100 as the
+    predicted win probability.
+    """
+    if group_by is not None and group_by not in CALIBRATION_GROUPINGS:
+        raise ValueError(f"Unknown calibration grouping: {group_by}")
+    start_time = time.time()
+
+    win = _is_win()
+    bin_label = _bucket_case(TradeCallHistory.confidence, buckets).label("bin")
+    keys = [bin_label]
+    if group_by is not None:
+        keys.insert(0, getattr(TradeCallHistory, group_by).label("group"))
+    stmt = select(
+        *keys,
+        func.count(TradeCallHistory.id).label("total"),
+        _count_if(win).label("wins"),
+        func.sum(TradeCallHistory.confidence).label("confidence_sum"),
+        func.sum(TradeCallHistory.confidence * TradeCallHistory.confidence).label("confidence_sq_sum"),
+        func.coalesce(func.sum(case((win, TradeCallHistory.confidence), else_=0)), 0).label("win_confidence_sum"),
+    ).where(TradeCallHistory.status.in_(FINISHED_STATUSES))
+    if symbol:
+        stmt = stmt.where(TradeCallHistory.symbol == symbol)
+    if side:
+        stmt = stmt.where(TradeCallHistory.side == side)
+    stmt = stmt.group_by(*keys)
+
+    empty = {"total": 0, "wins": 0, "confidence_sum": 0, "confidence_sq_sum": 0, "win_confidence_sum": 0}
+    grouped: dict[str, dict[str, dict]] = defaultdict(dict)
+    for row in (await db.execute(stmt)).all():
+        cell = row._asdict()
+        group, label = cell.pop("group", None), cell.pop("bin")
+        grouped[group][label] = {name: value or 0 for name, value in cell.items()}
+
+    def summary(by_bin: dict[str, dict]) -> dict:
+        return _calibration_summary([{**by_bin.get(label, empty), "bin": label} for label, _, _ in buckets])
+
+    overall: dict[str, dict] = {}
+    for by_bin in grouped.values():
+        for label, cell in by_bin.items():
+            merged = overall.setdefault(label, dict(empty))
+            for name, value in cell.items():
+                merged[name] += value
+
+    payload = summary(overall)
+    if group_by is not None:
+        payload["group_by"] = group_by
+        payload["groups"] = {key: summary(by_bin) for key, by_bin in sorted(grouped.items())}
+
+    logger.debug(f"[DB_OP] compute_calibration completed in {time.time() - start_time:.4f}s")
+    return payload
+
+
+# ── Incremental aggregates (trade_call_stats) ───────────────────────────────
+
+
+STATS_STATE_FIELDS = (
+    "symbol",
+    "side",
+    "confidence",
+    "created_at",
+    "status",
+    "tp0_hit",
+    "tp1_hit",
+    "tp2_hit",
+    "tp3_hit",
+    "sl_hit",
+    "profit_pct",
+    "mfe_pct",
+    "mae_pct",
+)
+
+
+_stats_values = attrgetter(*STATS_STATE_FIELDS)
+
+
+def stats_state(call: TradeCall) -> dict:
+    """Snapshot of the fields that feed the aggregates; take one before mutating a call."""
+    return dict(zip(STATS_STATE_FIELDS, _stats_values(call)))
+
+
+# The state fields _stat_keys reads besides status and the excursions
+_STAT_KEY_FIELDS = ("symbol", "side", "confidence", "created_at")
+
+
+def _stat_keys(state: dict) -> list[tuple[str, str]]:
+    keys = [
+        ("global", ""),
+        ("symbol", state["symbol"]),
+        ("side", state["side"]),
+        ("confidence", confidence_bucket(state["confidence"])),
+    ]
+    if state["created_at"] is not None:
+        keys.append(("week", state["created_at"].strftime("%Y-W%W")))
+        keys.append(("symbol_day", symbol_day_key(state["created_at"], state["symbol"])))
+    if _tracks_excursions(state):
+        keys.append(("mfe", excursion_bucket(state["mfe_pct"])))
+        keys.append(("mae", excursion_bucket(state["mae_pct"])))
+    return keys
+
+
+def _tracks_excursions(state: dict) -> bool:
+    """Finished calls with both excursions recorded count towards the MFE/MAE figures."""
+    return (
+        state["status"] in FINISHED_STATUSES
+        and state.get("mfe_pct") is not None
+        and state.get("mae_pct") is not None
+    )
+
+
+def _contribution(state: dict) -> dict:
+    """Counter values one call in ``state`` contributes to each of its aggregate rows."""
+    finished = state["status"] in FINISHED_STATUSES
+    has_profit = finished and state["profit_pct"] is not None
+    tracked = _tracks_excursions(state)
+    return {
+        "total": 1,
+        "active": int(state["status"] == "active"),
+        "resolved": int(state["status"] == "resolved"),
+        "expired": int(state["status"] == "expired"),
+        "finished": int(finished),
+        "wins": int(finished and bool(state["tp1_hit"]) and not state["sl_hit"]),
+        "tp0_hits": int(finished and bool(state["tp0_hit"])),
+        "tp1_hits": int(finished and bool(state["tp1_hit"])),
+        "tp2_hits": int(finished and bool(state["tp2_hit"])),
+        "tp3_hits": int(finished and bool(state["tp3_hit"])),
+        "sl_hits": int(finished and bool(state["sl_hit"])),
+        "profit_sum": state["profit_pct"] if has_profit else 0.0,
+        "profit_count": int(has_profit),
+        "mfe_sum": state["mfe_pct"] if tracked else 0.0,
+        "mae_sum": state["mae_pct"] if tracked else 0.0,
+        "excursion_count": int(tracked),
+    }
+
+
+class TradeCallStatsDelta:
+    """Accumulates counter changes for a batch of call inserts/updates and applies them in one upsert.
+
+    Call ``apply()`` inside the same transaction as the call changes so the
+    aggregates, and the leaderboard rows of the symbols whose ranking
+    counters moved, commit (or roll back) together with them.
+    """
+
+    def __init__(self):
+        self._deltas: dict[tuple[str, str], dict] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+    def _add(self, stat_keys, contribution: dict, sign: int) -> None:
+        for stat_key in stat_keys:
+            delta = self._deltas[stat_key]
+            for name, value in contribution.items():
+                delta[name] += sign * value
+
+    def change(self, before: Optional[dict], after: Optional[dict]) -> None:
+        """Record a call going from ``before`` to ``after`` (None = did not exist).
+
+        Aggregate rows the call belongs to both before and after only take the
+        counters that differ, so an update that moves nothing (e.g. a new MFE
+        on an active call) costs no counter arithmetic.
+        """
+        if before == after:
+            return
+        old = _contribution(before) if before is not None else {}
+        new = _contribution(after) if after is not None else {}
+        if old == new and all(before[field] == after[field] for field in _STAT_KEY_FIELDS):
+            # Same rows (equal contributions imply equal excursion buckets), nothing to add
+            return
+        old_keys = _stat_keys(before) if before is not None else []
+        new_keys = _stat_keys(after) if after is not None else []
+        shared = set(old_keys).intersection(new_keys)
+        if shared:
+            diff = {name: new[name] - old[name] for name in COUNTERS if new[name] != old[name]}
+            if diff:
+                self._add(shared, diff, 1)
+        self._add([key for key in old_keys if key not in shared], old, -1)
+        self._add([key for key in new_keys if key not in shared], new, 1)
+
+    def __bool__(self) -> bool:
+        return any(any(v for v in delta.values()) for delta in self._deltas.values())
+
+    async def apply(self, db: AsyncSession) -> None:
+        rows = [
+            {"dimension": dimension, "key": key, **delta, "updated_at": datetime.utcnow()}
+            for (dimension, key), delta in self._deltas.items()
+            if any(delta.values())
+        ]
+        # Excursion-only changes leave the leaderboard as it is
+        symbols = [
+            key
+            for (dimension, key), delta in self._deltas.items()
+            if dimension == "symbol" and any(delta[name] for name in ROLLUP_COUNTERS)
+        ]
+        self._deltas.clear()
+        if rows:
+            await _upsert_increments(db, rows)
+        if symbols:
+            await refresh_leaderboard_symbols(db, symbols)
+
+
+async def _upsert_increments(db: AsyncSession, rows: list[dict]) -> None:
+    """Add each row's counters to the matching trade_call_stats row, creating it if missing."""
+    dialect_name = db.bind.dialect.name
+    if dialect_name in ("sqlite", "postgresql"):
+        if dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+        stmt = dialect_insert(TradeCallStat)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TradeCallStat.dimension, TradeCallStat.key],
+            set_={
+                **{name: getattr(TradeCallStat, name) + stmt.excluded[name] for name in COUNTERS},
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        await db.execute(stmt, rows)
+        return
+
+    # Other dialects: read-modify-write inside the caller's transaction
+    for row in rows:
+        stat = await db.get(TradeCallStat, (row["dimension"], row["key"]))
+        if stat is None:
+            db.add(TradeCallStat(**row))
+            continue
+        for name in COUNTERS:
+            setattr(stat, name, (getattr(stat, name) or 0) + row[name])
+        stat.updated_at = row["updated_at"]
+
+
+def _counters_payload(stat: Optional[TradeCallStat]) -> dict:
+    return {name: (getattr(stat, name) or 0) if stat is not None else 0 for name in COUNTERS}
+
+
+def _stats_payload(counters: dict[tuple[str, str], dict]) -> dict:
+    """Build the /stats payload from per-(dimension, key) counter dicts."""
+    empty = dict.fromkeys(COUNTERS, 0)
+    g = counters.get(("global", ""), empty)
+    sides = {side: dict(counters.get(("side", side), empty)) for side in ("LONG", "SHORT")}
+    # Anything not LONG counts as short, as in the raw aggregate
+    for (dim, key), c in counters.items():
+        if dim == "side" and key not in ("LONG", "SHORT"):
+            for name in COUNTERS:
+                sides["SHORT"][name] += c[name]
+
+    weekly = sorted(((key, c) for (dim, key), c in counters.items() if dim == "week" and c["finished"]))
+    total_resolved = g["finished"]
+
+    return {
+        "total_calls": g["total"],
+        "active_calls": g["active"],
+        "resolved_calls": g["resolved"],
+        "expired_calls": g["expired"],
+        "win_rate": _rate(g["wins"], total_resolved),
+        "tp0_rate": _rate(g["tp0_hits"], total_resolved),
+        "tp1_rate": _rate(g["tp1_hits"], total_resolved),
+        "tp2_rate": _rate(g["tp2_hits"], total_resolved),
+        "tp3_rate": _rate(g["tp3_hits"], total_resolved),
+        "sl_rate": _rate(g["sl_hits"], total_resolved),
+        "avg_profit_pct": round(g["profit_sum"] / g["profit_count"], 2) if g["profit_count"] else 0,
+        "long_win_rate": _rate(sides["LONG"]["wins"], sides["LONG"]["finished"]),
+        "short_win_rate": _rate(sides["SHORT"]["wins"], sides["SHORT"]["finished"]),
+        "long_total": sides["LONG"]["finished"],
+        "short_total": sides["SHORT"]["finished"],
+        "confidence_buckets": {
+            label: {
+                "win_rate": _rate(c["wins"], c["finished"]),
+                "total": c["finished"],
+            }
+            for label, c in ((label, counters.get(("confidence", label), empty)) for label, _, _ in CONFIDENCE_BUCKETS)
+        },
+        "weekly_win_rate": [
+            {"week": wk, "wins": c["wins"], "total": c["finished"], "win_rate": _rate(c["wins"], c["finished"])}
+            for wk, c in weekly
+        ],
+        "excursions": {
+            "tracked": g["excursion_count"],
+            "avg_mfe_pct": round(g["mfe_sum"] / g["excursion_count"], 2) if g["excursion_count"] else 0,
+            "avg_mae_pct": round(g["mae_sum"] / g["excursion_count"], 2) if g["excursion_count"] else 0,
+            **{
+                f"{name}_distribution": {
+                    label: {"win_rate": _rate(c["wins"], c["finished"]), "total": c["finished"]}
+                    for label, c in ((label, counters.get((name, label), empty)) for label, _, _ in EXCURSION_BUCKETS)
+                }
+                for name in ("mfe", "mae")
+            },
+        },
+    }
+
+
+def stats_from_states(states) -> dict:
+    """The /stats payload for an in-memory collection of call states (see ``stats_state``).
+
+    Same counters as summing ``_contribution`` over ``_stat_keys`` per state,
+    computed as columns so large batches (e.g. backtests) stay fast.
+    """
+    states = list(states)
+    n = len(states)
+
+    def column(field: str) -> list:
+        return [state[field] for state in states]
+
+    status = np.array(column("status"), dtype=object)
+    finished = np.isin(status, FINISHED_STATUSES)
+    hit = {field: np.array(column(field), dtype=bool) for field in ("tp0_hit", "tp1_hit", "tp2_hit", "tp3_hit", "sl_hit")}
+    profit = np.array([np.nan if value is None else value for value in column("profit_pct")], dtype=np.float64)
+    has_profit = finished & ~np.isnan(profit)
+    mfe = np.array([np.nan if state.get("mfe_pct") is None else state["mfe_pct"] for state in states], dtype=np.float64)
+    mae = np.array([np.nan if state.get("mae_pct") is None else state["mae_pct"] for state in states], dtype=np.float64)
+    tracked = finished & ~np.isnan(mfe) & ~np.isnan(mae)
+    values = {
+        "total": np.ones(n),
+        "active": status == "active",
+        "resolved": status == "resolved",
+        "expired": status == "expired",
+        "finished": finished,
+        "wins": finished & hit["tp1_hit"] & ~hit["sl_hit"],
+        "tp0_hits": finished & hit["tp0_hit"],
+        "tp1_hits": finished & hit["tp1_hit"],
+        "tp2_hits": finished & hit["tp2_hit"],
+        "tp3_hits": finished & hit["tp3_hit"],
+        "sl_hits": finished & hit["sl_hit"],
+        "profit_sum": np.where(has_profit, profit, 0.0),
+        "profit_count": has_profit,
+        "mfe_sum": np.where(tracked, mfe, 0.0),
+        "mae_sum": np.where(tracked, mae, 0.0),
+        "excursion_count": tracked,
+    }
+
+    dimensions = {
+        "global": [""] * n,
+        "symbol": column("symbol"),
+        "side": column("side"),
+        "confidence": [confidence_bucket(value) for value in column("confidence")],
+        "week": [value.strftime("%Y-W%W") if value is not None else None for value in column("created_at")],
+        "mfe": [excursion_bucket(value) if ok else None for value, ok in zip(mfe.tolist(), tracked.tolist())],
+        "mae": [excursion_bucket(value) if ok else None for value, ok in zip(mae.tolist(), tracked.tolist())],
+    }
+    counters: dict[tuple[str, str], dict] = {}
+    for dimension, keys in dimensions.items():
+        index: dict = {}
+        codes = np.array([index.setdefault(key, len(index)) for key in keys], dtype=np.intp)
+        sums = {
+            name: np.bincount(codes, weights=np.asarray(values[name], dtype=np.float64), minlength=len(index))
+            for name in COUNTERS
+        }
+        for key, code in index.items():
+            if key is None:
+                continue
+            counters[(dimension, key)] = {
+                name: float(sums[name][code]) if name in FLOAT_COUNTERS else int(sums[name][code]) for name in COUNTERS
+            }
+    return _stats_payload(counters)
+
+
+async def read_trade_stats(db: AsyncSession) -> dict:
+    """Build the /stats payload from trade_call_stats (falls back to a full aggregate if it is empty)."""
+    start_time = time.time()
+    logger.debug("[DB_OP] Starting read_trade_stats")
+
+    result = await db.execute(
+        select(TradeCallStat).where(
+            (TradeCallStat.dimension == "week")
+            | TradeCallStat.dimension.in_(("global", "side", "confidence", "mfe", "mae"))
+        )
+    )
+    counters = {(s.dimension, s.key): _counters_payload(s) for s in result.scalars().all()}
+
+    if ("global", "") not in counters:
+        logger.info("trade_call_stats is empty; computing stats from the call history")
+        return await compute_trade_stats(db)
+
+    stats = _stats_payload(counters)
+
+    logger.debug(f"[DB_OP] read_trade_stats completed in {time.time() - start_time:.4f}s")
+    return stats
+
+
+async def rebuild_trade_call_stats(db: AsyncSession) -> int:
+    """Recompute trade_call_stats from the call history; returns the number of aggregate rows written.
+
+    Covers archived calls too. Runs one grouped query per dimension and replaces the table contents in
+    a single transaction. Commits on success.
+    """
+    start_time = time.time()
+    logger.debug("[DB_OP] Starting rebuild_trade_call_stats")
+
+    finished = TradeCallHistory.status.in_(FINISHED_STATUSES)
+    tracked = and_(finished, _has_excursions())
+    counter_columns = [
+        func.count(TradeCallHistory.id).label("total"),
+        _count_if(TradeCallHistory.status == "active").label("active"),
+        _count_if(TradeCallHistory.status == "resolved").label("resolved"),
+        _count_if(TradeCallHistory.status == "expired").label("expired"),
+        _count_if(finished).label("finished"),
+        _count_if(and_(finished, _is_win())).label("wins"),
+        _count_if(and_(finished, TradeCallHistory.tp0_hit.is_(True))).label("tp0_hits"),
+        _count_if(and_(finished, TradeCallHistory.tp1_hit.is_(True))).label("tp1_hits"),
+        _count_if(and_(finished, TradeCallHistory.tp2_hit.is_(True))).label("tp2_hits"),
+        _count_if(and_(finished, TradeCallHistory.tp3_hit.is_(True))).label("tp3_hits"),
+        _count_if(and_(finished, TradeCallHistory.sl_hit.is_(True))).label("sl_hits"),
+        func.coalesce(func.sum(case((finished, TradeCallHistory.profit_pct))), 0.0).label("profit_sum"),
+        _count_if(and_(finished, TradeCallHistory.profit_pct.is_not(None))).label("profit_count"),
+        func.coalesce(func.sum(case((tracked, TradeCallHistory.mfe_pct))), 0.0).label("mfe_sum"),
+        func.coalesce(func.sum(case((tracked, TradeCallHistory.mae_pct))), 0.0).label("mae_sum"),
+        _count_if(tracked).label("excursion_count"),
+    ]
+    week_key = _week_key(db.bind.dialect.name)
+    dimensions = {
+        "global": literal(""),
+        "symbol": TradeCallHistory.symbol,
+        "side": TradeCallHistory.side,
+        "confidence": _bucket_case(TradeCallHistory.confidence, CONFIDENCE_BUCKETS),
+        # Dialects without a native week key group per day, folded into weeks below
+        "week": week_key if week_key is not None else func.date(TradeCallHistory.created_at),
+        "mfe": _bucket_case(TradeCallHistory.mfe_pct, EXCURSION_BUCKETS),
+        "mae": _bucket_case(TradeCallHistory.mae_pct, EXCURSION_BUCKETS),
+    }
+
+    totals: dict[tuple[str, str], dict] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    for dimension, key_expr in dimensions.items():
+        stmt = select(key_expr.label("key"), *counter_columns)
+        if dimension == "week":
+            stmt = stmt.where(TradeCallHistory.created_at.is_not(None))
+        elif dimension in ("mfe", "mae"):
+            stmt = stmt.where(tracked)
+        stmt = stmt.group_by(key_expr)
+        for cell in (await db.execute(stmt)).all():
+            key = cell.key
+            if dimension == "week" and week_key is None:
+                day = key if isinstance(key, (date, datetime)) else date.fromisoformat(str(key))
+                key = day.strftime("%Y-W%W")
+            row = totals[(dimension, key)]
+            for name, value in cell._asdict().items():
+                if name != "key":
+                    row[name] += value or 0
+
+    # Per symbol and creation day (leaderboard windows), keyed in Python from the day and symbol
+    day = func.date(TradeCallHistory.created_at)
+    stmt = (
+        select(day.label("day"), TradeCallHistory.symbol.label("symbol"), *counter_columns)
+        .where(TradeCallHistory.created_at.is_not(None))
+        .group_by(day, TradeCallHistory.symbol)
+    )
+    for cell in (await db.execute(stmt)).all():
+        values = cell._asdict()
+        created = values.pop("day")
+        created = created if isinstance(created, (date, datetime)) else date.fromisoformat(str(created))
+        totals[("symbol_day", symbol_day_key(created, values.pop("symbol")))] = {
+            name: value or 0 for name, value in values.items()
+        }
+
+    now = datetime.utcnow()
+    rows = [{"dimension": dim, "key": key, **counters, "updated_at": now} for (dim, key), counters in totals.items()]
+
+    await db.execute(delete(TradeCallStat))
+    if rows:
+        await db.execute(insert(TradeCallStat), rows)
+    await refresh_leaderboard(db)
+    await db.commit()
+    stats_cache.bump()
+
+    logger.info(f"Rebuilt trade_call_stats: {len(rows)} rows in {time.time() - start_time:.2f}s")
+    return len(rows)
+
+
+class TradeCallStatsCache:
+    """Per-process cache of serialized stats payloads: /stats itself, plus one entry per calibration config.
+
+    Writers call ``bump()`` after committing a change to trade calls; the next
+    read of each entry recomputes it. Entries also expire after
+    ``TRADE_CALL_STATS_CACHE_TTL_SECONDS`` so changes committed by other
+    processes show up within that window. At most ``max_entries`` keyed
+    entries are kept, oldest dropped first.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.version = 0
+        self.max_entries = max_entries
+        # key -> (version, cached_at, body, etag); key None is the /stats payload
+        self._entries: dict[Hashable, tuple[int, float, bytes, str]] = {}
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+
+    def bump(self) -> None:
+        self.version += 1
+
+    def fresh_etag(self, key: Hashable = None) -> Optional[str]:
+        """ETag of the cached payload if it is still valid, without touching the database."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        version, cached_at, _, etag = entry
+        if version == self.version and time.monotonic() - cached_at < settings.trade_call_stats_cache_ttl_seconds:
+            return etag
+        return None
+
+    async def get(
+        self,
+        db: AsyncSession,
+        key: Hashable = None,
+        compute: Optional[Callable[[AsyncSession], Awaitable[dict]]] = None,
+    ) -> tuple[bytes, str]:
+        """Return ``(json_body, etag)`` for ``key``, recomputing at most once per version across concurrent callers.
+
+        ``compute`` builds the payload (default: the /stats payload).
+        """
+        if self.fresh_etag(key) is None:
+            async with self._locks.setdefault(key, asyncio.Lock()):
+                if self.fresh_etag(key) is None:
+                    version = self.version
+                    body = json.dumps(await (compute or read_trade_stats)(db), separators=(",", ":")).encode()
+                    self._entries.pop(key, None)
+                    self._entries[key] = (version, time.monotonic(), body, f'"{hashlib.sha1(body).hexdigest()[:16]}"')
+                    while len(self._entries) > self.max_entries:
+                        oldest = next(iter(self._entries))
+                        del self._entries[oldest]
+                        self._locks.pop(oldest, None)
+        _, _, body, etag = self._entries[key]
+        return body, etag
+
+
+stats_cache = TradeCallStatsCache()
+
+
+async def initialize_trade_call_stats():
+    """Build trade_call_stats on first start if calls exist but aggregates (or the per-day rows) do not."""
+    if not db_manager.async_session_maker:
+        logger.warning("Database engine is not ready; skipping trade_call_stats initialization")
+        return
+    try:
+        async with db_manager.async_session_maker() as session:
+            has_stats = await session.get(TradeCallStat, ("global", ""))
+            has_days = (
+                await session.execute(select(TradeCallStat.key).where(TradeCallStat.dimension == "symbol_day").limit(1))
+            ).first()
+            has_calls = (await session.execute(select(TradeCallHistory.id).limit(1))).first()
+            if (has_stats is None or has_days is None) and has_calls is not None:
+                await rebuild_trade_call_stats(session)
+    except Exception as e:
+        logger.error(f"Failed to initialize trade_call_stats: {e}")
+
+
+async def _main() -> None:
+    parser = argparse.ArgumentParser(description="Trade call statistics maintenance")
+    parser.add_argument("command", choices=["rebuild"], help="rebuild: recompute trade_call_stats from the call history")
+    parser.parse_args()
+
+    await db_manager.init_db()
+    await db_manager.create_tables()
+    try:
+        async with db_manager.async_session_maker() as session:
+            count = await rebuild_trade_call_stats(session)
+        print(f"trade_call_stats rebuilt: {count} rows")
+    finally:
+        await db_manager.close_db()
+
+
+if __name__ == "__main__":
+    # Usage (from backend/): python -m services.trade_call_stats rebuild
+    asyncio.run(_main())
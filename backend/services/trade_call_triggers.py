@@ -0,0 +1,242 @@
+"""
+Trade call trigger index.
+Keeps the active calls' SL/TP levels sorted per symbol so a price tick only touches the calls whose levels it crossed.
+"""
+
+import logging
+import math
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterable, Optional
+
+from core.config import settings
+from core.database import db_manager
+from models.trade_call import TradeCall
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+TP_LEVELS = ("tp0", "tp1", "tp2", "tp3")
+
+# Columns needed to index a call
+TRIGGER_COLUMNS = (
+    "id",
+    "symbol",
+    "side",
+    "status",
+    "entry_price",
+    "stop_loss",
+    "tp0",
+    "tp1",
+    "tp2",
+    "tp3",
+    "tp0_hit",
+    "tp1_hit",
+    "tp2_hit",
+    "tp3_hit",
+    "sl_hit",
+    "mfe_pct",
+    "mae_pct",
+)
+
+
+class SymbolLevels:
+    """One symbol's pending levels as sorted ``(price, call_id, level)`` entries.
+
+    ``rising`` holds the levels a rising price reaches (LONG targets, SHORT
+    stops); ``falling`` holds the levels a falling price reaches (LONG stops,
+    SHORT targets).
+    """
+
+    __slots__ = ("rising", "falling")
+
+    def __init__(self):
+        self.rising: list[tuple] = []
+        self.falling: list[tuple] = []
+
+
+def _below(price: float) -> tuple:
+    """Sort key just before every entry at ``price``."""
+    return (price,)
+
+
+def _above(price: float) -> tuple:
+    """Sort key just after every entry at ``price``."""
+    return (price, math.inf)
+
+
+class TriggerIndex:
+    """In-memory index of the levels active calls have not hit yet.
+
+    Lookups bisect the sorted per-symbol lists, so they cost O(log n + k) for
+    k matching entries. Levels leave the index once hit, and calls leave it
+    once resolved or expired; ``add`` re-indexes a call after any change.
+
+    Each call also has an ``mfe`` and an ``mae`` level
+    ``trade_call_excursion_step_pct`` beyond its recorded excursions, so a
+    price that would extend them by at least that step triggers the call too.
+    """
+
+    def __init__(self):
+        self._symbols: dict[str, SymbolLevels] = {}
+        self._entries: dict[int, tuple[str, list[tuple[list, tuple]]]] = {}
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, call_id: int) -> bool:
+        return call_id in self._entries
+
+    def symbols(self) -> list[str]:
+        return list(self._symbols)
+
+    def call_ids(self) -> set[int]:
+        return set(self._entries)
+
+    def clear(self) -> None:
+        self._symbols = {}
+        self._entries = {}
+
+    def add(self, call_id: int, values) -> None:
+        """(Re-)index a call from a TradeCall, a row, or a mapping of its column values.
+
+        Calls that are no longer active are dropped instead.
+        """
+        if not self.ready:
+            return
+        self._insert(call_id, values)
+
+    def load(self, rows: Iterable) -> None:
+        """Index database rows (``id`` plus the trigger columns), even before the index is ready."""
+        for row in rows:
+            self._insert(row.id, row)
+
+    def discard(self, call_id: int) -> None:
+        found = self._entries.pop(call_id, None)
+        if found is None:
+            return
+        symbol, entries = found
+        for levels, entry in entries:
+            idx = bisect_left(levels, entry)
+            if idx < len(levels) and levels[idx] == entry:
+                del levels[idx]
+        book = self._symbols[symbol]
+        if not book.rising and not book.falling:
+            del self._symbols[symbol]
+
+    def _insert(self, call_id: int, values) -> None:
+        get = values.get if isinstance(values, dict) else lambda name: getattr(values, name)
+        self.discard(call_id)
+        if get("status") not in (None, "active"):
+            return
+
+        pending = [(level, get(level)) for level in TP_LEVELS if get(level) and not get(f"{level}_hit")]
+        if not get("sl_hit"):
+            pending.append(("sl", get("stop_loss")))
+        step = settings.trade_call_excursion_step_pct
+        if step > 0 and get("entry_price"):
+            direction = 1 if get("side") == "LONG" else -1
+            entry = get("entry_price")
+            pending.append(("mfe", entry * (1 + direction * ((get("mfe_pct") or 0.0) + step) / 100)))
+            pending.append(("mae", entry * (1 - direction * ((get("mae_pct") or 0.0) + step) / 100)))
+        if not pending:
+            return
+
+        symbol = get("symbol")
+        book = self._symbols.setdefault(symbol, SymbolLevels())
+        targets, stops = (book.rising, book.falling) if get("side") == "LONG" else (book.falling, book.rising)
+        entries = []
+        for level, price in pending:
+            levels = stops if level in ("sl", "mae") else targets
+            entry = (float(price), call_id, level)
+            insort(levels, entry)
+            entries.append((levels, entry))
+        self._entries[call_id] = (symbol, entries)
+
+    # ── Lookups ──────────────────────────────────────────────────────────────
+
+    def crossed(self, symbol: str, from_price: float, to_price: float) -> set[int]:
+        """Calls with a pending level the move ``from_price`` → ``to_price`` passed or landed on."""
+        book = self._symbols.get(symbol)
+        if book is None or from_price == to_price:
+            return set()
+        if to_price > from_price:
+            levels = book.rising
+            lo, hi = bisect_right(levels, _above(from_price)), bisect_right(levels, _above(to_price))
+        else:
+            levels = book.falling
+            lo, hi = bisect_left(levels, _below(to_price)), bisect_left(levels, _below(from_price))
+        return {entry[1] for entry in levels[lo:hi]}
+
+    def triggered(self, symbol: str, price: float) -> set[int]:
+        """Calls with a pending level at or beyond ``price``, wherever the price came from.
+
+        Because hit levels are removed, this equals :meth:`crossed` from the
+        last resolved price, plus calls recorded with a level already crossed.
+        """
+        book = self._symbols.get(symbol)
+        if book is None:
+            return set()
+        rising = book.rising[: bisect_right(book.rising, _above(price))]
+        falling = book.falling[bisect_left(book.falling, _below(price)) :]
+        return {entry[1] for entry in rising} | {entry[1] for entry in falling}
+
+    def triggered_many(self, prices: dict[str, float]) -> set[int]:
+        ids: set[int] = set()
+        for symbol, price in prices.items():
+            ids |= self.triggered(symbol, price)
+        return ids
+
+
+def _active_calls_stmt(ids: Optional[Iterable[int]] = None):
+    stmt = select(*(getattr(TradeCall, col) for col in TRIGGER_COLUMNS)).where(TradeCall.status == "active")
+    if ids is not None:
+        stmt = stmt.where(TradeCall.id.in_(list(ids)))
+    return stmt
+
+
+async def sync_trigger_index(db: AsyncSession, index: Optional[TriggerIndex] = None) -> None:
+    """Reconcile the index with the active calls in the database.
+
+    Only the active ids are read; rows are loaded just for calls the index has
+    not seen (e.g. recorded by another worker process), and calls that left
+    the active set elsewhere are dropped.
+    """
+    if index is None:
+        index = trade_call_triggers
+    active_ids = set((await db.execute(select(TradeCall.id).where(TradeCall.status == "active"))).scalars().all())
+    for call_id in index.call_ids() - active_ids:
+        index.discard(call_id)
+    missing = active_ids - index.call_ids()
+    if missing:
+        index.load((await db.execute(_active_calls_stmt(missing))).all())
+
+
+async def rebuild_trigger_index(db: AsyncSession, index: Optional[TriggerIndex] = None) -> int:
+    """Rebuild the index from scratch; returns the number of indexed calls."""
+    if index is None:
+        index = trade_call_triggers
+    index.clear()
+    index.load((await db.execute(_active_calls_stmt())).all())
+    index.ready = True
+    return len(index)
+
+
+async def initialize_trade_call_triggers():
+    """Build the trigger index from the database (called from the app lifespan)."""
+    if not settings.trade_call_trigger_index_enabled:
+        logger.info("Trade call trigger index disabled")
+        return
+    if not db_manager.async_session_maker:
+        logger.warning("Database engine is not ready; skipping trade call trigger index")
+        return
+    try:
+        async with db_manager.async_session_maker() as session:
+            count = await rebuild_trigger_index(session)
+        logger.info(f"[TradeCall] Trigger index built for {count} active calls")
+    except Exception as e:
+        logger.error(f"Failed to build trade call trigger index: {e}")
+
+
+trade_call_triggers = TriggerIndex()
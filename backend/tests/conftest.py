@@ -0,0 +1,48 @@
+"""Shared fixtures: the backend package on sys.path and a throwaway SQLite database per test."""
+
+import sys
+from pathlib import Path
+
+import httpx
+import pytest_asyncio
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+import models  # noqa: E402,F401  (registers every table on Base.metadata)
+from core.database import Base, get_db  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from routers.trade_calls import router  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    """An aiosqlite engine on a fresh file database with the full schema."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session_maker(engine):
+    """Session factory configured like ``db_manager.async_session_maker``."""
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+async def client(session_maker):
+    """An HTTP client for the trade-calls router, its ``get_db`` served from ``session_maker``."""
+
+    async def override_get_db():
+        async with session_maker() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = override_get_db
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
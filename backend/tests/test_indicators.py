@@ -0,0 +1,99 @@
+"""Streaming indicators against their vectorized batch counterparts, and enrichment past its timeout."""
+
+import asyncio
+
+import numpy as np
+import pytest
+from core.config import settings
+from services import indicators
+from services.indicators import ATR, EMA, MACD, RSI, atr, ema, enrich_trade_calls, macd, rsi
+
+# The block closed form in _recurse trades a few digits for speed; streaming must agree to this much
+RTOL = 1e-9
+ATOL = 1e-9
+
+
+def _series(n: int = 3000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    high = close * (1 + rng.uniform(0, 0.01, n))
+    low = close * (1 - rng.uniform(0, 0.01, n))
+    return high, low, close
+
+
+def _array(values) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def test_streaming_indicators_match_batch():
+    high, low, close = _series()
+    fast, slow = EMA(21), EMA(50)
+    streaming_rsi, streaming_atr, streaming_macd = RSI(), ATR(), MACD()
+    out = {name: [] for name in ("ema21", "ema50", "rsi", "atr", "macd", "signal", "histogram")}
+    for h, l, c in zip(high, low, close):
+        out["ema21"].append(fast.update(c))
+        out["ema50"].append(slow.update(c))
+        out["rsi"].append(streaming_rsi.update(c))
+        out["atr"].append(streaming_atr.update(h, l, c))
+        out["macd"].append(streaming_macd.update(c))
+        out["signal"].append(streaming_macd.signal)
+        out["histogram"].append(streaming_macd.histogram)
+
+    line, signal, histogram = macd(close)
+    expected = {
+        "ema21": ema(close, 21),
+        "ema50": ema(close, 50),
+        "rsi": rsi(close),
+        "atr": atr(high, low, close),
+        "macd": line,
+        "signal": signal,
+        "histogram": histogram,
+    }
+    for name, batch in expected.items():
+        # Same warm-up (NaN / None) positions, then the same values
+        np.testing.assert_allclose(_array(out[name]), batch, rtol=RTOL, atol=ATOL, err_msg=name)
+
+
+@pytest.mark.parametrize("split", [5, 30, 800])
+def test_warm_then_stream_matches_batch(split):
+    high, low, close = _series(800, seed=1)
+    state_rsi = RSI().warm(close[:split])
+    state_atr = ATR().warm(high[:split], low[:split], close[:split])
+    state_macd = MACD().warm(close[:split])
+    state_ema = EMA(50).warm(close[:split])
+    for h, l, c in zip(high[split:], low[split:], close[split:]):
+        state_rsi.update(c)
+        state_atr.update(h, l, c)
+        state_macd.update(c)
+        state_ema.update(c)
+
+    line, signal, _ = macd(close)
+    np.testing.assert_allclose(state_rsi.value, rsi(close)[-1], rtol=RTOL)
+    np.testing.assert_allclose(state_atr.value, atr(high, low, close)[-1], rtol=RTOL)
+    np.testing.assert_allclose(state_ema.value, ema(close, 50)[-1], rtol=RTOL)
+    np.testing.assert_allclose(state_macd.line, line[-1], rtol=RTOL, atol=ATOL)
+    np.testing.assert_allclose(state_macd.signal, signal[-1], rtol=RTOL, atol=ATOL)
+
+
+@pytest.mark.asyncio
+async def test_timed_out_load_keeps_running_in_the_background(monkeypatch):
+    finished = asyncio.Event()
+
+    async def slow_snapshots(symbols, interval):
+        list(symbols)
+        await asyncio.sleep(0.2)
+        finished.set()
+        return {}
+
+    monkeypatch.setattr(settings, "trade_call_indicator_enrichment_enabled", True)
+    monkeypatch.setattr(settings, "trade_call_indicator_timeout_seconds", 0.01)
+    monkeypatch.setattr(indicators.indicator_engine, "snapshots", slow_snapshots)
+
+    rows = [{"symbol": "BTCUSDT", "side": "LONG", "rsi4h": None, "has_convergence": None}]
+    await enrich_trade_calls(rows)
+    assert rows[0]["rsi4h"] is None and rows[0]["has_convergence"] is False
+    # Held strongly until done, then released
+    assert len(indicators._background) == 1
+    await asyncio.wait_for(finished.wait(), 1)
+    await asyncio.sleep(0)
+    assert not indicators._background
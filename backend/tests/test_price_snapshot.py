@@ -0,0 +1,102 @@
+"""The REST price source's bulk → batch → per-symbol fallback against a local stand-in exchange, and the shared cache."""
+
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+import uvicorn
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+from services import price_snapshot
+from services.price_snapshot import BinancePriceSource, PriceSnapshotService
+from services.price_stream import PriceBook
+
+PRICES = {"AUSDT": 1.5, "BUSDT": 2.5, "CUSDT": 3.5, "DUSDT": 4.5}
+
+
+class StandInExchange:
+    """Speaks /api/v3/ticker/price like Binance, except that the bulk (all-symbols) request always fails."""
+
+    def __init__(self):
+        self.requests: list[str] = []
+        self.app = FastAPI()
+        self.app.get("/api/v3/ticker/price")(self.ticker)
+        self.server = None
+        self.port = 0
+
+    async def ticker(self, symbol: str | None = Query(None), symbols: str | None = Query(None)):
+        if symbol is not None:
+            self.requests.append(f"symbol:{symbol}")
+            if symbol not in PRICES:
+                return JSONResponse({"code": -1121, "msg": "Invalid symbol."}, status_code=400)
+            return {"symbol": symbol, "price": str(PRICES[symbol])}
+        if symbols is not None:
+            batch = json.loads(symbols)
+            self.requests.append(f"batch:{','.join(batch)}")
+            if any(name not in PRICES for name in batch):
+                return JSONResponse({"code": -1121, "msg": "Invalid symbol."}, status_code=400)
+            return [{"symbol": name, "price": str(PRICES[name])} for name in batch]
+        self.requests.append("bulk")
+        return JSONResponse({"code": -1003, "msg": "Too much request weight used."}, status_code=503)
+
+    async def start(self) -> None:
+        self.server = uvicorn.Server(uvicorn.Config(self.app, host="127.0.0.1", port=0, log_level="warning"))
+        self._task = asyncio.create_task(self.server.serve())
+        while not self.server.started:
+            await asyncio.sleep(0.01)
+        self.port = self.server.servers[0].sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.should_exit = True
+        await self._task
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+
+@pytest_asyncio.fixture
+async def exchange(monkeypatch):
+    # Nothing streamed: every symbol goes to the REST source
+    monkeypatch.setattr(price_snapshot, "price_book", PriceBook())
+    exchange = StandInExchange()
+    await exchange.start()
+    yield exchange
+    await exchange.stop()
+
+
+@pytest.mark.asyncio
+async def test_bulk_failure_falls_back_to_batches_then_single_symbols(exchange):
+    source = BinancePriceSource(exchange.url, timeout=5, batch_size=2, max_concurrency=4)
+
+    prices = await source.fetch_prices(["AUSDT", "BUSDT", "CUSDT", "NOPEUSDT", "DUSDT"])
+
+    assert prices == PRICES
+    requests = exchange.requests
+    assert requests[0] == "bulk"
+    assert sorted(requests[1:4]) == ["batch:AUSDT,BUSDT", "batch:CUSDT,NOPEUSDT", "batch:DUSDT"]
+    # Only the rejected batch is retried symbol by symbol
+    assert sorted(requests[4:]) == ["symbol:CUSDT", "symbol:NOPEUSDT"]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_shared_until_it_expires(exchange):
+    service = PriceSnapshotService(BinancePriceSource(exchange.url, timeout=5, batch_size=10), ttl_seconds=60)
+
+    # Concurrent callers share one fetch
+    first, second = await asyncio.gather(
+        service.get_prices(["AUSDT", "BUSDT"]), service.get_prices(["AUSDT", "BUSDT"])
+    )
+    assert first == second == {"AUSDT": 1.5, "BUSDT": 2.5}
+    fetched = len(exchange.requests)
+    assert exchange.requests == ["bulk", "batch:AUSDT,BUSDT"]
+
+    # A later caller within the TTL is served from the snapshot
+    assert await service.get_prices(["BUSDT"]) == {"BUSDT": 2.5}
+    assert len(exchange.requests) == fetched
+
+    # Once expired, the next caller refetches
+    service.ttl_seconds = 0
+    assert await service.get_prices(["BUSDT"]) == {"BUSDT": 2.5}
+    assert len(exchange.requests) > fetched
@@ -0,0 +1,107 @@
+"""The price stream against a local websocket server standing in for the exchange's ticker feed."""
+
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+
+import pytest
+from services import price_snapshot
+from services.price_snapshot import PriceSnapshotService, PriceSource
+from services.price_stream import PriceBook, PriceStreamConsumer
+from websockets.asyncio.server import serve
+
+
+class TickerServer:
+    """Sends one all-market miniTicker frame per connection, then holds the connection open."""
+
+    def __init__(self):
+        self.prices = {"BTCUSDT": 65000.0, "ETHUSDT": 3200.0}
+        self.connections = 0
+        self.port = 0
+        self._server = None
+
+    async def _handler(self, ws):
+        self.connections += 1
+        frame = [{"e": "24hrMiniTicker", "s": symbol, "c": str(price)} for symbol, price in self.prices.items()]
+        await ws.send(json.dumps(frame))
+        await ws.wait_closed()
+
+    async def start(self) -> None:
+        self._server = await serve(self._handler, "127.0.0.1", self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def drop(self) -> None:
+        """Close every connection and stop listening, like an exchange outage."""
+        self._server.close()
+        await self._server.wait_closed()
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}"
+
+
+class CountingRestSource(PriceSource):
+    """REST fallback that records every request."""
+
+    def __init__(self, prices: dict[str, float]):
+        self.prices = prices
+        self.requests: list[list[str]] = []
+
+    async def fetch_prices(self, symbols):
+        self.requests.append(list(symbols))
+        return {symbol: self.prices[symbol] for symbol in symbols if symbol in self.prices}
+
+
+async def _until(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.02)
+
+
+@pytest.mark.asyncio
+async def test_stream_updates_snapshot_reconnects_and_falls_back_to_rest(monkeypatch, caplog):
+    caplog.set_level(logging.INFO, logger="services.price_stream")
+    monkeypatch.setattr(random, "uniform", lambda low, high: 1.0)  # no jitter, so the backoff steps are exact
+
+    server = TickerServer()
+    await server.start()
+    book = PriceBook(stale_seconds=0.5)
+    monkeypatch.setattr(price_snapshot, "price_book", book)
+    rest = CountingRestSource({"BTCUSDT": 64000.0, "ETHUSDT": 3100.0})
+    snapshot = PriceSnapshotService(rest, ttl_seconds=0)
+    consumer = PriceStreamConsumer(book, server.url, reconnect_max_seconds=1.5)
+    consumer.start()
+    try:
+        # Streamed ticks reach the book and are served without touching REST
+        await _until(lambda: len(book) == 2)
+        assert consumer.connected
+        assert await snapshot.get_prices(["BTCUSDT", "ETHUSDT"]) == {"BTCUSDT": 65000.0, "ETHUSDT": 3200.0}
+        assert rest.requests == []
+
+        # Exchange goes away: the client retries with a growing, capped delay
+        await server.drop()
+        await _until(lambda: consumer.reconnects >= 2)
+        assert not consumer.connected
+        delays = [float(d) for d in re.findall(r"Reconnecting in ([\d.]+)s", caplog.text)]
+        assert delays[:2] == [1.0, 1.5]
+
+        # Meanwhile the streamed prices went stale, so readers fall back to REST
+        assert not book.fresh_prices(["BTCUSDT"])
+        assert await snapshot.get_prices(["BTCUSDT"]) == {"BTCUSDT": 64000.0}
+        assert rest.requests == [["BTCUSDT"]]
+
+        # Exchange comes back on the same address: the client reconnects and the stream takes over again
+        server.prices["BTCUSDT"] = 66000.0
+        await server.start()
+        await _until(lambda: server.connections == 2 and book.fresh_prices(["BTCUSDT"]) == {"BTCUSDT": 66000.0})
+        assert consumer.connected
+        assert await snapshot.get_prices(["BTCUSDT"]) == {"BTCUSDT": 66000.0}
+        assert len(rest.requests) == 1
+    finally:
+        await consumer.stop()
+        await server.drop()
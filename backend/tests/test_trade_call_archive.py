@@ -0,0 +1,59 @@
+"""Archival of finished calls into trade_calls_archive."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from models.trade_call import TradeCall
+from models.trade_call_archive import TradeCallArchive
+from services.trade_call_archive import archive_finished_calls
+from services.trade_call_recorder import new_call_values
+from sqlalchemy import func, insert, select
+
+
+async def _seed_finished(session_maker, count: int = 20) -> None:
+    now = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        item = {
+            "symbol": "BTCUSDT",
+            "side": "LONG",
+            "entry_price": 100.0,
+            "stop_loss": 90.0,
+            "tp1": 110.0,
+            "tp2": 120.0,
+            "tp3": 130.0,
+            "confidence": 70,
+        }
+        row = new_call_values(item, now - timedelta(days=400 - i))
+        row["status"] = "expired"
+        rows.append(row)
+    async with session_maker() as session:
+        await session.execute(insert(TradeCall), rows)
+        await session.commit()
+
+
+async def _counts(session_maker) -> tuple[int, int]:
+    async with session_maker() as session:
+        hot = (await session.execute(select(func.count(TradeCall.id)))).scalar()
+        archived = (await session.execute(select(func.count(TradeCallArchive.id)))).scalar()
+    return hot, archived
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("retention_days", [0, -1])
+async def test_zero_retention_archives_nothing(session_maker, retention_days):
+    await _seed_finished(session_maker)
+    async with session_maker() as session:
+        result = await archive_finished_calls(session, retention_days, batch_size=5)
+    assert result == {"archived": 0, "batches": 0, "disabled": True}
+    assert await _counts(session_maker) == (20, 0)
+
+
+@pytest.mark.asyncio
+async def test_old_finished_calls_move_in_batches(session_maker):
+    await _seed_finished(session_maker)
+    async with session_maker() as session:
+        result = await archive_finished_calls(session, 30, batch_size=5)
+    # The newest call always stays hot
+    assert result["archived"] == 19 and result["batches"] == 4
+    assert await _counts(session_maker) == (1, 19)
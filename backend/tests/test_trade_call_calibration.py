@@ -0,0 +1,24 @@
+"""Validation of the explicit bin edges of GET /api/v1/trade-calls/calibration."""
+
+import pytest
+from services.trade_call_stats import stats_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    # Payloads cached by an earlier test's database must not be served here
+    stats_cache.bump()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("edges", ["50,x", "0,50", "50,100", "-5", "65,50", "50,50,80"])
+async def test_invalid_edges_are_rejected(client, edges):
+    response = await client.get("/api/v1/trade-calls/calibration", params={"edges": edges})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_valid_edges_split_the_bins(client):
+    response = await client.get("/api/v1/trade-calls/calibration", params={"edges": "1,50,99"})
+    assert response.status_code == 200
+    assert [cell["bin"] for cell in response.json()["bins"]] == ["0-1%", "1-50%", "50-99%", "99-100%"]
@@ -0,0 +1,80 @@
+"""Keyset pagination of GET /api/v1/trade-calls over the hot table and the archive."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from models.trade_call import TradeCall
+from models.trade_call_archive import TradeCallArchive
+from services.trade_call_archive import archive_finished_calls
+from services.trade_call_recorder import new_call_values
+from sqlalchemy import insert, select
+
+
+async def _seed(session_maker) -> None:
+    """30 calls sharing 10 timestamps, about half finished; the finished ones older than 5 days are archived."""
+    rnd = random.Random(8)
+    now = datetime.utcnow()
+    rows = []
+    for i in range(30):
+        item = {
+            "symbol": rnd.choice(["AUSDT", "BUSDT"]),
+            "side": "LONG",
+            "entry_price": 100.0,
+            "stop_loss": 90.0,
+            "tp1": 110.0,
+            "tp2": 120.0,
+            "tp3": 130.0,
+            "confidence": 70,
+        }
+        # Ids are handed out in shuffled time order, so the id decides each tie
+        row = new_call_values(item, now - timedelta(days=rnd.choice(range(0, 100, 10))))
+        if rnd.random() < 0.5:
+            row["status"] = "expired"
+        rows.append(row)
+    async with session_maker() as session:
+        await session.execute(insert(TradeCall), rows)
+        await session.commit()
+        assert (await archive_finished_calls(session, 5, batch_size=4))["archived"] > 0
+
+
+async def _all_ids(session_maker, status=None) -> list[int]:
+    """Every call id across both tables, newest first."""
+    rows = []
+    async with session_maker() as session:
+        for model in (TradeCall, TradeCallArchive):
+            stmt = select(model.created_at, model.id)
+            if status:
+                stmt = stmt.where(model.status == status)
+            rows.extend((await session.execute(stmt)).all())
+    return [call_id for _, call_id in sorted(rows, reverse=True)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [4, 5, 7])
+@pytest.mark.parametrize("status", [None, "expired"])
+async def test_cursor_pages_cover_both_tables_without_gaps_or_duplicates(session_maker, client, limit, status):
+    await _seed(session_maker)
+    expected = await _all_ids(session_maker, status)
+    async with session_maker() as session:
+        hot = set((await session.execute(select(TradeCall.id))).scalars())
+        archived = set((await session.execute(select(TradeCallArchive.id))).scalars())
+    assert hot & set(expected) and archived & set(expected)
+
+    seen, params = [], {"limit": limit}
+    if status:
+        params["status"] = status
+    while True:
+        response = await client.get("/api/v1/trade-calls", params=params)
+        assert response.status_code == 200
+        page = [call["id"] for call in response.json()]
+        seen.extend(page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            # Only a short page ends the listing
+            assert len(page) < limit
+            break
+        assert len(page) == limit
+        params["cursor"] = cursor
+
+    assert seen == expected
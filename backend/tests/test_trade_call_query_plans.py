@@ -0,0 +1,146 @@
+"""SQLite query plans of the hot trade_calls queries: each must be served by its index, never a full table scan.
+
+The statements are captured from the real code paths (recording, listing, resolving, expiring) and replayed under
+EXPLAIN QUERY PLAN against a database shaped like production: mostly finished calls, a small active set, ANALYZEd.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from core.config import settings
+from fastapi import Response
+from models.trade_call import TradeCall
+from routers.trade_calls import _encode_cursor, list_trade_calls
+from services import trade_call_resolver
+from services.price_snapshot import PriceSnapshotService, PriceSource
+from services.trade_call_recorder import new_call_values, record_trade_calls
+from sqlalchemy import event, insert
+
+SYMBOLS = [f"S{i}USDT" for i in range(50)]
+
+
+class FlatPrices(PriceSource):
+    """Every symbol at its entry price, so the resolver touches nothing but still runs its queries."""
+
+    async def fetch_prices(self, symbols):
+        return {symbol: 100.0 for symbol in symbols}
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    monkeypatch.setattr(settings, "trade_call_indicator_enrichment_enabled", False)
+    monkeypatch.setattr(settings, "trade_call_resolution_mode", "snapshot")
+    monkeypatch.setattr(trade_call_resolver, "price_snapshot_service", PriceSnapshotService(FlatPrices(), 0))
+
+
+async def _seed(engine, session_maker, count: int = 5000, active: int = 100) -> None:
+    rnd = random.Random(0)
+    now = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        item = {
+            "symbol": rnd.choice(SYMBOLS),
+            "side": rnd.choice(["LONG", "SHORT"]),
+            "entry_price": 100.0,
+            "stop_loss": 90.0,
+            "tp1": 110.0,
+            "tp2": 120.0,
+            "tp3": 130.0,
+            "confidence": rnd.randint(30, 95),
+            "has_convergence": False,
+        }
+        row = new_call_values(item, now - timedelta(hours=count - i))
+        if i < count - active:
+            row["status"] = rnd.choice(["resolved", "expired"])
+        rows.append(row)
+    async with session_maker() as session:
+        await session.execute(insert(TradeCall), rows)
+        await session.commit()
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("ANALYZE")
+
+
+async def _capture(engine, session_maker) -> list[tuple[str, tuple]]:
+    """Run the hot paths and return every single-row statement they sent that touches trade_calls."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and "trade_calls" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with session_maker() as session:
+            new_call = {
+                "symbol": "S1USDT",
+                "side": "LONG",
+                "entry_price": 100.0,
+                "stop_loss": 90.0,
+                "tp1": 110.0,
+                "tp2": 120.0,
+                "tp3": 130.0,
+                "confidence": 70,
+            }
+            await record_trade_calls(session, [new_call])
+            page = await list_trade_calls(Response(), status=None, limit=20, offset=40, cursor=None, db=session)
+            await list_trade_calls(Response(), status="resolved", limit=20, offset=0, cursor=None, db=session)
+            await list_trade_calls(Response(), status="active", limit=20, offset=0, cursor=None, db=session)
+            cursor = _encode_cursor(page[-1])
+            await list_trade_calls(Response(), status=None, limit=20, offset=0, cursor=cursor, db=session)
+            await trade_call_resolver.resolve_active_calls(session)
+            await trade_call_resolver.expire_overdue_calls(session)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+    return statements
+
+
+async def _plan(engine, statement: str, parameters) -> list[str]:
+    async with engine.connect() as conn:
+        rows = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)).all()
+    return [row[-1] for row in rows]
+
+
+def _full_scans(plan: list[str]) -> list[str]:
+    """Plan steps reading a whole table in rowid order (index-ordered scans say "USING ... INDEX")."""
+    return [step for step in plan if step.startswith("SCAN ") and "INDEX" not in step]
+
+
+def _find(statements, *fragments: str) -> tuple[str, tuple]:
+    matches = [(sql, params) for sql, params in statements if all(fragment in sql for fragment in fragments)]
+    assert matches, f"no captured statement contains {fragments}"
+    return matches[0]
+
+
+@pytest.mark.asyncio
+async def test_hot_queries_use_their_indexes(engine, session_maker):
+    await _seed(engine, session_maker)
+    statements = await _capture(engine, session_maker)
+
+    expected = {
+        # record_trade_calls: 4h symbol+side dedup
+        "dedup": (("GROUP BY trade_calls.symbol, trade_calls.side",), "ix_trade_calls_symbol_side_created_at"),
+        # list_trade_calls offset page over both tables
+        "list": (("trade_call_history", "OFFSET"), "ix_trade_calls_created_at_id"),
+        "list by status": (("trade_call_history", "trade_call_history.status = ?"), "ix_trade_calls_status_created_at"),
+        "list active": (("FROM trade_calls", "trade_calls.status = ?", "ORDER BY"), "ix_trade_calls_status_created_at"),
+        "list cursor": (
+            ("FROM trade_calls", "(trade_calls.created_at, trade_calls.id) <"),
+            "ix_trade_calls_created_at_id",
+        ),
+        # resolve_active_calls: the live active set
+        "resolver active": (("trade_calls.expires_at IS NULL OR",), "ix_trade_calls_status_created_at"),
+        # expire_overdue_calls: the partial index over active calls only
+        "expiry": (
+            ("UPDATE trade_calls SET status=?", "trade_calls.expires_at <= ?"),
+            "ix_trade_calls_active_expires_at",
+        ),
+    }
+    for name, (fragments, index) in expected.items():
+        plan = await _plan(engine, *_find(statements, *fragments))
+        assert any(index in step for step in plan), f"{name}: {index} not used in {plan}"
+
+    for statement, parameters in statements:
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            plan = await _plan(engine, statement, parameters)
+            assert not _full_scans(plan), f"full scan in {statement!r}: {plan}"
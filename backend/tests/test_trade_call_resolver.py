@@ -0,0 +1,169 @@
+"""Vectorized resolution: snapshot hits, candle replay order, and the claim that guards the bulk UPDATE."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from core.config import settings
+from models.trade_call import TradeCall
+from services import trade_call_resolver
+from services.candles import INTERVAL_MS, CandleSeries
+from services.price_snapshot import PriceSnapshotService, PriceSource
+from services.trade_call_recorder import new_call_values
+from services.trade_call_resolver import (
+    ActiveCallArrays,
+    CallState,
+    _resolve_from_candles,
+    _to_ms,
+    first_crossings,
+    snapshot_hits,
+)
+from services.trade_call_stats import compute_trade_stats, read_trade_stats, rebuild_trade_call_stats
+from sqlalchemy import insert, select, update
+
+
+def _call(side: str, **values) -> CallState:
+    sign = 1 if side == "LONG" else -1
+    now = datetime(2026, 10, 1)
+    item = {
+        "symbol": "BTCUSDT",
+        "side": side,
+        "entry_price": 100.0,
+        "stop_loss": 100.0 - sign * 5,
+        "tp0": 100.0 + sign * 1,
+        "tp1": 100.0 + sign * 2,
+        "tp2": 100.0 + sign * 4,
+        "tp3": 100.0 + sign * 6,
+        "confidence": 70,
+    }
+    empty = {"id": 1, "hit_order": None, "exit_price": None, "profit_pct": None, "resolved_at": None}
+    return CallState(**{**empty, "last_checked_at": None, **new_call_values(item, now), **values})
+
+
+@pytest.mark.parametrize(
+    "side, price, stopped, crossed",
+    [
+        ("LONG", 102.5, False, [True, True, False, False]),
+        ("LONG", 106.0, False, [True, True, True, True]),
+        ("LONG", 95.0, True, [False, False, False, False]),
+        ("LONG", 100.5, False, [False, False, False, False]),
+        ("SHORT", 97.5, False, [True, True, False, False]),
+        ("SHORT", 94.0, False, [True, True, True, True]),
+        ("SHORT", 105.0, True, [False, False, False, False]),
+        ("LONG", np.nan, False, [False, False, False, False]),
+    ],
+)
+def test_snapshot_hits(side, price, stopped, crossed):
+    calls = ActiveCallArrays([_call(side)])
+    got_stopped, got_crossed = snapshot_hits(calls, np.array([price]))
+    assert got_stopped.tolist() == [stopped]
+    assert got_crossed.tolist() == [crossed]
+
+
+def test_snapshot_hits_tp1_implies_tp0_and_missing_tp0_never_crosses():
+    calls = ActiveCallArrays([_call("LONG", tp0=101.0), _call("LONG", tp0=None)])
+    # Past TP1 both columns are crossed, even without a TP0; between TP0 and TP1 only a real TP0 is
+    _, crossed = snapshot_hits(calls, np.array([102.0, 102.0]))
+    assert crossed[:, :2].tolist() == [[True, True], [True, True]]
+    _, crossed = snapshot_hits(calls, np.array([101.5, 101.5]))
+    assert crossed[:, :2].tolist() == [[True, False], [False, False]]
+
+
+def _candles(rows: list[tuple[float, float]], start: datetime) -> CandleSeries:
+    step = INTERVAL_MS[settings.trade_call_candle_interval]
+    start_ms = _to_ms(start) // step * step
+    open_time = [start_ms + i * step for i in range(len(rows))]
+    highs = [high for high, _ in rows]
+    lows = [low for _, low in rows]
+    return CandleSeries(open_time, highs, highs, lows, lows, [1.0] * len(rows))
+
+
+@pytest.mark.parametrize("side", ["LONG", "SHORT"])
+def test_first_crossings(side):
+    sign = 1 if side == "LONG" else -1
+    call = _call(side)
+    # candle 0: nothing; 1: TP0 + TP1; 2: TP2; 3: stop
+    bars = [(100.5, 99.5), (100 + sign * 2.2,) * 2, (100 + sign * 4.5,) * 2, (100 - sign * 6,) * 2]
+    highs = np.array([max(bar) for bar in bars])
+    lows = np.array([min(bar) for bar in bars])
+    assert first_crossings(call, highs, lows) == {"tp0": 1, "tp1": 1, "tp2": 2, "tp3": -1, "sl": 3}
+
+
+@pytest.mark.parametrize("side", ["LONG", "SHORT"])
+def test_candle_touching_target_and_stop_counts_the_stop_first(side):
+    sign = 1 if side == "LONG" else -1
+    call = _call(side)
+    # One wide candle crosses TP1 and the stop: only the stop counts
+    rows = [(100.2, 99.8), (max(100 + sign * 3, 100 - sign * 6), min(100 + sign * 3, 100 - sign * 6))]
+    candles = {"BTCUSDT": _candles(rows, call.created_at)}
+    now = call.created_at + timedelta(hours=2)
+    assert _resolve_from_candles([call], candles, set(), now) == 1
+    assert call.hit_order == "sl"
+    assert not call.tp0_hit and not call.tp1_hit and call.sl_hit
+    assert call.status == "resolved" and call.exit_price == call.stop_loss
+
+
+@pytest.mark.parametrize("side", ["LONG", "SHORT"])
+def test_candle_replay_records_hits_in_order(side):
+    sign = 1 if side == "LONG" else -1
+    call = _call(side)
+    rows = [(100.2, 99.8), (100 + sign * 2.5, 100 + sign * 2.5), (100 - sign * 6, 100 - sign * 6)]
+    candles = {"BTCUSDT": _candles(rows, call.created_at)}
+    assert _resolve_from_candles([call], candles, set(), call.created_at + timedelta(hours=3)) == 1
+    assert call.hit_order == "tp0,tp1,sl"
+    assert call.tp1_hit_at < call.sl_hit_at
+    assert call.profit_pct == -5.0
+
+
+@pytest.mark.asyncio
+async def test_rows_changed_by_another_pass_are_skipped(engine, session_maker, monkeypatch):
+    monkeypatch.setattr(settings, "trade_call_indicator_enrichment_enabled", False)
+    monkeypatch.setattr(settings, "trade_call_resolution_mode", "snapshot")
+    now = datetime.utcnow()
+    item = {
+        "side": "LONG",
+        "entry_price": 100.0,
+        "stop_loss": 90.0,
+        "tp1": 110.0,
+        "tp2": 120.0,
+        "tp3": 130.0,
+        "confidence": 70,
+        "has_convergence": False,
+    }
+    async with session_maker() as session:
+        await session.execute(
+            insert(TradeCall), [new_call_values({**item, "symbol": symbol}, now) for symbol in ("AUSDT", "BUSDT")]
+        )
+        await session.commit()
+        await rebuild_trade_call_stats(session)
+
+    class RacingPrices(PriceSource):
+        """Expires AUSDT from another session after the resolver loaded it, then quotes both at the stop."""
+
+        async def fetch_prices(self, symbols):
+            async with session_maker() as other:
+                await other.execute(
+                    update(TradeCall).where(TradeCall.symbol == "AUSDT").values(status="expired", resolved_at=now)
+                )
+                await other.commit()
+                await rebuild_trade_call_stats(other)
+            return {"AUSDT": 80.0, "BUSDT": 80.0}
+
+    indexed, published = [], []
+    monkeypatch.setattr(trade_call_resolver, "price_snapshot_service", PriceSnapshotService(RacingPrices(), 0))
+    monkeypatch.setattr(trade_call_resolver.trade_call_triggers, "add", lambda call_id, values: indexed.append(call_id))
+    monkeypatch.setattr(
+        trade_call_resolver.trade_call_events,
+        "publish_changes",
+        lambda call, before: published.append(call.symbol),
+    )
+
+    async with session_maker() as session:
+        assert await trade_call_resolver.resolve_active_calls(session) == {"resolved": 1, "checked": 2}
+        statuses = dict((await session.execute(select(TradeCall.symbol, TradeCall.status))).all())
+        assert statuses == {"AUSDT": "expired", "BUSDT": "resolved"}
+        a_id = (await session.execute(select(TradeCall.id).where(TradeCall.symbol == "AUSDT"))).scalar()
+        assert a_id not in indexed and len(indexed) == 1
+        assert published == ["BUSDT"]
+        # The stats saw AUSDT expire once (from the other writer) and never as stopped out
+        assert await read_trade_stats(session) == await compute_trade_stats(session)
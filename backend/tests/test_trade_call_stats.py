@@ -0,0 +1,150 @@
+"""The incrementally maintained trade_call_stats rollup must always equal a full rebuild from the call history."""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from core.config import settings
+from models.trade_call import TradeCall
+from models.trade_call_leaderboard import TradeCallLeaderboard
+from models.trade_call_stats import TradeCallStat
+from services import trade_call_resolver
+from services.price_snapshot import PriceSnapshotService, PriceSource
+from services.trade_call_archive import archive_finished_calls
+from services.trade_call_recorder import new_call_values, record_trade_calls
+from services.trade_call_stats import COUNTERS, read_trade_stats, rebuild_trade_call_stats
+from sqlalchemy import insert, select, update
+
+SYMBOLS = ["AUSDT", "BUSDT", "CUSDT", "DUSDT", "EUSDT", "FUSDT"]
+
+
+class StubPrices(PriceSource):
+    def __init__(self, prices: dict[str, float]):
+        self.prices = prices
+
+    async def fetch_prices(self, symbols):
+        return {symbol: self.prices[symbol] for symbol in symbols if symbol in self.prices}
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    monkeypatch.setattr(settings, "trade_call_indicator_enrichment_enabled", False)
+    monkeypatch.setattr(settings, "trade_call_resolution_mode", "snapshot")
+
+
+def _item(symbol: str, side: str, rnd: random.Random) -> dict:
+    sign = 1 if side == "LONG" else -1
+    return {
+        "symbol": symbol,
+        "side": side,
+        "entry_price": 100.0,
+        "stop_loss": 100.0 - sign * 5,
+        "tp0": 100.0 + sign * 1,
+        "tp1": 100.0 + sign * 2,
+        "tp2": 100.0 + sign * 4,
+        "tp3": 100.0 + sign * 6,
+        "confidence": rnd.randint(30, 95),
+    }
+
+
+async def _seed_history(session_maker, rnd: random.Random) -> None:
+    """Finished calls from 10-120 days ago (some past the archive cutoff), with profits and excursions."""
+    now = datetime.utcnow()
+    rows = []
+    for i in range(60):
+        row = new_call_values(_item(rnd.choice(SYMBOLS), rnd.choice(["LONG", "SHORT"]), rnd), now)
+        created_at = now - timedelta(days=rnd.uniform(10, 120))
+        won = rnd.random() < 0.5
+        status = rnd.choice(["resolved", "expired"])
+        row.update(
+            created_at=created_at,
+            expires_at=created_at + timedelta(hours=72),
+            status=status,
+            tp0_hit=won,
+            tp1_hit=won,
+            tp3_hit=won and status == "resolved" and rnd.random() < 0.5,
+            sl_hit=not won and status == "resolved",
+            profit_pct=round(rnd.uniform(-5, 6), 2) if status == "resolved" else None,
+            resolved_at=created_at + timedelta(hours=10),
+            mfe_pct=round(rnd.uniform(0, 8), 2),
+            mae_pct=round(rnd.uniform(0, 8), 2),
+        )
+        rows.append(row)
+    async with session_maker() as session:
+        await session.execute(insert(TradeCall), rows)
+        await session.commit()
+        await rebuild_trade_call_stats(session)
+
+
+def _rounded(value):
+    if isinstance(value, float):
+        return round(value, 6)
+    if isinstance(value, dict):
+        return {key: _rounded(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_rounded(item) for item in value]
+    return value
+
+
+async def _snapshot(session_maker) -> tuple[dict, dict, dict]:
+    """(/stats payload, every non-empty rollup row, every leaderboard row without its timestamp)."""
+    async with session_maker() as session:
+        payload = await read_trade_stats(session)
+        stats = {
+            (row.dimension, row.key): {name: getattr(row, name) for name in COUNTERS}
+            for row in (await session.execute(select(TradeCallStat))).scalars()
+        }
+        leaderboard = {
+            (row.period, row.symbol): {
+                column.name: getattr(row, column.name)
+                for column in TradeCallLeaderboard.__table__.columns
+                if column.name != "updated_at"
+            }
+            for row in (await session.execute(select(TradeCallLeaderboard))).scalars()
+        }
+    stats = {key: counters for key, counters in stats.items() if any(counters.values())}
+    return _rounded(payload), _rounded(stats), _rounded(leaderboard)
+
+
+@pytest.mark.asyncio
+async def test_incremental_rollup_matches_a_full_rebuild(session_maker, monkeypatch):
+    rnd = random.Random(5)
+    await _seed_history(session_maker, rnd)
+
+    async with session_maker() as session:
+        # Record: one LONG and one SHORT per symbol
+        items = [_item(symbol, side, rnd) for symbol in SYMBOLS for side in ("LONG", "SHORT")]
+        assert all(result["created"] for result in await record_trade_calls(session, items))
+
+        # Resolve twice: excursions move on active calls, then targets and stops are hit
+        prices = StubPrices({"AUSDT": 100.5, "BUSDT": 99.0, "CUSDT": 101.5, "DUSDT": 100.0})
+        monkeypatch.setattr(trade_call_resolver, "price_snapshot_service", PriceSnapshotService(prices, 0))
+        await trade_call_resolver.resolve_active_calls(session)
+        prices.prices.update(AUSDT=107.0, BUSDT=94.0, CUSDT=102.5, DUSDT=97.0)
+        result = await trade_call_resolver.resolve_active_calls(session)
+        assert result["resolved"] >= 4
+
+        # Expire: the calls left on two symbols run out of time
+        await session.execute(
+            update(TradeCall)
+            .where(TradeCall.symbol.in_(["EUSDT", "FUSDT"]), TradeCall.status == "active")
+            .values(expires_at=datetime.utcnow() - timedelta(minutes=1))
+        )
+        await session.commit()
+        assert (await trade_call_resolver.expire_overdue_calls(session))["expired"] == 4
+
+        # Archive: finished calls older than 30 days leave the hot table but stay in the stats
+        assert (await archive_finished_calls(session, 30, batch_size=7))["archived"] > 0
+
+    incremental = await _snapshot(session_maker)
+    payload, stats, leaderboard = incremental
+    assert payload["excursions"]["tracked"] > 0
+    assert any(dimension == "mfe" for dimension, _ in stats)
+    assert {period for period, _ in leaderboard} == {"7d", "30d", "all"}
+
+    async with session_maker() as session:
+        await rebuild_trade_call_stats(session)
+    rebuilt = await _snapshot(session_maker)
+
+    for name, got, expected in zip(("/stats payload", "trade_call_stats", "leaderboard"), incremental, rebuilt):
+        assert got == expected, name